@@ -0,0 +1,84 @@
+"""
+Mesure du temps d'import des points d'entrée (web, CLI, lot) et contrôle du budget de démarrage.
+
+Chaque module est importé dans un interpréteur neuf avec ``-X importtime`` ;
+on retient la médiane du temps cumulé sur plusieurs essais. Le script échoue
+(code de sortie 1) si un point d'entrée dépasse le budget ou si une
+bibliothèque lourde est importée au démarrage.
+
+Usage : python benchmarks/bench_import_time.py [--budget 0.6] [--runs 5]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = ("src.web.app", "src.main", "src.batch")
+
+# Bibliothèques qui ne doivent être chargées qu'à la première utilisation
+HEAVY_MODULES = ("pandas", "matplotlib", "plotly", "PyPDF2", "pyarrow")
+
+PROBE = (
+    "import sys; sys.path.insert(0, {root!r}); import {module}; "
+    "print([name for name in {heavy!r} if name in sys.modules])"
+)
+
+
+def measure(module: str) -> tuple:
+    """Temps d'import cumulé de ``module`` (secondes) et bibliothèques lourdes chargées."""
+    env = dict(os.environ, PRELOAD_MODULES="0")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         PROBE.format(root=str(ROOT), module=module, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, env=env, cwd=ROOT, check=True
+    )
+    match = re.search(rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$",
+                      completed.stderr, re.MULTILINE)
+    if match is None:
+        raise RuntimeError(f"Temps d'import introuvable pour {module}")
+    return int(match.group(1)) / 1e6, json.loads(completed.stdout.strip().replace("'", '"'))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Temps d'import des points d'entrée")
+    parser.add_argument("--budget", type=float, default=0.6,
+                        help="Temps d'import maximal par point d'entrée, en secondes (0.6 par défaut)")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre d'essais par module (5 par défaut)")
+    parser.add_argument("--json", action="store_true", help="Afficher les résultats au format JSON")
+    args = parser.parse_args()
+
+    results = []
+    for module in ENTRY_POINTS:
+        timings, heavy = [], []
+        for _ in range(args.runs):
+            seconds, heavy = measure(module)
+            timings.append(seconds)
+        results.append({
+            "module": module,
+            "median_s": round(statistics.median(timings), 4),
+            "min_s": round(min(timings), 4),
+            "heavy_modules": heavy,
+            "ok": statistics.median(timings) <= args.budget and not heavy
+        })
+
+    if args.json:
+        print(json.dumps({"budget_s": args.budget, "results": results}, indent=2))
+    else:
+        for result in results:
+            status = "OK" if result["ok"] else "ÉCHEC"
+            print(f"{result['module']:<14} médiane {result['median_s']:.3f}s "
+                  f"(min {result['min_s']:.3f}s) budget {args.budget:.3f}s  {status}")
+            if result["heavy_modules"]:
+                print(f"  bibliothèques chargées au démarrage : {', '.join(result['heavy_modules'])}")
+
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
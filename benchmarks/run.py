@@ -0,0 +1,368 @@
+"""
+Suite de benchmarks des composants de l'analyseur, sur des données synthétiques.
+
+Chaque benchmark est exécuté pour chaque taille demandée ; on retient la
+médiane et le minimum de plusieurs essais, et le débit en événements par
+seconde. Les résultats sont écrits en JSON (avec le commit, la version de
+Python et la machine) pour être comparés d'un commit à l'autre.
+
+Usage :
+    python benchmarks/run.py --sizes 1000,100000 --output results.json
+    python benchmarks/run.py --only stats --compare baseline.json
+"""
+import argparse
+import fnmatch
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from synthetic import generate_events, generate_user_events
+from stub_server import MAX_EVENTS, StubGitHubServer
+
+from src.api.decoding import decode_events
+from src.api.github_client import GitHubClient
+from src.api.response_cache import ResponseCache
+from src.models.event import EventProcessor
+from src.models.event_batch import EventBatch
+from src.services.comparison_service import ComparisonService
+from src.services.event_service import EventFilterService
+from src.services.export_service import ExportService
+from src.services.render_cache import RenderCache
+from src.services.repo_ranking_service import RepoRankingService
+from src.services.stats_service import StatsService
+from src.services.visualization_service import VisualizationService
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Nom -> (préparation renvoyant la fonction mesurée, taille maximale)
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, max_size: Optional[int] = None):
+    """Enregistre une fonction de préparation ``setup(size) -> callable`` sous ``name``."""
+    def register(setup: Callable[[int], Callable[[], object]]):
+        BENCHMARKS[name] = (setup, max_size)
+        return setup
+    return register
+
+
+# Jeux de données partagés entre benchmarks (générés une seule fois par taille)
+
+@lru_cache(maxsize=None)
+def raw_events(size: int) -> List[Dict]:
+    return list(generate_events(size, users=("octocat",), days=30))
+
+
+@lru_cache(maxsize=None)
+def processed_events(size: int) -> List[Dict]:
+    return [EventProcessor.process_event(event) for event in raw_events(size)]
+
+
+@lru_cache(maxsize=None)
+def event_batch(size: int) -> EventBatch:
+    return EventBatch.from_raw(raw_events(size))
+
+
+@lru_cache(maxsize=None)
+def global_stats(size: int) -> Dict:
+    return StatsService.calculate_global_stats(processed_events(size))
+
+
+def _consume(chunks) -> int:
+    return sum(len(chunk) for chunk in chunks)
+
+
+# GitHubClient : récupération paginée depuis le serveur de test
+
+def _client_setup(size: int, warm: bool) -> Callable[[], object]:
+    users = [f"user{index}" for index in range(math.ceil(size / MAX_EVENTS))]
+    server = StubGitHubServer(generate_user_events(users, min(size, MAX_EVENTS)), rate_limit=10 ** 9).start()
+    cache_dir = tempfile.mkdtemp(prefix="bench-cache-")
+
+    def make_client() -> GitHubClient:
+        cache = ResponseCache(os.path.join(cache_dir, f"{time.perf_counter_ns()}.sqlite"), max_entries=10 ** 6)
+        return GitHubClient(base_url=server.url, cache=cache)
+
+    warm_client = make_client()
+    if warm:
+        # Cache rempli : chaque page est revalidée par une requête conditionnelle (304)
+        for user in users:
+            warm_client.get_all_user_events(user)
+
+    def run() -> int:
+        client = warm_client if warm else make_client()
+        return sum(len(client.get_all_user_events(user)) for user in users)
+
+    run.cleanup = server.stop
+    return run
+
+
+@benchmark("github_client.fetch_cold", max_size=30_000)
+def bench_client_cold(size: int):
+    return _client_setup(size, warm=False)
+
+
+@benchmark("github_client.fetch_conditional", max_size=30_000)
+def bench_client_warm(size: int):
+    return _client_setup(size, warm=True)
+
+
+@benchmark("decoding.decode_events")
+def bench_decode_events(size: int):
+    body = json.dumps(raw_events(size)).encode("utf-8")
+    return lambda: decode_events(body)
+
+
+@benchmark("event_processor.process_event")
+def bench_process_event(size: int):
+    events = raw_events(size)
+    return lambda: [EventProcessor.process_event(event) for event in events]
+
+
+@benchmark("event_batch.from_raw")
+def bench_batch_from_raw(size: int):
+    events = raw_events(size)
+    return lambda: EventBatch.from_raw(events)
+
+
+@benchmark("event_filter.timeframe_list")
+def bench_filter_list(size: int):
+    events = processed_events(size)
+    return lambda: EventFilterService.filter_by_timeframe(events, "1w")
+
+
+@benchmark("event_filter.timeframe_batch")
+def bench_filter_batch(size: int):
+    batch = event_batch(size)
+    return lambda: EventFilterService.filter_by_timeframe(batch, "1w")
+
+
+@benchmark("event_filter.date_range_list")
+def bench_filter_range(size: int):
+    events = processed_events(size)
+    end = datetime.utcnow() - timedelta(days=7)
+    return lambda: EventFilterService.filter_by_date_range(events, end - timedelta(days=7), end)
+
+
+@benchmark("stats.global_list")
+def bench_stats_list(size: int):
+    events = processed_events(size)
+    return lambda: StatsService.calculate_global_stats(events)
+
+
+@benchmark("stats.global_batch")
+def bench_stats_batch(size: int):
+    batch = event_batch(size)
+    return lambda: StatsService.calculate_global_stats(batch)
+
+
+@benchmark("stats.activity_trends_list")
+def bench_trends_list(size: int):
+    events = processed_events(size)
+    return lambda: StatsService.calculate_activity_trends(events)
+
+
+@benchmark("repo_ranking.list")
+def bench_ranking_list(size: int):
+    events = processed_events(size)
+    return lambda: RepoRankingService.rank_repositories(events)
+
+
+@benchmark("repo_ranking.batch")
+def bench_ranking_batch(size: int):
+    batch = event_batch(size)
+    return lambda: RepoRankingService.rank_repositories(batch)
+
+
+@benchmark("visualization.chart_data")
+def bench_chart_data(size: int):
+    events = processed_events(size)
+    stats = global_stats(size)
+    return lambda: VisualizationService.build_chart_data(events, stats)
+
+
+@benchmark("visualization.bin_events")
+def bench_bin_events(size: int):
+    batch = event_batch(size)
+    return lambda: VisualizationService.bin_events(batch)
+
+
+@benchmark("comparison.compare")
+def bench_comparison(size: int):
+    # Équipe d'utilisateurs de 300 événements chacun
+    users = [f"user{index}" for index in range(math.ceil(size / MAX_EVENTS))]
+    batches = {
+        user: EventBatch.from_raw(events)
+        for user, events in generate_user_events(users, min(size, MAX_EVENTS)).items()
+    }
+    return lambda: ComparisonService.compare(batches)
+
+
+def _render_setup(render: Callable[[], str]):
+    # Cache neuf à chaque essai : on mesure le rendu, pas la lecture du cache
+    base_dir = tempfile.mkdtemp(prefix="bench-render-")
+
+    def run() -> str:
+        VisualizationService.render_cache = RenderCache(base_dir=os.path.join(base_dir, str(time.perf_counter_ns())))
+        return render()
+    return run
+
+
+@benchmark("visualization.commit_histogram", max_size=1_000_000)
+def bench_histogram(size: int):
+    events = processed_events(size)
+    return _render_setup(lambda: VisualizationService.create_commit_histogram(events, "30d"))
+
+
+@benchmark("visualization.activity_timeline", max_size=1_000_000)
+def bench_timeline(size: int):
+    events = processed_events(size)
+    return _render_setup(lambda: VisualizationService.create_activity_timeline(events))
+
+
+@benchmark("export.csv")
+def bench_export_csv(size: int):
+    events = processed_events(size)
+    return lambda: _consume(ExportService.iter_csv(events))
+
+
+@benchmark("export.ndjson")
+def bench_export_ndjson(size: int):
+    events = processed_events(size)
+    return lambda: _consume(ExportService.iter_ndjson(events))
+
+
+@benchmark("export.parquet")
+def bench_export_parquet(size: int):
+    events = processed_events(size)
+    ExportService.iter_parquet([])  # ImportError immédiate si pyarrow est absent
+    return lambda: _consume(ExportService.iter_parquet(events))
+
+
+def run_benchmark(name: str, size: int, repeat: int) -> Dict:
+    setup, max_size = BENCHMARKS[name]
+    result = {"benchmark": name, "size": size}
+    if max_size is not None and size > max_size:
+        return dict(result, skipped=f"taille maximale {max_size}")
+    try:
+        run = setup(size)
+    except ImportError as e:
+        return dict(result, skipped=f"dépendance manquante : {e.name or e}")
+
+    try:
+        run()  # essai à blanc : imports, caches des bibliothèques
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    finally:
+        cleanup = getattr(run, "cleanup", None)
+        if cleanup:
+            cleanup()
+
+    median = statistics.median(timings)
+    return dict(
+        result,
+        repeat=repeat,
+        median_s=round(median, 6),
+        min_s=round(min(timings), 6),
+        events_per_s=round(size / median) if median else None
+    )
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def compare(results: List[Dict], baseline_path: str) -> None:
+    """Affiche le rapport entre les médianes courantes et celles d'un fichier de référence."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    reference = {
+        (entry["benchmark"], entry["size"]): entry["median_s"]
+        for entry in baseline["results"] if "median_s" in entry
+    }
+    print(f"\nComparaison avec {baseline_path} (commit {baseline['environment'].get('commit')}) :")
+    for entry in results:
+        before = reference.get((entry["benchmark"], entry["size"]))
+        if before and "median_s" in entry:
+            ratio = entry["median_s"] / before
+            print(f"  {entry['benchmark']:<36} {entry['size']:>10}  {before:.4f}s -> {entry['median_s']:.4f}s  x{ratio:.2f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks des composants de l'analyseur")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Nombres d'événements, séparés par des virgules (1000,10000,100000 par défaut)")
+    parser.add_argument("--repeat", type=int, default=5, help="Essais par mesure (5 par défaut)")
+    parser.add_argument("--only", action="append", default=[],
+                        help="Motif des benchmarks à exécuter (ex. 'stats.*'), répétable")
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    parser.add_argument("--compare", help="Fichier JSON de référence à comparer")
+    parser.add_argument("--list", action="store_true", help="Lister les benchmarks disponibles")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    names = [
+        name for name in BENCHMARKS
+        if not args.only or any(fnmatch.fnmatch(name, pattern) or pattern in name for pattern in args.only)
+    ]
+
+    results = []
+    for size in sizes:
+        for name in names:
+            result = run_benchmark(name, size, args.repeat)
+            results.append(result)
+            if "skipped" in result:
+                print(f"{name:<36} {size:>10}  ignoré ({result['skipped']})", file=sys.stderr)
+            else:
+                print(f"{name:<36} {size:>10}  médiane {result['median_s']:.4f}s  "
+                      f"{result['events_per_s']:>12,} évén./s", file=sys.stderr)
+        # Libérer les jeux de données de cette taille avant la suivante
+        for dataset in (raw_events, processed_events, event_batch, global_stats):
+            dataset.cache_clear()
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
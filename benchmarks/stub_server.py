@@ -0,0 +1,347 @@
+"""
+Serveur HTTP local imitant ``GET /users/{username}/events`` et
+``GET /repos/{owner}/{repo}/events`` de l'API GitHub.
+
+Il reproduit ce dont dépend le client : pagination (``page``/``per_page``,
+en-tête ``Link``, 300 événements au plus), ``ETag`` et réponses ``304``,
+``X-Poll-Interval`` et en-têtes ``X-RateLimit-*`` avec un quota qui
+s'épuise (``403`` une fois atteint). Les utilisateurs et dépôts inconnus
+renvoient 404. Les événements d'un dépôt sont ceux de tous les utilisateurs
+sur ce dépôt, complétés par ``repo_events`` (activité d'autres contributeurs).
+
+``POST /graphql`` répond aux requêtes ``contributionsCollection`` aliasées
+de ``GitHubGraphQLClient`` en calculant les contributions à partir des mêmes
+événements ; au-delà de ``graphql_max_users`` alias, il répond 502 comme
+l'API réelle lorsqu'une requête est trop lourde.
+
+Usage : python benchmarks/stub_server.py --users 10 --events 300 --port 8000
+puis GITHUB_API_URL=http://127.0.0.1:8000 python src/batch.py users.txt
+"""
+import argparse
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from synthetic import generate_user_events
+
+# L'API events ne renvoie jamais plus de 300 événements
+MAX_EVENTS = 300
+
+EVENTS_PATH = re.compile(r"^/users/([^/]+)/events$")
+REPO_EVENTS_PATH = re.compile(r"^/repos/([^/]+/[^/]+)/events$")
+GRAPHQL_USER = re.compile(r'(\w+): user\(login: "((?:[^"\\]|\\.)*)"\)')
+GRAPHQL_MAX_REPOSITORIES = re.compile(r"maxRepositories: (\d+)")
+
+# Champ GraphQL de chaque type de contribution et type d'événement correspondant
+CONTRIBUTION_FIELDS = (
+    ("commitContributionsByRepository", "PushEvent"),
+    ("issueContributionsByRepository", "IssuesEvent"),
+    ("pullRequestContributionsByRepository", "PullRequestEvent"),
+)
+
+
+class StubGitHubServer:
+    """Serveur de test démarré dans un thread, utilisable comme gestionnaire de contexte."""
+
+    def __init__(self, events_by_user: Dict[str, List[Dict]], host: str = "127.0.0.1", port: int = 0,
+                 poll_interval: int = 0, rate_limit: int = 5000, rate_window: float = 3600,
+                 latency: float = 0.0, graphql_max_users: Optional[int] = None,
+                 repo_events: Optional[Dict[str, List[Dict]]] = None):
+        self.events_by_user = {user.lower(): events[:MAX_EVENTS] for user, events in events_by_user.items()}
+        self.events_by_repo = self._group_by_repo(events_by_user, repo_events or {})
+        self.poll_interval = poll_interval
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.latency = latency
+        self.graphql_max_users = graphql_max_users
+        self.request_count = 0
+        self.repo_request_count = 0
+        self.graphql_count = 0
+        self.not_modified_count = 0
+        self._remaining = rate_limit
+        self._reset_at = time.time() + rate_window
+        self._lock = threading.Lock()
+        self._pages: Dict[tuple, tuple] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubGitHubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-github", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _consume_quota(self) -> tuple:
+        """Décompte une requête du quota et retourne (restant, réinitialisation)."""
+        with self._lock:
+            self.request_count += 1
+            now = time.time()
+            if now >= self._reset_at:
+                self._remaining = self.rate_limit
+                self._reset_at = now + self.rate_window
+            if self._remaining > 0:
+                self._remaining -= 1
+                return self._remaining, int(self._reset_at), True
+            return 0, int(self._reset_at), False
+
+    @staticmethod
+    def _group_by_repo(events_by_user: Dict[str, List[Dict]], repo_events: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """Événements de chaque dépôt (nom en minuscules), du plus récent au plus ancien."""
+        events_by_repo: Dict[str, List[Dict]] = {}
+        for events in events_by_user.values():
+            for event in events:
+                events_by_repo.setdefault(event["repo"]["name"].lower(), []).append(event)
+        for repo, events in repo_events.items():
+            events_by_repo.setdefault(repo.lower(), []).extend(events)
+        return {
+            repo: sorted(events, key=lambda event: event["created_at"], reverse=True)[:MAX_EVENTS]
+            for repo, events in events_by_repo.items()
+        }
+
+    def _page(self, events_by_key: Dict[str, List[Dict]], key: str, page: int, per_page: int) -> tuple:
+        """Corps JSON et ETag d'une page (mémorisés : seul le réseau est mesuré)."""
+        key = (key, page, per_page)
+        if key not in self._pages:
+            events = events_by_key[key[0]][(page - 1) * per_page:page * per_page]
+            body = json.dumps(events).encode("utf-8")
+            self._pages[key] = (body, '"%s"' % hashlib.sha1(body).hexdigest())
+        return self._pages[key]
+
+    def _contributions(self, user: str, start: datetime, end: datetime, max_repositories: int) -> Dict:
+        """Nœud ``user`` d'une réponse GraphQL, calculé à partir des événements de l'utilisateur.
+
+        Comme dans l'API, le calendrier porte sur des journées entières : ses
+        premier et dernier jours comptent aussi les contributions hors de
+        ``[start, end]``.
+        """
+        calendar: Dict[str, int] = {}
+        totals = {"PushEvent": 0, "IssuesEvent": 0, "PullRequestEvent": 0, "PullRequestReviewEvent": 0}
+        by_repository: Dict[str, Dict[str, list]] = {event_type: {} for event_type in totals}
+        for event in self.events_by_user[user]:
+            created_at = datetime.strptime(event["created_at"], "%Y-%m-%dT%H:%M:%SZ")
+            if not start.date() <= created_at.date() <= end.date():
+                continue
+            in_range = start <= created_at <= end
+            event_type = event["type"]
+            payload = event.get("payload", {})
+            if event_type == "PushEvent":
+                count = payload.get("size", len(payload.get("commits", [])))
+            elif event_type in ("IssuesEvent", "PullRequestEvent"):
+                count = 1 if payload.get("action") == "opened" else 0
+            elif event_type == "PullRequestReviewEvent":
+                count = 1
+            else:
+                continue
+            if not count:
+                continue
+            day = created_at.date().isoformat()
+            calendar[day] = calendar.get(day, 0) + count
+            if not in_range:
+                continue
+            totals[event_type] += count
+            repo = by_repository[event_type].setdefault(event["repo"]["name"], [0, event["created_at"]])
+            repo[0] += count
+            repo[1] = max(repo[1], event["created_at"])
+
+        days = [(start.date() + timedelta(days=offset)).isoformat()
+                for offset in range((end.date() - start.date()).days + 1)]
+        node = {
+            "login": user,
+            "contributionsCollection": {
+                "totalCommitContributions": totals["PushEvent"],
+                "totalIssueContributions": totals["IssuesEvent"],
+                "totalPullRequestContributions": totals["PullRequestEvent"],
+                "totalPullRequestReviewContributions": totals["PullRequestReviewEvent"],
+                "restrictedContributionsCount": 0,
+                "contributionCalendar": {"weeks": [
+                    {"contributionDays": [{"date": day, "contributionCount": calendar.get(day, 0)}
+                                          for day in days[index:index + 7]]}
+                    for index in range(0, len(days), 7)
+                ]}
+            }
+        }
+        for field, event_type in CONTRIBUTION_FIELDS:
+            repositories = sorted(by_repository[event_type].items(), key=lambda item: item[1][0], reverse=True)
+            node["contributionsCollection"][field] = [
+                {
+                    "repository": {"nameWithOwner": name},
+                    "contributions": {"totalCount": count, "nodes": [{"occurredAt": last}]}
+                }
+                for name, (count, last) in repositories[:max_repositories]
+            ]
+        return node
+
+    def _graphql(self, request: Dict) -> tuple:
+        """Statut et corps d'une réponse à une requête ``contributionsCollection`` aliasée."""
+        query = request.get("query", "")
+        variables = request.get("variables") or {}
+        aliases = GRAPHQL_USER.findall(query)
+        with self._lock:
+            self.graphql_count += 1
+        if self.graphql_max_users is not None and len(aliases) > self.graphql_max_users:
+            return 502, {"message": "We couldn't respond to your request in time."}
+
+        start = datetime.strptime(variables["from"], "%Y-%m-%dT%H:%M:%SZ")
+        end = datetime.strptime(variables["to"], "%Y-%m-%dT%H:%M:%SZ")
+        match = GRAPHQL_MAX_REPOSITORIES.search(query)
+        max_repositories = int(match.group(1)) if match else 25
+        # Coût facturé : un point par tranche de dix utilisateurs
+        data: Dict = {"rateLimit": {"cost": max(1, len(aliases) // 10), "remaining": self._remaining,
+                                    "resetAt": datetime.utcfromtimestamp(self._reset_at).strftime("%Y-%m-%dT%H:%M:%SZ")}}
+        errors = []
+        for alias, login in aliases:
+            user = login.lower()
+            if user in self.events_by_user:
+                data[alias] = self._contributions(user, start, end, max_repositories)
+            else:
+                data[alias] = None
+                errors.append({
+                    "type": "NOT_FOUND", "path": [alias],
+                    "message": f"Could not resolve to a User with the login of '{login}'."
+                })
+        body = {"data": data}
+        if errors:
+            body["errors"] = errors
+        return 200, body
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, headers: Dict[str, str], body: bytes = b"") -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                remaining, reset_at, allowed = stub._consume_quota()
+                headers = {
+                    "X-RateLimit-Limit": str(stub.rate_limit),
+                    "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset": str(reset_at)
+                }
+                if not allowed:
+                    self._send(403, headers, b'{"message": "API rate limit exceeded"}')
+                    return
+
+                parsed = urlparse(self.path)
+                match = EVENTS_PATH.match(parsed.path)
+                events_by_key = stub.events_by_user
+                if match is None:
+                    match = REPO_EVENTS_PATH.match(parsed.path)
+                    events_by_key = stub.events_by_repo
+                    if match is not None:
+                        with stub._lock:
+                            stub.repo_request_count += 1
+                key = match.group(1).lower() if match else None
+                if key not in events_by_key:
+                    self._send(404, headers, b'{"message": "Not Found"}')
+                    return
+
+                query = parse_qs(parsed.query)
+                page = max(int(query.get("page", ["1"])[0]), 1)
+                per_page = min(max(int(query.get("per_page", ["30"])[0]), 1), 100)
+                body, etag = stub._page(events_by_key, key, page, per_page)
+                headers["ETag"] = etag
+                headers["X-Poll-Interval"] = str(stub.poll_interval)
+
+                if self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified_count += 1
+                    self._send(304, headers)
+                    return
+
+                last_page = max((len(events_by_key[key]) + per_page - 1) // per_page, 1)
+                base = f"http://{self.headers['Host']}{parsed.path}"
+                links = []
+                if page < last_page:
+                    links.append(f'<{base}?page={page + 1}&per_page={per_page}>; rel="next"')
+                links.append(f'<{base}?page={last_page}&per_page={per_page}>; rel="last"')
+                headers["Link"] = ", ".join(links)
+                headers["Content-Type"] = "application/json; charset=utf-8"
+                self._send(200, headers, body)
+
+            def do_POST(self) -> None:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                remaining, reset_at, allowed = stub._consume_quota()
+                headers = {
+                    "X-RateLimit-Limit": str(stub.rate_limit),
+                    "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset": str(reset_at),
+                    "Content-Type": "application/json; charset=utf-8"
+                }
+                if not allowed:
+                    self._send(403, headers, b'{"message": "API rate limit exceeded"}')
+                    return
+                if urlparse(self.path).path != "/graphql":
+                    self._send(404, headers, b'{"message": "Not Found"}')
+                    return
+                status, body = stub._graphql(request)
+                self._send(status, headers, json.dumps(body).encode("utf-8"))
+
+        return Handler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serveur local imitant l'API events de GitHub")
+    parser.add_argument("--users", type=int, default=10, help="Nombre d'utilisateurs (user0, user1…)")
+    parser.add_argument("--events", type=int, default=MAX_EVENTS, help="Événements par utilisateur (300 au plus)")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--poll-interval", type=int, default=60)
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence ajoutée à chaque requête, en secondes")
+    args = parser.parse_args()
+
+    users = [f"user{index}" for index in range(args.users)]
+    server = StubGitHubServer(
+        generate_user_events(users, args.events), port=args.port, poll_interval=args.poll_interval,
+        rate_limit=args.rate_limit, latency=args.latency
+    )
+    print(f"Serveur GitHub de test sur {server.url} ({', '.join(users[:3])}…)", flush=True)
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
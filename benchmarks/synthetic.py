@@ -0,0 +1,167 @@
+"""
+Générateur d'événements GitHub synthétiques, au format de l'API ``/users/{username}/events``.
+
+Les événements sont produits à la demande (générateur) : on peut en générer
+10 millions sans les garder en mémoire. Le mélange de types, la popularité
+des dépôts et la taille des pushs imitent une activité réelle, et une même
+graine produit toujours la même séquence.
+
+Usage : python benchmarks/synthetic.py 1000000 -o events.ndjson.gz
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Répartition des types d'événements (proportions d'un profil actif typique)
+EVENT_MIX = (
+    ("PushEvent", 0.55),
+    ("PullRequestEvent", 0.12),
+    ("IssuesEvent", 0.10),
+    ("IssueCommentEvent", 0.08),
+    ("WatchEvent", 0.06),
+    ("CreateEvent", 0.05),
+    ("PullRequestReviewEvent", 0.03),
+    ("DeleteEvent", 0.01),
+)
+
+ISSUE_ACTIONS = (("opened", 0.6), ("closed", 0.35), ("reopened", 0.05))
+PR_ACTIONS = (("opened", 0.55), ("closed", 0.4), ("reopened", 0.05))
+
+# L'API ne détaille jamais plus de 20 commits par push
+MAX_PUSH_COMMITS = 20
+
+
+def _choice(rng: random.Random, weighted: Sequence) -> str:
+    return rng.choices([value for value, _ in weighted], weights=[weight for _, weight in weighted])[0]
+
+
+def _payload(rng: random.Random, event_type: str, number: int) -> Dict:
+    if event_type == "PushEvent":
+        # Taille des pushs : la plupart en contiennent un ou deux commits, quelques-uns beaucoup
+        size = min(int(rng.expovariate(0.5)) + 1, 200)
+        return {
+            "push_id": number,
+            "size": size,
+            "distinct_size": size,
+            "ref": "refs/heads/main" if rng.random() < 0.7 else f"refs/heads/feature-{number % 97}",
+            "head": f"{number:040x}",
+            "before": f"{number + 1:040x}",
+            "commits": [
+                {
+                    "sha": f"{number * 100 + index:040x}",
+                    "author": {"email": "dev@example.com", "name": "Dev"},
+                    "message": "Update " + "x" * rng.randint(10, 80),
+                    "distinct": True,
+                    "url": f"https://api.github.com/repos/example/commits/{number * 100 + index:040x}"
+                }
+                for index in range(min(size, MAX_PUSH_COMMITS))
+            ]
+        }
+    if event_type == "IssuesEvent":
+        return {
+            "action": _choice(rng, ISSUE_ACTIONS),
+            "issue": {"number": number % 5000 + 1, "title": "Issue", "body": "b" * rng.randint(0, 400)}
+        }
+    if event_type == "PullRequestEvent":
+        action = _choice(rng, PR_ACTIONS)
+        return {
+            "action": action,
+            "number": number % 5000 + 1,
+            "pull_request": {
+                "number": number % 5000 + 1,
+                "title": "Pull request",
+                "body": "b" * rng.randint(0, 400),
+                "merged": action == "closed" and rng.random() < 0.8
+            }
+        }
+    if event_type == "IssueCommentEvent":
+        return {"action": "created", "issue": {"number": number % 5000 + 1}, "comment": {"body": "c" * rng.randint(5, 300)}}
+    if event_type == "PullRequestReviewEvent":
+        return {"action": "created", "review": {"state": "approved"}, "pull_request": {"number": number % 5000 + 1}}
+    if event_type == "CreateEvent":
+        return {"ref": f"feature-{number % 97}", "ref_type": "branch"}
+    if event_type == "DeleteEvent":
+        return {"ref": f"feature-{number % 97}", "ref_type": "branch"}
+    return {"action": "started"}
+
+
+def generate_events(count: int, users: Sequence[str] = ("octocat",), repos_per_user: int = 20,
+                    days: float = 30, end: Optional[datetime] = None, seed: int = 0) -> Iterator[Dict]:
+    """Génère ``count`` événements bruts, du plus récent au plus ancien.
+
+    Les événements sont répartis uniformément sur les ``days`` derniers jours
+    précédant ``end`` (maintenant par défaut). Les identifiants décroissent
+    comme dans l'API. Quelques dépôts concentrent l'essentiel de l'activité
+    de chaque utilisateur.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.utcnow().replace(microsecond=0)
+    step = timedelta(days=days) / max(count, 1)
+    types = [event_type for event_type, _ in EVENT_MIX]
+    weights = [weight for _, weight in EVENT_MIX]
+    repos = {
+        user: [f"{user}/project-{index}" for index in range(repos_per_user)]
+        for user in users
+    }
+    # Popularité des dépôts décroissante (loi de Zipf)
+    repo_weights = [1 / (rank + 1) for rank in range(repos_per_user)]
+
+    # Identifiants stables d'une exécution à l'autre (contrairement à hash())
+    user_ids = {user: zlib.crc32(user.encode("utf-8")) & 0xFFFFFF for user in users}
+
+    for index in range(count):
+        user = users[index % len(users)]
+        event_type = rng.choices(types, weights=weights)[0]
+        repo_index = rng.choices(range(repos_per_user), weights=repo_weights)[0]
+        number = count - index
+        yield {
+            "id": str(30_000_000_000 + number),
+            "type": event_type,
+            "actor": {"id": user_ids[user], "login": user},
+            "repo": {"id": user_ids[user] * 1000 + repo_index, "name": repos[user][repo_index]},
+            "payload": _payload(rng, event_type, number),
+            "public": True,
+            "created_at": (end - step * index).strftime("%Y-%m-%dT%H:%M:%SZ")
+        }
+
+
+def generate_user_events(users: Sequence[str], events_per_user: int, seed: int = 0) -> Dict[str, List[Dict]]:
+    """Événements de plusieurs utilisateurs, indexés par nom (pour le serveur de test)."""
+    return {
+        user: list(generate_events(events_per_user, users=(user,), seed=seed + offset))
+        for offset, user in enumerate(users)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Génère des événements GitHub synthétiques au format NDJSON")
+    parser.add_argument("count", type=int, help="Nombre d'événements")
+    parser.add_argument("-o", "--output", default="-", help="Fichier de sortie (.gz pour compresser, - pour stdout)")
+    parser.add_argument("-u", "--users", type=int, default=1, help="Nombre d'utilisateurs (1 par défaut)")
+    parser.add_argument("-d", "--days", type=float, default=30, help="Période couverte en jours (30 par défaut)")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Graine aléatoire (0 par défaut)")
+    args = parser.parse_args()
+
+    users = [f"user{index}" for index in range(args.users)]
+    if args.output == "-":
+        output = sys.stdout
+    elif args.output.endswith(".gz"):
+        output = gzip.open(args.output, "wt", encoding="utf-8")
+    else:
+        output = open(args.output, "w", encoding="utf-8")
+    try:
+        for event in generate_events(args.count, users=users, days=args.days, seed=args.seed):
+            output.write(json.dumps(event, separators=(",", ":")) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import time
+
+import aiohttp
+
+from .event_pages import (
+    PageRequest, last_page_number, merge_pages, next_wave_size, page_reaches_cutoff, record_request
+)
+from .rate_limiter import RateLimitError, RateLimitScheduler
+from .response_cache import ResponseCache
+
+
+class AsyncGitHubClient:
+    """Asyncio counterpart of :class:`GitHubClient` for batch workloads.
+
+    Must be used as an async context manager so that a single connection
+    pool is shared by every request.
+    """
+
+    def __init__(self, token: Optional[str] = None, base_url: str = "https://api.github.com",
+                 concurrency: int = 10, timeout: float = 10.0,
+                 cache: Optional[ResponseCache] = None, tokens: Optional[List[str]] = None,
+                 scheduler: Optional[RateLimitScheduler] = None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Accept": "application/vnd.github.v3+json"}
+        self.concurrency = concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.cache = cache
+        self.scheduler = scheduler or RateLimitScheduler(tokens or [token])
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.session.close()
+        self.session = None
+
+    async def get_all_user_events(self, username: str, since: Optional[datetime] = None,
+                                  after_id: Optional[int] = None) -> List[Dict]:
+        """Fetch every available page of user events, newest first."""
+        path = f"/users/{username}/events"
+        cutoff = since.strftime("%Y-%m-%dT%H:%M:%SZ") if since else None
+
+        first_page, links = await self._fetch_page(path, 1)
+        pages = [first_page]
+
+        if not page_reaches_cutoff(first_page, cutoff, after_id):
+            last_page = last_page_number(links, len(first_page))
+            next_page = 2
+            # Même découpage en vagues que GitHubClient : aucune page au-delà de la date limite
+            while next_page <= last_page:
+                wave = range(next_page, next_page + next_wave_size(pages, cutoff, after_id,
+                                                                    last_page - next_page + 1))
+                next_page = wave.stop
+                results = await asyncio.gather(*(self._fetch_page(path, page) for page in wave))
+                reached = False
+                for page_events, _ in results:
+                    pages.append(page_events)
+                    if page_reaches_cutoff(page_events, cutoff, after_id):
+                        reached = True
+                        break
+                if reached:
+                    break
+
+        return merge_pages(pages, cutoff, after_id)
+
+    async def _fetch_page(self, path: str, page: int) -> Tuple[List[Dict], Dict]:
+        """Fetch a single page, using the response cache like :class:`GitHubClient`."""
+        request = PageRequest(self.base_url, path, page, self.headers, self.cache)
+        result = request.cached()
+        if result is not None:
+            return result
+
+        attempt = 0
+        while True:
+            token, delay = self.scheduler.reserve()
+            if delay > self.scheduler.max_wait:
+                raise RateLimitError("Rate limit exceeded")
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            request_headers = dict(request.headers)
+            if token:
+                request_headers["Authorization"] = f"token {token}"
+            start = time.perf_counter()
+            async with self.session.get(request.url, headers=request_headers, params=request.params) as response:
+                body = await response.read()
+                status = response.status
+                response_headers = response.headers
+                links = {rel: {"url": str(link["url"])} for rel, link in response.links.items()}
+            record_request(self.scheduler, token, status, response_headers, time.perf_counter() - start)
+            self.scheduler.update(token, response_headers)
+
+            if not self.scheduler.is_rate_limited(status, response_headers, body):
+                break
+            delay = self.scheduler.retry_delay(token, response_headers, attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        return request.handle_response(status, response_headers, body, links)
@@ -0,0 +1,80 @@
+from typing import Dict, List, Union
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur le module json standard
+    orjson = None
+    import json
+
+# Payload fields kept for each event type; everything else (commit messages,
+# issue and pull request bodies...) is dropped right after decoding.
+PAYLOAD_FIELDS = {
+    "PushEvent": ("size", "distinct_size", "ref"),
+    "PullRequestEvent": ("number",),
+}
+# Objects of which only the number is kept
+NESTED_NUMBERS = {
+    "IssuesEvent": "issue",
+    "PullRequestEvent": "pull_request",
+}
+
+
+def loads(body: Union[bytes, str]):
+    """Decode a JSON document with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def dumps(value) -> str:
+    """Encode a value as compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"))
+
+
+def project_event(event: Dict) -> Dict:
+    """Reduce a raw API event to the fields used by the analyzer.
+
+    The result keeps the shape of the API event (``id``, ``type``,
+    ``created_at``, ``actor.login``, ``repo.name`` and a trimmed
+    ``payload``), so it can be passed to :class:`EventProcessor` and
+    :class:`EventBatch` as is. Push events keep ``size`` and
+    ``distinct_size``: the API lists at most 20 commits, but these counts
+    are exact. Projecting an already projected event returns an equal event.
+    """
+    event_type = event["type"]
+    payload = event.get("payload") or {}
+    trimmed = {"action": payload["action"]} if "action" in payload else {}
+    fields = PAYLOAD_FIELDS.get(event_type)
+    if fields:
+        for field in fields:
+            if field in payload:
+                trimmed[field] = payload[field]
+        if event_type == "PushEvent" and "size" not in payload and "commits" in payload:
+            trimmed["size"] = len(payload["commits"])
+    nested = NESTED_NUMBERS.get(event_type)
+    if nested:
+        value = payload.get(nested)
+        if isinstance(value, dict):
+            trimmed[nested] = {"number": value.get("number")}
+
+    actor = event.get("actor") or {}
+    return {
+        "id": event["id"],
+        "type": event_type,
+        "created_at": event["created_at"],
+        "actor": {"login": actor.get("login")},
+        "repo": {"name": event["repo"]["name"]},
+        "payload": trimmed,
+    }
+
+
+def decode_events(body: Union[bytes, str]) -> List[Dict]:
+    """Decode a page of events and project each one with :func:`project_event`."""
+    return [project_event(event) for event in loads(body)]
+
+
+def encode_events(events: List[Dict]) -> str:
+    """Encode projected events, e.g. to store them in the response cache."""
+    return dumps(events)
@@ -0,0 +1,161 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import math
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from .rate_limiter import RateLimitError, RateLimitScheduler
+from .decoding import decode_events, encode_events
+from .response_cache import ResponseCache
+from src.utils.metrics import (
+    GITHUB_CACHE_HITS, GITHUB_RATE_LIMIT_REMAINING, GITHUB_REQUEST_SECONDS, GITHUB_REQUESTS
+)
+
+# L'API events ne renvoie jamais plus de 300 événements (3 pages de 100)
+EVENTS_PER_PAGE = 100
+MAX_EVENTS = 300
+MAX_PAGES = MAX_EVENTS // EVENTS_PER_PAGE
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class PageRequest:
+    """One page of an events endpoint, shared by the synchronous and asynchronous clients.
+
+    The request is made conditional on the cached ``ETag``/``Last-Modified``;
+    the client only sends it (``url``, ``headers``, ``params``) and hands the
+    response back to :meth:`handle_response`, which answers a ``304`` from
+    the cache, stores new pages and raises the errors of the API.
+    """
+
+    def __init__(self, base_url: str, path: str, page: int, headers: Dict,
+                 cache: Optional[ResponseCache] = None):
+        self.path = path
+        self.url = f"{base_url}{path}"
+        self.params = {"page": page, "per_page": EVENTS_PER_PAGE}
+        self.cache = cache
+        self.cache_key = f"{self.url}?{urlencode(self.params)}"
+        self.headers = dict(headers)
+        # Cadence de sondage demandée par l'API (X-Poll-Interval) pour ce chemin
+        self.poll_interval: Optional[int] = None
+
+        self.entry = cache.get(self.cache_key) if cache else None
+        if self.entry:
+            if self.entry.etag:
+                self.headers["If-None-Match"] = self.entry.etag
+            if self.entry.last_modified:
+                self.headers["If-Modified-Since"] = self.entry.last_modified
+
+    def cached(self) -> Optional[Tuple[List[Dict], Dict]]:
+        """Return the cached page while the ``X-Poll-Interval`` window is open, without any request."""
+        if self.entry is None or not self.entry.is_fresh():
+            return None
+        GITHUB_CACHE_HITS.inc(kind="fresh")
+        self.poll_interval = self.entry.poll_interval
+        return decode_events(self.entry.body), self.entry.links
+
+    def handle_response(self, status: int, headers, body: bytes, links: Dict) -> Tuple[List[Dict], Dict]:
+        """Return the events and parsed ``Link`` header of a response, or raise the matching error."""
+        header = headers.get("X-Poll-Interval")
+        poll_interval = int(header) if header is not None else None
+        if status == 304 and self.entry:
+            GITHUB_CACHE_HITS.inc(kind="not_modified")
+            self.poll_interval = poll_interval
+            # Sans en-tête, l'entrée n'est jamais fraîche : la requête suivante sera conditionnelle
+            self.cache.refresh(self.cache_key, poll_interval or 0)
+            return decode_events(self.entry.body), self.entry.links
+        elif status == 200:
+            self.poll_interval = poll_interval
+            events = decode_events(body)
+            if self.cache:
+                # Seuls les champs utiles sont mis en cache (corps projeté)
+                self.cache.put(
+                    self.cache_key,
+                    encode_events(events),
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    links,
+                    poll_interval or 0
+                )
+            return events, links
+        elif status == 404:
+            raise ValueError("Repository not found" if self.path.startswith("/repos/") else "User not found")
+        elif RateLimitScheduler.is_rate_limited(status, headers, body):
+            raise RateLimitError("Rate limit exceeded")
+        else:
+            raise Exception(f"API error: {status}")
+
+
+def record_request(scheduler: RateLimitScheduler, token: Optional[str], status: int,
+                   headers, seconds: float) -> None:
+    """Record a request in the GitHub API metrics (count, latency, remaining quota)."""
+    GITHUB_REQUESTS.inc(status=str(status))
+    GITHUB_REQUEST_SECONDS.observe(seconds)
+    remaining = headers.get("X-RateLimit-Remaining")
+    if remaining is not None:
+        # Le token lui-même n'est jamais exposé : seul son indice dans le pool l'est
+        GITHUB_RATE_LIMIT_REMAINING.set(int(remaining), token=str(scheduler.tokens.index(token)))
+
+
+def last_page_number(links: Dict, page_size: int) -> int:
+    """Determine the last page number from the ``Link`` header, capped to what the API serves."""
+    last = links.get("last")
+    if last:
+        page = parse_qs(urlparse(last["url"]).query).get("page")
+        if page:
+            return min(int(page[0]), MAX_PAGES)
+    # Sans en-tête Link, une page pleine laisse supposer qu'il en existe d'autres
+    if links.get("next") or page_size >= EVENTS_PER_PAGE:
+        return MAX_PAGES
+    return 1
+
+
+def page_reaches_cutoff(page_events: List[Dict], cutoff: Optional[str],
+                        after_id: Optional[int] = None) -> bool:
+    """Tell whether a page is empty or already contains events older than the cutoff."""
+    if not page_events:
+        return True
+    if after_id is not None and int(page_events[-1]["id"]) <= after_id:
+        return True
+    return cutoff is not None and page_events[-1]["created_at"] < cutoff
+
+
+def next_wave_size(pages: List[List[Dict]], cutoff: Optional[str], after_id: Optional[int],
+                   remaining: int) -> int:
+    """Number of pages to request concurrently in the next wave.
+
+    Without a cutoff every remaining page is needed. Otherwise the pages
+    still needed are estimated from the pace of the events fetched so far
+    (seconds or ids per event), so that reaching the cutoff early actually
+    saves the requests for the pages beyond it.
+    """
+    if cutoff is None and after_id is None:
+        return remaining
+    events = [event for page_events in pages for event in page_events]
+    if len(events) < 2:
+        return 1
+    needed = 0.0
+    if cutoff is not None:
+        newest = datetime.strptime(events[0]["created_at"], DATE_FORMAT)
+        oldest = datetime.strptime(events[-1]["created_at"], DATE_FORMAT)
+        limit = datetime.strptime(cutoff, DATE_FORMAT)
+        pace = (newest - oldest).total_seconds() / (len(events) - 1)
+        needed = (oldest - limit).total_seconds() / pace if pace > 0 else remaining * EVENTS_PER_PAGE
+    if after_id is not None:
+        pace = (int(events[0]["id"]) - int(events[-1]["id"])) / (len(events) - 1)
+        by_id = (int(events[-1]["id"]) - after_id) / pace if pace > 0 else remaining * EVENTS_PER_PAGE
+        needed = by_id if cutoff is None else min(needed, by_id)
+    return max(1, min(remaining, math.ceil(needed / EVENTS_PER_PAGE)))
+
+
+def merge_pages(pages: List[List[Dict]], cutoff: Optional[str],
+                after_id: Optional[int] = None) -> List[Dict]:
+    """Concatenate pages in order, keeping only events past the cutoff and ``after_id``."""
+    events = []
+    for page_events in pages:
+        for event in page_events:
+            if cutoff and event["created_at"] < cutoff:
+                continue
+            if after_id is not None and int(event["id"]) <= after_id:
+                continue
+            events.append(event)
+    return events
@@ -1,26 +1,132 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import time
+
+from .event_pages import (
+    PageRequest, last_page_number, merge_pages, next_wave_size, page_reaches_cutoff, record_request
+)
+from .rate_limiter import RateLimitScheduler
+from .response_cache import ResponseCache
+
 
 class GitHubClient:
-    def __init__(self, token: Optional[str] = None):
-        self.base_url = "https://api.github.com"
+    def __init__(self, token: Optional[str] = None, base_url: str = "https://api.github.com",
+                 max_workers: int = 3, timeout: float = 10.0,
+                 cache: Optional[ResponseCache] = None, tokens: Optional[List[str]] = None,
+                 scheduler: Optional[RateLimitScheduler] = None):
+        self.base_url = base_url.rstrip("/")
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "Authorization": f"token {token}" if token else None
         }
-    
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache
+        # Les requêtes sont réparties sur le pool de tokens par le scheduler
+        self.scheduler = scheduler or RateLimitScheduler(tokens or [token])
+        # Dernier X-Poll-Interval reçu pour chaque chemin (cadence de sondage demandée par l'API),
+        # None quand la réponse n'en indiquait pas
+        self.poll_intervals: Dict[str, Optional[int]] = {}
+
+        # Session partagée : les connexions TCP/TLS sont réutilisées (keep-alive)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def get_user_events(self, username: str, page: int = 1) -> List[Dict]:
         """Fetch user events from GitHub API with pagination."""
-        url = f"{self.base_url}/users/{username}/events"
-        params = {"page": page, "per_page": 100}
-        response = requests.get(url, headers=self.headers, params=params)
-        
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 404:
-            raise ValueError("User not found")
-        elif response.status_code == 403:
-            raise Exception("Rate limit exceeded")
-        else:
-            raise Exception(f"API error: {response.status_code}") 
\ No newline at end of file
+        events, _ = self._fetch_page(f"/users/{username}/events", page)
+        return events
+
+    def get_all_user_events(self, username: str, since: Optional[datetime] = None,
+                            after_id: Optional[int] = None) -> List[Dict]:
+        """Fetch every available page of user events, newest first.
+
+        The first page tells us (through the ``Link`` header) how many pages
+        exist; the remaining ones are then fetched concurrently over the shared
+        session, in waves sized after the pages still needed to reach ``since``
+        or ``after_id``. Events older than ``since`` or not newer than
+        ``after_id`` are dropped, and no further page is requested once a page
+        reaches past them.
+        """
+        return self._fetch_all_pages(f"/users/{username}/events", since, after_id)
+
+    def get_repo_events(self, repo_name: str, since: Optional[datetime] = None) -> List[Dict]:
+        """Fetch the recent events of a repository (``owner/name``), newest first.
+
+        Same pagination, caching and cutoff as :meth:`get_all_user_events`;
+        the API only returns the last 300 events of the repository.
+        """
+        return self._fetch_all_pages(f"/repos/{repo_name}/events", since)
+
+    def _fetch_all_pages(self, path: str, since: Optional[datetime] = None,
+                         after_id: Optional[int] = None) -> List[Dict]:
+        """Fetch all pages of a paginated events endpoint, in page order."""
+        cutoff = since.strftime("%Y-%m-%dT%H:%M:%SZ") if since else None
+
+        first_page, links = self._fetch_page(path, 1)
+        pages = [first_page]
+
+        if not page_reaches_cutoff(first_page, cutoff, after_id):
+            last_page = last_page_number(links, len(first_page))
+            next_page = 2
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Les pages sont demandées par vagues : celles au-delà de la date limite ne le sont jamais
+                while next_page <= last_page:
+                    wave = range(next_page, next_page + next_wave_size(pages, cutoff, after_id,
+                                                                        last_page - next_page + 1))
+                    next_page = wave.stop
+                    reached = False
+                    for page_events in executor.map(lambda page: self._fetch_page(path, page)[0], wave):
+                        pages.append(page_events)
+                        if page_reaches_cutoff(page_events, cutoff, after_id):
+                            reached = True
+                            break
+                    if reached:
+                        break
+
+        return merge_pages(pages, cutoff, after_id)
+
+    def _fetch_page(self, path: str, page: int) -> Tuple[List[Dict], Dict]:
+        """Fetch a single page and return its events with the parsed ``Link`` header.
+
+        When a cache is configured, the request is made conditional on the
+        stored ``ETag``/``Last-Modified`` and a ``304`` is answered from the
+        cache. Within the ``X-Poll-Interval`` window the network is not
+        contacted at all.
+        """
+        request = PageRequest(self.base_url, path, page, self.headers, self.cache)
+        result = request.cached()
+        if result is None:
+            response = self._send(request.url, request.headers, request.params)
+            result = request.handle_response(response.status_code, response.headers, response.content,
+                                             response.links)
+        self.poll_intervals[path] = request.poll_interval
+        return result
+
+    def _send(self, url: str, headers: Dict, params: Dict) -> requests.Response:
+        """Send a GET request through the rate-limit scheduler, retrying when throttled."""
+        attempt = 0
+        while True:
+            token = self.scheduler.acquire()
+            request_headers = dict(headers)
+            if token:
+                request_headers["Authorization"] = f"token {token}"
+            start = time.perf_counter()
+            response = self.session.get(url, headers=request_headers, params=params, timeout=self.timeout)
+            record_request(self.scheduler, token, response.status_code, response.headers,
+                           time.perf_counter() - start)
+            self.scheduler.update(token, response.headers)
+
+            # Un 403 de permission est renvoyé tel quel : attendre n'y changerait rien
+            if not self.scheduler.is_rate_limited(response.status_code, response.headers, response.content):
+                return response
+            delay = self.scheduler.retry_delay(token, response.headers, attempt)
+            if delay is None:
+                return response
+            time.sleep(delay)
+            attempt += 1
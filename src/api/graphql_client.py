@@ -0,0 +1,286 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+import time
+
+import requests
+
+from .decoding import loads
+from .event_pages import record_request
+from .rate_limiter import RateLimitError, RateLimitScheduler
+
+# contributionsCollection ne couvre jamais plus d'un an
+MAX_WINDOW = timedelta(days=365)
+
+# Erreurs GraphQL indiquant une requête trop coûteuse : on la découpe
+SPLIT_ERROR_TYPES = ("MAX_NODE_LIMIT_EXCEEDED", "RESOURCE_LIMITS_EXCEEDED", "TIMEOUT")
+
+CONTRIBUTION_KINDS = (
+    ("commits", "commitContributionsByRepository", "{field: OCCURRED_AT, direction: DESC}"),
+    ("issues", "issueContributionsByRepository", "{direction: DESC}"),
+    ("prs", "pullRequestContributionsByRepository", "{direction: DESC}"),
+)
+
+
+class GraphQLError(Exception):
+    """Raised when the GraphQL API rejects a query."""
+
+
+class _QueryTooLarge(Exception):
+    """The query exceeded the API resource limits and must be split."""
+
+
+class GitHubGraphQLClient:
+    """Fetch contribution summaries of many users through the GraphQL API.
+
+    Users are grouped into aliased queries (``u0: user(login: ...)``), one
+    request per batch instead of several REST pages per user. The batch
+    size is derived from an estimate of the nodes each user requests
+    (``max_nodes`` per query), then adjusted with the ``rateLimit.cost``
+    reported by the API (``max_cost`` per query). Queries rejected for their
+    size or timing out are split in two and retried.
+    """
+
+    def __init__(self, token: Optional[str] = None, base_url: str = "https://api.github.com",
+                 timeout: float = 30.0, tokens: Optional[List[str]] = None,
+                 scheduler: Optional[RateLimitScheduler] = None, max_repositories: int = 25,
+                 max_batch: int = 50, max_nodes: int = 50_000, max_cost: int = 10):
+        self.url = f"{base_url.rstrip('/')}/graphql"
+        self.timeout = timeout
+        self.max_repositories = max_repositories
+        self.max_batch = max_batch
+        self.max_nodes = max_nodes
+        self.max_cost = max_cost
+        self.scheduler = scheduler or RateLimitScheduler(tokens or [token])
+        self.session = requests.Session()
+        self.query_count = 0
+
+    def get_contributions(self, usernames: Sequence[str], since: Optional[datetime] = None,
+                          until: Optional[datetime] = None) -> Dict[str, Dict]:
+        """Return the contribution summary of each user between ``since`` and ``until``.
+
+        Defaults to the last 365 days. Longer periods are split into yearly
+        windows whose results are merged. Each summary has the totals, a
+        ``calendar`` mapping ISO dates to contribution counts and
+        ``repositories`` mapping names to ``commits``/``issues``/``prs``
+        counts and ``last_activity``. Users that could not be fetched, in
+        any of the windows, map to ``{"login": ..., "error": ...}``: partial
+        totals are never returned.
+        """
+        until = until or datetime.utcnow()
+        since = since or until - MAX_WINDOW
+        usernames = list(dict.fromkeys(usernames))
+        results: Dict[str, Dict] = {}
+        for start, end in self._windows(since, until):
+            for login, summary in self._fetch_window(usernames, start, end).items():
+                current = results.get(login)
+                if current is not None and "error" in current:
+                    continue
+                if current is None or "error" in summary:
+                    # Une fenêtre en échec remplace les totaux déjà cumulés
+                    results[login] = summary
+                else:
+                    self._merge_summary(current, summary)
+        return results
+
+    def batch_size(self) -> int:
+        """Number of users per query allowed by the node budget."""
+        return max(1, min(self.max_batch, self.max_nodes // self.estimate_user_nodes()))
+
+    def estimate_user_nodes(self) -> int:
+        """Upper bound of the nodes requested for one user (calendar and repositories)."""
+        calendar = 53 * (1 + 7)
+        repositories = len(CONTRIBUTION_KINDS) * self.max_repositories * 3
+        return calendar + repositories + 10
+
+    def build_query(self, usernames: Sequence[str]) -> str:
+        """Aliased query fetching the contributions of ``usernames`` for ``$from``-``$to``."""
+        by_repository = "\n".join(
+            f"""      {name}: {field}(maxRepositories: {self.max_repositories}) {{
+        repository {{ nameWithOwner }}
+        contributions(first: 1, orderBy: {order}) {{ totalCount nodes {{ occurredAt }} }}
+      }}"""
+            for name, field, order in CONTRIBUTION_KINDS
+        )
+        users = "\n".join(
+            f"""  u{index}: user(login: {self._quote(login)}) {{
+    login
+    contributionsCollection(from: $from, to: $to) {{
+      totalCommitContributions
+      totalIssueContributions
+      totalPullRequestContributions
+      totalPullRequestReviewContributions
+      restrictedContributionsCount
+      contributionCalendar {{ weeks {{ contributionDays {{ date contributionCount }} }} }}
+{by_repository}
+    }}
+  }}"""
+            for index, login in enumerate(usernames)
+        )
+        return (
+            "query($from: DateTime!, $to: DateTime!) {\n"
+            "  rateLimit { cost remaining resetAt }\n"
+            f"{users}\n"
+            "}"
+        )
+
+    def _fetch_window(self, usernames: List[str], start: datetime, end: datetime) -> Dict[str, Dict]:
+        results: Dict[str, Dict] = {}
+        size = self.batch_size()
+        position = 0
+        while position < len(usernames):
+            chunk = usernames[position:position + size]
+            try:
+                summaries, cost = self._query(chunk, start, end)
+            except _QueryTooLarge as e:
+                if len(chunk) == 1:
+                    results[chunk[0]] = {"login": chunk[0], "error": str(e) or "Query too large"}
+                    position += 1
+                else:
+                    size = max(1, len(chunk) // 2)
+                continue
+
+            results.update(summaries)
+            position += len(chunk)
+            # Ajuster la taille des lots suivants au coût réellement facturé
+            if cost and cost > self.max_cost:
+                size = max(1, len(chunk) * self.max_cost // cost)
+        return results
+
+    def _query(self, usernames: List[str], start: datetime, end: datetime) -> Tuple[Dict[str, Dict], int]:
+        """Run one aliased query; return the summaries by login and its cost."""
+        body = {
+            "query": self.build_query(usernames),
+            "variables": {"from": self._format_date(start), "to": self._format_date(end)}
+        }
+        response = self._send(body)
+        self.query_count += 1
+        if response.status_code in (502, 504):
+            raise _QueryTooLarge(f"GraphQL timeout ({response.status_code})")
+        if response.status_code == 401:
+            raise GraphQLError("Bad credentials")
+        if self.scheduler.is_rate_limited(response.status_code, response.headers, response.content):
+            raise RateLimitError("Rate limit exceeded")
+        if response.status_code != 200:
+            raise GraphQLError(f"API error: {response.status_code}")
+
+        payload = loads(response.content)
+        data = payload.get("data") or {}
+        errors_by_alias: Dict[str, str] = {}
+        for error in payload.get("errors") or []:
+            if error.get("type") in SPLIT_ERROR_TYPES:
+                raise _QueryTooLarge(error.get("message", ""))
+            path = error.get("path") or []
+            if path:
+                errors_by_alias[path[0]] = error.get("message") or error.get("type") or "GraphQL error"
+            elif not data:
+                raise GraphQLError(error.get("message", "GraphQL error"))
+
+        summaries = {}
+        for index, login in enumerate(usernames):
+            alias = f"u{index}"
+            node = data.get(alias)
+            if node is None:
+                error = errors_by_alias.get(alias, "User not found")
+                summaries[login] = {"login": login, "error": error}
+            else:
+                summaries[login] = self._summarize(node)
+        cost = (data.get("rateLimit") or {}).get("cost") or 0
+        return summaries, int(cost)
+
+    def _send(self, body: Dict) -> requests.Response:
+        """POST a query through the rate-limit scheduler, retrying when throttled."""
+        attempt = 0
+        while True:
+            token = self.scheduler.acquire()
+            headers = {"Authorization": f"bearer {token}"} if token else {}
+            start = time.perf_counter()
+            response = self.session.post(self.url, json=body, headers=headers, timeout=self.timeout)
+            record_request(self.scheduler, token, response.status_code, response.headers,
+                           time.perf_counter() - start)
+            self.scheduler.update(token, response.headers)
+
+            if not self.scheduler.is_rate_limited(response.status_code, response.headers, response.content):
+                return response
+            delay = self.scheduler.retry_delay(token, response.headers, attempt)
+            if delay is None:
+                return response
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _summarize(node: Dict) -> Dict:
+        """Flatten a ``user`` node into a contribution summary."""
+        collection = node["contributionsCollection"]
+        calendar = {
+            day["date"]: day["contributionCount"]
+            for week in collection["contributionCalendar"]["weeks"]
+            for day in week["contributionDays"]
+        }
+        repositories: Dict[str, Dict] = {}
+        for name, field, _ in CONTRIBUTION_KINDS:
+            for entry in collection.get(field) or []:
+                repo = repositories.setdefault(
+                    entry["repository"]["nameWithOwner"],
+                    {"commits": 0, "issues": 0, "prs": 0, "last_activity": None}
+                )
+                contributions = entry["contributions"]
+                repo[name] += contributions["totalCount"]
+                for contribution in contributions.get("nodes") or []:
+                    occurred_at = datetime.strptime(contribution["occurredAt"], "%Y-%m-%dT%H:%M:%SZ")
+                    if repo["last_activity"] is None or occurred_at > repo["last_activity"]:
+                        repo["last_activity"] = occurred_at
+        return {
+            "login": node["login"],
+            "total_commits": collection["totalCommitContributions"],
+            "total_issues": collection["totalIssueContributions"],
+            "total_prs": collection["totalPullRequestContributions"],
+            "total_reviews": collection["totalPullRequestReviewContributions"],
+            "restricted": collection["restrictedContributionsCount"],
+            "calendar": calendar,
+            "repositories": repositories
+        }
+
+    @staticmethod
+    def _merge_summary(target: Dict, other: Dict) -> None:
+        """Add the summary of another window to ``target``."""
+        for key in ("total_commits", "total_issues", "total_prs", "total_reviews", "restricted"):
+            target[key] += other[key]
+        for day, count in other["calendar"].items():
+            target["calendar"][day] = target["calendar"].get(day, 0) + count
+        for name, repo in other["repositories"].items():
+            current = target["repositories"].get(name)
+            if current is None:
+                target["repositories"][name] = dict(repo)
+                continue
+            for key in ("commits", "issues", "prs"):
+                current[key] += repo[key]
+            if repo["last_activity"] and (current["last_activity"] is None
+                                          or repo["last_activity"] > current["last_activity"]):
+                current["last_activity"] = repo["last_activity"]
+
+    @staticmethod
+    def _windows(since: datetime, until: datetime) -> Iterator[Tuple[datetime, datetime]]:
+        """Split ``[since, until]`` into consecutive windows of at most one year.
+
+        Windows are disjoint by day: each one but the last ends on the last
+        second of a day and the next starts at midnight, so no calendar day
+        is counted twice when the summaries are merged.
+        """
+        start = since
+        while start < until:
+            end = start + MAX_WINDOW
+            if end >= until:
+                yield start, until
+                return
+            end = end.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(seconds=1)
+            yield start, end
+            start = end + timedelta(seconds=1)
+
+    @staticmethod
+    def _format_date(value: datetime) -> str:
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        # Les logins GitHub ne contiennent que des lettres, chiffres et tirets
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
@@ -0,0 +1,232 @@
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+import random
+import threading
+import time
+
+
+class RateLimitError(Exception):
+    """Raised when the GitHub API rate limit is exceeded and retrying is not possible."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to spread requests over time.
+
+    A ``rate`` of ``None`` disables throttling.
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: float = 10.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: Optional[float]) -> None:
+        """Change the refill rate (requests per second)."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def reserve(self) -> float:
+        """Consume one token and return how long the caller must wait before using it."""
+        with self._lock:
+            if self.rate is None:
+                return 0.0
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.rate is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+class _TokenState:
+    def __init__(self, token: Optional[str]):
+        self.token = token
+        self.remaining: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+
+    def available_at(self, now: float) -> float:
+        """Return the time from which this token may be used again."""
+        exhausted_until = self.reset_at if self.remaining == 0 else 0.0
+        return max(self.blocked_until, exhausted_until, now)
+
+
+class RateLimitScheduler:
+    """Schedule GitHub API requests across a pool of tokens.
+
+    The scheduler reads ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` from
+    every response to pick the next token (``round_robin`` or
+    ``most_remaining``) and to throttle requests with a token bucket so that
+    the remaining quota lasts until the reset once the pool drops below
+    ``pace_below`` (a fraction of its limit). Rate-limited responses are
+    retried after ``Retry-After``, after the reset of an exhausted token, or
+    with jittered exponential backoff for secondary rate limits. Other
+    ``403`` responses (missing permissions) are not rate limits and are
+    never retried.
+    """
+
+    STRATEGIES = ("round_robin", "most_remaining")
+
+    def __init__(self, tokens: Optional[List[Optional[str]]] = None, strategy: str = "most_remaining",
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 max_wait: float = 60.0, burst: float = 10.0, pace_below: float = 0.25):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Invalid strategy. Choose from: {', '.join(self.STRATEGIES)}")
+
+        self.strategy = strategy
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.pace_below = pace_below
+        self.bucket = TokenBucket(capacity=burst)
+
+        self._states = [_TokenState(token) for token in (tokens or [None])]
+        self._next_index = 0
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> List[Optional[str]]:
+        return [state.token for state in self._states]
+
+    def reserve(self) -> Tuple[Optional[str], float]:
+        """Pick a token for the next request and return it with the delay to respect."""
+        with self._lock:
+            now = time.time()
+            state = self._select(now)
+            delay = state.available_at(now) - now
+        return state.token, max(delay, self.bucket.reserve())
+
+    def acquire(self) -> Optional[str]:
+        """Pick a token, waiting as long as the scheduler requires."""
+        token, delay = self.reserve()
+        if delay > self.max_wait:
+            raise RateLimitError("Rate limit exceeded")
+        if delay > 0:
+            time.sleep(delay)
+        return token
+
+    def update(self, token: Optional[str], headers: Dict) -> None:
+        """Record the rate-limit headers returned for a request made with ``token``."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None:
+            return
+
+        with self._lock:
+            state = self._state_for(token)
+            state.remaining = int(remaining)
+            if headers.get("X-RateLimit-Limit") is not None:
+                state.limit = int(headers["X-RateLimit-Limit"])
+            if reset is not None:
+                state.reset_at = float(reset)
+            self._update_rate(time.time())
+
+    @staticmethod
+    def is_rate_limited(status: int, headers: Dict, body: bytes = b"") -> bool:
+        """Tell whether a response was throttled rather than refused.
+
+        A ``429`` always is; a ``403`` only when the primary quota is
+        exhausted, when ``Retry-After`` is present or when the body reports
+        a secondary rate limit.
+        """
+        if status == 429:
+            return True
+        if status != 403:
+            return False
+        return (
+            headers.get("X-RateLimit-Remaining") == "0"
+            or headers.get("Retry-After") is not None
+            or b"secondary rate limit" in body.lower()
+        )
+
+    def retry_delay(self, token: Optional[str], headers: Dict, attempt: int) -> Optional[float]:
+        """Return how long to wait before retrying a rate-limited request.
+
+        ``None`` means the request should not be retried.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        now = time.time()
+        retry_after = self._parse_retry_after(headers.get("Retry-After"), now)
+        with self._lock:
+            state = self._state_for(token)
+            if retry_after is not None:
+                # Limite secondaire explicite : on bloque ce token le temps demandé
+                state.blocked_until = now + retry_after
+            elif headers.get("X-RateLimit-Remaining") == "0":
+                # Quota principal épuisé : le token est inutilisable jusqu'au reset
+                state.remaining = 0
+            else:
+                # Limite secondaire sans indication : backoff exponentiel avec jitter
+                backoff = min(self.max_delay, self.base_delay * 2 ** attempt)
+                state.blocked_until = now + random.uniform(backoff / 2, backoff)
+
+            # Un autre token du pool peut éventuellement prendre le relais
+            delay = min(s.available_at(now) for s in self._states) - now
+
+        return delay if delay <= self.max_wait else None
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str], now: float) -> Optional[float]:
+        """Seconds to wait according to ``Retry-After`` (delay in seconds or HTTP date)."""
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(retry_at.timestamp() - now, 0.0)
+
+    def _select(self, now: float) -> _TokenState:
+        available = [s for s in self._states if s.available_at(now) <= now]
+        if not available:
+            return min(self._states, key=lambda s: s.available_at(now))
+
+        if self.strategy == "most_remaining":
+            return max(available, key=lambda s: float("inf") if s.remaining is None else s.remaining)
+
+        for _ in range(len(self._states)):
+            state = self._states[self._next_index]
+            self._next_index = (self._next_index + 1) % len(self._states)
+            if state in available:
+                return state
+        return available[0]
+
+    def _state_for(self, token: Optional[str]) -> _TokenState:
+        for state in self._states:
+            if state.token == token:
+                return state
+        raise KeyError("Unknown token")
+
+    def _update_rate(self, now: float) -> None:
+        """Spread the remaining quota of the pool evenly until the reset."""
+        if any(state.remaining is None for state in self._states):
+            self.bucket.set_rate(None)
+            return
+
+        remaining = sum(state.remaining for state in self._states)
+        limit = sum(state.limit or state.remaining for state in self._states)
+        if remaining >= limit * self.pace_below:
+            self.bucket.set_rate(None)
+            return
+
+        window = max(max(state.reset_at for state in self._states) - now, 1.0)
+        self.bucket.set_rate(max(remaining, 1) / window)
@@ -0,0 +1,107 @@
+from typing import Dict, NamedTuple, Optional
+from pathlib import Path
+import json
+import sqlite3
+import threading
+import time
+
+
+class CacheEntry(NamedTuple):
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    links: Dict
+    fetched_at: float
+    poll_interval: int
+
+    def is_fresh(self) -> bool:
+        """Tell whether the server asked us not to poll again yet (``X-Poll-Interval``)."""
+        return time.time() < self.fetched_at + self.poll_interval
+
+
+class ResponseCache:
+    """Persistent cache of GitHub API responses used for conditional requests.
+
+    Each entry keeps the response body together with its ``ETag`` and
+    ``Last-Modified`` validators. The cache is bounded to ``max_entries``
+    and evicts the least recently used entries first.
+    """
+
+    def __init__(self, path: str = ".cache/github_responses.sqlite", max_entries: int = 500):
+        self.path = path
+        self.max_entries = max_entries
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                links TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                poll_interval INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the cached entry for ``key`` and mark it as recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, links, fetched_at, poll_interval "
+                "FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        body, etag, last_modified, links, fetched_at, poll_interval = row
+        return CacheEntry(body, etag, last_modified, json.loads(links), fetched_at, poll_interval)
+
+    def put(self, key: str, body: str, etag: Optional[str], last_modified: Optional[str],
+            links: Dict, poll_interval: int = 0) -> None:
+        """Store a fresh response, evicting the least recently used entries if needed."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, body, etag, last_modified, links, fetched_at, poll_interval, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, json.dumps(links), now, poll_interval, now)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def refresh(self, key: str, poll_interval: int = 0) -> None:
+        """Mark an entry as revalidated after a ``304 Not Modified``."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, poll_interval = ?, last_access = ? WHERE key = ?",
+                (now, poll_interval, now, key)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
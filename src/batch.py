@@ -0,0 +1,202 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
+from dotenv import load_dotenv
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api.async_github_client import AsyncGitHubClient
+from src.api.github_client import GitHubClient
+from src.api.graphql_client import GitHubGraphQLClient
+from src.api.response_cache import ResponseCache
+from src.models.event import EventProcessor
+from src.services.contribution_service import ContributionService
+from src.services.event_service import EventFilterService
+from src.services.repo_enrichment_service import RepoEnrichmentService
+from src.services.repo_ranking_service import RepoRankingService
+from src.services.stats_service import StatsService
+
+CSV_FIELDS = [
+    "username", "timeframe", "total_events", "total_commits",
+    "total_issues", "total_prs", "total_repos", "error"
+]
+
+
+def read_usernames(source: TextIO) -> List[str]:
+    """Lit un nom d'utilisateur par ligne, en ignorant les lignes vides et les commentaires."""
+    usernames = []
+    for line in source:
+        username = line.strip()
+        if username and not username.startswith("#"):
+            usernames.append(username)
+    return usernames
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ResultWriter:
+    """Écrit les statistiques de chaque utilisateur dès qu'elles sont disponibles."""
+
+    def __init__(self, output: TextIO, output_format: str):
+        self.output = output
+        self.output_format = output_format
+        if output_format == "csv":
+            self.csv_writer = csv.DictWriter(output, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            self.csv_writer.writeheader()
+
+    def write(self, result: Dict) -> None:
+        if self.output_format == "csv":
+            self.csv_writer.writerow(result)
+        else:
+            self.output.write(json.dumps(result, ensure_ascii=False, default=_json_default) + "\n")
+        self.output.flush()
+
+
+async def analyze_user(client: AsyncGitHubClient, semaphore: asyncio.Semaphore,
+                       username: str, timeframe: str,
+                       enrichment: Optional[RepoEnrichmentService] = None) -> Dict:
+    """Récupère et analyse les événements d'un utilisateur ; les erreurs sont renvoyées, pas levées."""
+    try:
+        cutoff = EventFilterService.get_cutoff(timeframe)
+        async with semaphore:
+            raw_events = await client.get_all_user_events(username, since=cutoff)
+
+        events = [EventProcessor.process_event(event) for event in raw_events]
+        filtered_events = EventFilterService.filter_by_timeframe(events, timeframe)
+        stats = StatsService.calculate_global_stats(filtered_events)
+        result = {
+            "username": username,
+            "timeframe": timeframe,
+            "total_events": len(filtered_events),
+            **stats
+        }
+        if enrichment is not None:
+            # Le pool et le cache sont partagés par tout le lot : un dépôt commun n'est récupéré qu'une fois
+            result["top_repos"] = await asyncio.to_thread(
+                enrichment.enrich, RepoRankingService.rank_repositories(filtered_events), username, cutoff
+            )
+        return result
+    except Exception as e:
+        return {"username": username, "timeframe": timeframe, "error": str(e) or type(e).__name__}
+
+
+async def run_batch(usernames: List[str], timeframe: str, writer: ResultWriter,
+                    client: AsyncGitHubClient, concurrency: int,
+                    enrichment: Optional[RepoEnrichmentService] = None) -> int:
+    """Analyse tous les utilisateurs en parallèle et renvoie le nombre d'échecs."""
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async with client:
+        tasks = [analyze_user(client, semaphore, username, timeframe, enrichment) for username in usernames]
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            if "error" in result:
+                failures += 1
+                print(f"Erreur pour {result['username']} : {result['error']}", file=sys.stderr)
+            writer.write(result)
+
+    return failures
+
+
+def run_graphql_batch(usernames: List[str], timeframe: str, writer: ResultWriter,
+                      client: GitHubGraphQLClient) -> int:
+    """Analyse tous les utilisateurs par requêtes GraphQL groupées et renvoie le nombre d'échecs."""
+    failures = 0
+    try:
+        summaries = client.get_contributions(usernames, since=EventFilterService.get_cutoff(timeframe))
+    except Exception as e:
+        # Erreur globale (token refusé, quota épuisé) : tous les utilisateurs échouent
+        error = str(e) or type(e).__name__
+        summaries = {username: {"login": username, "error": error} for username in usernames}
+    for username in usernames:
+        summary = summaries[username]
+        if "error" in summary:
+            failures += 1
+            print(f"Erreur pour {username} : {summary['error']}", file=sys.stderr)
+            writer.write({"username": username, "timeframe": timeframe, "error": summary["error"]})
+            continue
+        writer.write({
+            "username": username,
+            "timeframe": timeframe,
+            "total_events": ContributionService.total_contributions(summary),
+            **ContributionService.global_stats(summary)
+        })
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse non interactive d'une liste d'utilisateurs GitHub.")
+    parser.add_argument("input", help="Fichier contenant un nom d'utilisateur par ligne ('-' pour stdin)")
+    parser.add_argument("-t", "--timeframe", default="30d", help="Période : 24h, 48h, 1w, 2w, 30d (30d par défaut)")
+    parser.add_argument("-f", "--format", choices=["ndjson", "csv"], default="ndjson", help="Format de sortie")
+    parser.add_argument("-o", "--output", default="-", help="Fichier de sortie ('-' pour stdout)")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="Nombre maximal d'utilisateurs analysés en parallèle")
+    parser.add_argument("-s", "--source", choices=["rest", "graphql"], default="rest",
+                        help="Source des données : événements REST (300 au plus) ou contributions GraphQL "
+                             "(requêtes groupées, token requis)")
+    parser.add_argument("--repos", type=int, default=0,
+                        help="Ajouter la part de chaque utilisateur dans l'activité de ses N dépôts principaux "
+                             "(NDJSON, source rest)")
+    args = parser.parse_args()
+
+    # Valider la période avant de lancer les requêtes
+    EventFilterService.get_cutoff(args.timeframe)
+
+    load_dotenv()
+    github_tokens = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+    base_url = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+
+    if args.input == "-":
+        usernames = read_usernames(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            usernames = read_usernames(f)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        writer = ResultWriter(output, args.format)
+        if args.source == "graphql":
+            client = GitHubGraphQLClient(token=os.getenv('GITHUB_TOKEN'), base_url=base_url, tokens=github_tokens)
+            failures = run_graphql_batch(usernames, args.timeframe, writer, client)
+        else:
+            cache = ResponseCache(os.getenv('GITHUB_CACHE_PATH', '.cache/github_responses.sqlite'))
+            client = AsyncGitHubClient(
+                token=os.getenv('GITHUB_TOKEN'),
+                base_url=base_url,
+                tokens=github_tokens,
+                cache=cache,
+                concurrency=args.concurrency
+            )
+            enrichment = RepoEnrichmentService(
+                GitHubClient(token=os.getenv('GITHUB_TOKEN'), base_url=base_url, tokens=github_tokens, cache=cache),
+                top_k=args.repos
+            ) if args.repos > 0 else None
+            try:
+                failures = asyncio.run(
+                    run_batch(usernames, args.timeframe, writer, client, args.concurrency, enrichment)
+                )
+            finally:
+                if enrichment is not None:
+                    enrichment.shutdown()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{len(usernames) - failures}/{len(usernames)} utilisateurs analysés", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, TextIO, Tuple
+from dotenv import load_dotenv
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api.async_github_client import AsyncGitHubClient
+from src.api.response_cache import ResponseCache
+from src.batch import read_usernames
+from src.models.event import EventProcessor
+from src.models.event_batch import EventBatch
+from src.services.comparison_service import METRICS, ComparisonService
+from src.services.event_service import EventFilterService
+from src.services.event_store import EventStore
+
+
+async def fetch_user_events(client: AsyncGitHubClient, usernames: List[str], timeframe: str,
+                            concurrency: int) -> Tuple[Dict[str, EventBatch], Dict[str, str]]:
+    """Récupère les événements de chaque utilisateur depuis l'API ; renvoie les lots et les erreurs."""
+    semaphore = asyncio.Semaphore(concurrency)
+    cutoff = EventFilterService.get_cutoff(timeframe)
+
+    async def fetch(username: str):
+        async with semaphore:
+            raw_events = await client.get_all_user_events(username, since=cutoff)
+        events = [EventProcessor.process_event(event) for event in raw_events]
+        return EventBatch.from_events(EventFilterService.filter_by_timeframe(events, timeframe))
+
+    events_by_user, errors = {}, {}
+    async with client:
+        results = await asyncio.gather(*(fetch(username) for username in usernames), return_exceptions=True)
+    for username, result in zip(usernames, results):
+        if isinstance(result, Exception):
+            errors[username] = str(result) or type(result).__name__
+        else:
+            events_by_user[username] = result
+    return events_by_user, errors
+
+
+def read_store_events(store: EventStore, usernames: List[str], timeframe: str) -> Dict[str, EventBatch]:
+    """Lit les événements de la période depuis le stockage local (synchronisé ou ingéré)."""
+    cutoff = EventFilterService.get_cutoff(timeframe)
+    return {
+        username: EventBatch.from_events(store.get_user_events(username, since=cutoff))
+        for username in usernames
+    }
+
+
+def write_leaderboard(output: TextIO, comparison: Dict) -> None:
+    """Classement lisible : une ligne par utilisateur, triée par score."""
+    columns = ["rang", "utilisateur"] + list(METRICS) + ["centile"]
+    rows = [
+        [str(row["score_rank"]), row["user"]] + [str(row[metric]) for metric in METRICS]
+        + [f"{row['score_percentile']:.0f}"]
+        for row in comparison["leaderboard"]
+    ]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) if rows else len(column)
+              for i, column in enumerate(columns)]
+    for line in [columns] + rows:
+        output.write("  ".join(value.rjust(width) for value, width in zip(line, widths)) + "\n")
+
+    if comparison["shared_repos"]:
+        output.write("\nDépôts partagés :\n")
+        for repo in comparison["shared_repos"]:
+            output.write(f"  {repo['repo']} : {repo['users']} utilisateurs, {repo['events']} événements\n")
+    if comparison["overlaps"]:
+        output.write("\nPaires ayant le plus de dépôts en commun :\n")
+        for pair in comparison["overlaps"]:
+            output.write(f"  {' / '.join(pair['users'])} : {pair['shared_repos']} dépôts (Jaccard {pair['jaccard']})\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparaison et classement d'une équipe d'utilisateurs GitHub.")
+    parser.add_argument("usernames", nargs="*", help="Utilisateurs à comparer")
+    parser.add_argument("-i", "--input", help="Fichier contenant un nom d'utilisateur par ligne ('-' pour stdin)")
+    parser.add_argument("-t", "--timeframe", default="30d", help="Période : 24h, 48h, 1w, 2w, 30d (30d par défaut)")
+    parser.add_argument("-f", "--format", choices=["table", "json", "csv"], default="table",
+                        help="Format de sortie : classement lisible, comparaison complète en JSON ou classement CSV")
+    parser.add_argument("-o", "--output", default="-", help="Fichier de sortie ('-' pour stdout)")
+    parser.add_argument("--store", help="Lire les événements depuis cette base locale au lieu de l'API")
+    parser.add_argument("--table", help="Écrire la table combinée (utilisateur, dépôt, jour, type) dans ce fichier CSV")
+    parser.add_argument("-n", "--limit", type=int, default=20, help="Nombre de dépôts partagés et de paires affichés")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="Nombre maximal d'utilisateurs récupérés en parallèle")
+    args = parser.parse_args()
+
+    # Valider la période avant de lancer les requêtes
+    EventFilterService.get_cutoff(args.timeframe)
+
+    usernames = list(args.usernames)
+    if args.input == "-":
+        usernames.extend(read_usernames(sys.stdin))
+    elif args.input:
+        with open(args.input, encoding="utf-8") as f:
+            usernames.extend(read_usernames(f))
+    # Un même utilisateur n'est compté qu'une fois
+    usernames = list(dict.fromkeys(usernames))
+    if len(usernames) < 2:
+        parser.error("au moins deux utilisateurs sont nécessaires")
+
+    load_dotenv()
+    errors = {}
+    if args.store:
+        events_by_user = read_store_events(EventStore(args.store), usernames, args.timeframe)
+    else:
+        github_tokens = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+        client = AsyncGitHubClient(
+            token=os.getenv('GITHUB_TOKEN'),
+            base_url=os.getenv('GITHUB_API_URL', 'https://api.github.com'),
+            tokens=github_tokens,
+            cache=ResponseCache(os.getenv('GITHUB_CACHE_PATH', '.cache/github_responses.sqlite')),
+            concurrency=args.concurrency
+        )
+        events_by_user, errors = asyncio.run(
+            fetch_user_events(client, usernames, args.timeframe, args.concurrency)
+        )
+    for username, error in errors.items():
+        print(f"Erreur pour {username} : {error}", file=sys.stderr)
+
+    table = ComparisonService.build_table(events_by_user)
+    comparison = ComparisonService.compare_table(table, len(events_by_user), limit=args.limit)
+    if args.table:
+        table.to_csv(args.table)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        if args.format == "json":
+            json.dump(dict(comparison, errors=errors), output, ensure_ascii=False, indent=2)
+            output.write("\n")
+        elif args.format == "csv":
+            leaderboard = comparison["leaderboard"]
+            if leaderboard:
+                writer = csv.DictWriter(output, fieldnames=list(leaderboard[0]))
+                writer.writeheader()
+                writer.writerows(leaderboard)
+        else:
+            write_leaderboard(output, comparison)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{comparison['active_users']}/{len(usernames)} utilisateurs actifs sur la période", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
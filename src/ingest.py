@@ -0,0 +1,113 @@
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, TextIO
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.services.aggregation_service import OUTPUTS
+from src.services.archive_ingest_service import ArchiveIngestService
+
+
+def list_archives(inputs: List[str]) -> List[str]:
+    """Fichiers d'archive désignés par les arguments (fichiers, ou dossiers parcourus récursivement)."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(
+                str(path) for path in sorted(Path(item).rglob("*"))
+                if path.is_file() and path.name.endswith((".json.gz", ".json"))
+            )
+        else:
+            paths.append(item)
+    return paths
+
+
+def read_names(values: List[str], list_file: str) -> List[str]:
+    """Noms passés en option, complétés par ceux d'un fichier (un par ligne, ``#`` pour commenter)."""
+    names = list(values)
+    if list_file:
+        with open(list_file, encoding="utf-8") as f:
+            for line in f:
+                name = line.strip()
+                if name and not name.startswith("#"):
+                    names.append(name)
+    return names
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_result(output: TextIO, name: str, results: Dict) -> None:
+    output.write(json.dumps({"username": name, **results}, ensure_ascii=False, default=_json_default) + "\n")
+
+
+def report_file(stats: Dict) -> None:
+    message = f"{stats['path']} : {stats['lines']} lignes, {stats['matched']} événements retenus"
+    if stats.get("invalid"):
+        message += f", {stats['invalid']} lignes invalides"
+    if "stored" in stats:
+        message += f", {stats['stored']} nouveaux en base"
+    if "error" in stats:
+        message += f" (archive illisible : {stats['error']})"
+    if "store_error" in stats:
+        message += f" (écriture en base impossible : {stats['store_error']})"
+    print(message, file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion hors ligne des archives horaires GH Archive (.json.gz).")
+    parser.add_argument("inputs", nargs="+", help="Fichiers .json.gz ou dossiers les contenant")
+    parser.add_argument("-u", "--user", action="append", default=[], help="Utilisateur à retenir (répétable)")
+    parser.add_argument("-U", "--users-file", help="Fichier contenant un nom d'utilisateur par ligne")
+    parser.add_argument("-r", "--repo", action="append", default=[], help="Dépôt à retenir, owner/nom (répétable)")
+    parser.add_argument("-R", "--repos-file", help="Fichier contenant un dépôt par ligne")
+    parser.add_argument("--outputs", default=",".join(OUTPUTS),
+                        help=f"Agrégats calculés, séparés par des virgules ({','.join(OUTPUTS)} par défaut)")
+    parser.add_argument("--store", help="Enregistrer les événements dans cette base SQLite au lieu de les agréger")
+    parser.add_argument("--total", action="store_true", help="Ajouter une ligne agrégeant tous les utilisateurs")
+    parser.add_argument("-o", "--output", default="-", help="Fichier NDJSON des agrégats ('-' pour stdout)")
+    parser.add_argument("-w", "--workers", type=int, help="Nombre de processus (nombre de CPU par défaut)")
+    args = parser.parse_args()
+
+    users = read_names(args.user, args.users_file)
+    repos = read_names(args.repo, args.repos_file)
+    paths = list_archives(args.inputs)
+    if not users and not repos:
+        # Sans filtre, tous les acteurs d'une archive sont agrégés : la mémoire n'est plus bornée
+        print("Attention : aucun utilisateur ni dépôt, tous les événements sont retenus", file=sys.stderr)
+
+    if args.store:
+        stored = ArchiveIngestService.store(
+            paths, args.store, users, repos, max_workers=args.workers, on_file=report_file
+        )
+        print(f"{stored} nouveaux événements enregistrés dans {args.store}", file=sys.stderr)
+        return
+
+    outputs = [name.strip() for name in args.outputs.split(",") if name.strip()]
+    aggregators = ArchiveIngestService.aggregate(
+        paths, users, repos, outputs=outputs, max_workers=args.workers, on_file=report_file
+    )
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for login in sorted(aggregators):
+            write_result(output, login, aggregators[login].results())
+        if args.total:
+            write_result(output, "*", ArchiveIngestService.merge_all(aggregators, outputs).results())
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{len(paths)} archives, {len(aggregators)} utilisateurs agrégés", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,49 @@
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
-from api.github_client import GitHubClient
-from models.event import EventProcessor
-from services.event_service import EventFilterService
-from services.stats_service import StatsService
-from services.visualization_service import VisualizationService
-from services.export_service import ExportService
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api.github_client import GitHubClient
+from src.api.response_cache import ResponseCache
+from src.services.event_service import EventFilterService
+from src.services.event_store import EventStore
+from src.services.sync_service import SyncService
+from src.services.stats_service import StatsService
+from src.services import export_service, visualization_service
+from src.services.render_pipeline import RenderPipeline
+from src.services.export_service import ExportService
+from src.utils.lazy import preload
+from src.utils.metrics import timed, trace
 
 def main():
     # Charger le token GitHub depuis les variables d'environnement (optionnel)
     load_dotenv()
     github_token = os.getenv('GITHUB_TOKEN')
+    # Pool de tokens optionnel (séparés par des virgules) pour multiplier le quota
+    github_tokens = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+
+    # Initialiser le client GitHub avec le cache des réponses (requêtes conditionnelles)
+    cache = ResponseCache(os.getenv('GITHUB_CACHE_PATH', '.cache/github_responses.sqlite'))
+    client = GitHubClient(
+        token=github_token,
+        base_url=os.getenv('GITHUB_API_URL', 'https://api.github.com'),
+        tokens=github_tokens,
+        cache=cache
+    )
+
+    # Stockage local des événements, synchronisé de manière incrémentale
+    store = EventStore(os.getenv('GITHUB_EVENT_STORE', 'data/events.sqlite'))
 
-    # Initialiser le client GitHub
-    client = GitHubClient(token=github_token)
+    # Pool de processus générant les graphiques en parallèle, démarré pendant la saisie
+    render_workers = os.getenv('RENDER_WORKERS')
+    pipeline = RenderPipeline(max_workers=int(render_workers) if render_workers else None)
+    pipeline.warm_up()
+
+    # Précharger les bibliothèques de rendu et d'export pendant la saisie
+    preload(visualization_service.HEAVY_MODULES + export_service.HEAVY_MODULES)
 
     while True:
         try:
@@ -24,50 +54,60 @@ def main():
             print("\nPériodes disponibles : 24h, 48h, 1w, 2w, 30d")
             timeframe = input("Choisissez une période (30d par défaut) : ") or "30d"
 
-            # Récupérer et traiter les événements
-            print("\nRécupération des données...")
-            raw_events = client.get_user_events(username)
-            
-            # Traiter chaque événement
-            events = [EventProcessor.process_event(event) for event in raw_events]
-            
-            # Filtrer par période
-            filtered_events = EventFilterService.filter_by_timeframe(events, timeframe)
-            
-            if not filtered_events:
-                print(f"\nAucune activité trouvée pour {username} dans la période {timeframe}")
-                continue
+            with trace() as analysis_trace:
+                # Synchroniser les nouveaux événements dans le stockage local
+                print("\nRécupération des données...")
+                cutoff = EventFilterService.get_cutoff(timeframe)
+                new_events = SyncService.sync_user(client, store, username)
+                print(f"{new_events} nouvel(s) événement(s) synchronisé(s)")
+                
+                # Lire les événements de la période depuis le stockage local
+                with timed("store_read"):
+                    filtered_events = store.get_user_events(username, since=cutoff)
+                
+                if not filtered_events:
+                    print(f"\nAucune activité trouvée pour {username} dans la période {timeframe}")
+                    continue
 
-            # Calculer les statistiques
-            print("\nCalcul des statistiques...")
-            stats = StatsService.calculate_global_stats(filtered_events)
-            
-            # Afficher les statistiques de base
-            print(f"\nStatistiques pour {username} (derniers {timeframe}):")
-            print(f"Total des commits : {stats['total_commits']}")
-            print(f"Issues créées : {stats['total_issues']}")
-            print(f"Pull Requests : {stats['total_prs']}")
-            print(f"Nombre de dépôts actifs : {stats['total_repos']}")
-
-            # Générer les visualisations
-            print("\nGénération des visualisations...")
-            hist_path = VisualizationService.create_commit_histogram(filtered_events, timeframe)
-            pie_path = VisualizationService.create_activity_pie_chart(stats)
-            timeline_path = VisualizationService.create_activity_timeline(filtered_events)
-
-            # Exporter les données
-            print("\nExport des données...")
-            csv_path = ExportService.to_csv(filtered_events)
-            json_path = ExportService.to_json(filtered_events)
-            pdf_path = ExportService.to_pdf(stats)
-
-            print("\nFichiers générés :")
-            print(f"Histogramme des commits : {hist_path}")
-            print(f"Distribution des activités : {pie_path}")
-            print(f"Timeline d'activité : {timeline_path}")
-            print(f"Export CSV : {csv_path}")
-            print(f"Export JSON : {json_path}")
-            print(f"Export PDF : {pdf_path}")
+                # Calculer les statistiques
+                print("\nCalcul des statistiques...")
+                with timed("stats"):
+                    stats = StatsService.calculate_global_stats(filtered_events)
+                
+                # Afficher les statistiques de base
+                print(f"\nStatistiques pour {username} (derniers {timeframe}):")
+                print(f"Total des commits : {stats['total_commits']}")
+                print(f"Issues créées : {stats['total_issues']}")
+                print(f"Pull Requests : {stats['total_prs']}")
+                print(f"Nombre de dépôts actifs : {stats['total_repos']}")
+
+                # Générer les visualisations
+                print("\nGénération des visualisations...")
+                with timed("render"):
+                    chart_paths = pipeline.render_all(filtered_events, stats, timeframe)
+
+                # Exporter les données
+                print("\nExport des données...")
+                with timed("export_csv"):
+                    csv_path = ExportService.to_csv(filtered_events)
+                with timed("export_json"):
+                    json_path = ExportService.to_json(filtered_events)
+                with timed("export_pdf"):
+                    pdf_path = ExportService.to_pdf(stats)
+
+                print("\nFichiers générés :")
+                print(f"Histogramme des commits : {chart_paths['hist_path']}")
+                print(f"Distribution des activités : {chart_paths['pie_path']}")
+                print(f"Timeline d'activité : {chart_paths['timeline_path']}")
+                print(f"Carte de chaleur : {chart_paths['heatmap_path']}")
+                print(f"Export CSV : {csv_path}")
+                print(f"Export JSON : {json_path}")
+                print(f"Export PDF : {pdf_path}")
+
+            # Afficher la durée de chaque étape
+            print("\nDurée des étapes :")
+            for stage, seconds in analysis_trace.stages:
+                print(f"  {stage:<14} {seconds * 1000:8.1f} ms")
 
             # Demander si l'utilisateur veut continuer
             if input("\nVoulez-vous analyser un autre utilisateur ? (o/N) : ").lower() != 'o':
@@ -80,5 +120,7 @@ def main():
             if input("\nVoulez-vous réessayer ? (o/N) : ").lower() != 'o':
                 break
 
+    pipeline.shutdown()
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
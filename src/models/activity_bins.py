@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from src.models.event_batch import EventBatch, to_epoch
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_HOUR = 3600
+
+# 1970-01-01 était un jeudi : (jours depuis l'epoch + 3) % 7 donne 0 pour lundi
+EPOCH_WEEKDAY_OFFSET = 3
+
+
+class ActivityBins:
+    """Event counts pre-binned by day, hour and hour of the week (UTC).
+
+    Built once per analysis with vectorized NumPy operations; charts are
+    then drawn from these arrays, so their cost depends on the number of
+    bins rather than the number of events:
+
+    - ``day_counts``: events per type (rows, ``type_names``) and day
+      (columns, from ``first_day``), int64 of shape ``(types, days)``
+    - ``hour_counts``: events per hour of the day, shape ``(24,)``
+    - ``week_hour_counts``: events per weekday (Monday first) and hour,
+      shape ``(7, 24)``
+    - ``push_timestamps``/``push_commits``: epoch seconds and commit counts
+      of push events, used for the commit histogram
+    """
+
+    def __init__(self, type_names: List[str], first_day: int, day_counts: np.ndarray,
+                 hour_counts: np.ndarray, week_hour_counts: np.ndarray,
+                 push_timestamps: np.ndarray, push_commits: np.ndarray):
+        self.type_names = type_names
+        self.first_day = first_day
+        self.day_counts = day_counts
+        self.hour_counts = hour_counts
+        self.week_hour_counts = week_hour_counts
+        self.push_timestamps = push_timestamps
+        self.push_commits = push_commits
+
+    def __len__(self) -> int:
+        return int(self.hour_counts.sum())
+
+    @classmethod
+    def from_events(cls, events: Union[List[Dict], EventBatch, "ActivityBins"]) -> "ActivityBins":
+        """Bin processed events (or an :class:`EventBatch`); bins are returned unchanged."""
+        if isinstance(events, ActivityBins):
+            return events
+        if isinstance(events, EventBatch):
+            return cls.from_batch(events)
+
+        # Seules les colonnes utiles aux graphiques sont extraites (pas de dépôts ni d'actions)
+        timestamps, types, commits = [], [], []
+        for event in events:
+            timestamps.append(to_epoch(event["created_at"]))
+            types.append(event["type"])
+            commits.append(event["details"].get("commits", 0) if event["type"] == "PushEvent" else 0)
+        type_names, type_codes = np.unique(np.asarray(types, dtype=str), return_inverse=True)
+        return cls._bin(
+            np.asarray(timestamps, dtype=np.int64), type_codes.astype(np.int64), type_names.tolist(),
+            np.asarray(commits, dtype=np.int64)
+        )
+
+    @classmethod
+    def from_batch(cls, batch: EventBatch) -> "ActivityBins":
+        """Bin the columns of an :class:`EventBatch`."""
+        return cls._bin(batch.timestamps, batch.type_codes.astype(np.int64), batch.type_names,
+                        batch.commits.astype(np.int64))
+
+    @classmethod
+    def _bin(cls, timestamps: np.ndarray, type_codes: np.ndarray, type_names: List[str],
+             commits: np.ndarray) -> "ActivityBins":
+        type_count = len(type_names)
+        days = timestamps // SECONDS_PER_DAY
+        hours = (timestamps // SECONDS_PER_HOUR) % 24
+
+        if len(timestamps):
+            first_day = int(days.min())
+            day_span = int(days.max()) - first_day + 1
+            # Une seule passe : chaque couple (type, jour) devient un indice à plat
+            flat = type_codes * day_span + (days - first_day)
+            day_counts = np.bincount(flat, minlength=type_count * day_span).reshape(type_count, day_span)
+        else:
+            first_day = 0
+            day_counts = np.zeros((0, 0), dtype=np.int64)
+
+        weekdays = (days + EPOCH_WEEKDAY_OFFSET) % 7
+        week_hour_counts = np.bincount(weekdays * 24 + hours, minlength=7 * 24).reshape(7, 24)
+
+        if "PushEvent" in type_names:
+            push_mask = type_codes == type_names.index("PushEvent")
+        else:
+            push_mask = np.zeros(len(timestamps), dtype=bool)
+        return cls(
+            type_names=list(type_names),
+            first_day=first_day,
+            day_counts=day_counts.astype(np.int64),
+            hour_counts=np.bincount(hours, minlength=24).astype(np.int64),
+            week_hour_counts=week_hour_counts.astype(np.int64),
+            push_timestamps=timestamps[push_mask],
+            push_commits=commits[push_mask]
+        )
+
+    def days(self) -> List[str]:
+        """ISO dates of the ``day_counts`` columns."""
+        start = datetime(1970, 1, 1) + timedelta(days=self.first_day)
+        return [(start + timedelta(days=offset)).date().isoformat() for offset in range(self.day_counts.shape[1])]
+
+    def daily_series(self) -> Dict[str, List[int]]:
+        """Events per day for each event type present, keyed by type name."""
+        return {
+            name: self.day_counts[code].tolist()
+            for code, name in enumerate(self.type_names)
+            if self.day_counts.shape[1] and self.day_counts[code].any()
+        }
+
+    def commit_histogram(self, bins: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+        """Commits per interval over the push events' time span: ``(counts, edges)`` in epoch seconds."""
+        if not len(self.push_timestamps):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        counts, edges = np.histogram(self.push_timestamps, bins=bins, weights=self.push_commits)
+        return counts.astype(np.int64), edges
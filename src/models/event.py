@@ -29,8 +29,11 @@ class EventProcessor:
         payload = event["payload"]
         
         if event_type == "PushEvent":
+            # The API lists at most 20 commits; "size" is the real count when present
+            commits = payload.get("size", len(payload.get("commits", [])))
             return {
-                "commits": len(payload.get("commits", [])),
+                "commits": commits,
+                "distinct_commits": payload.get("distinct_size", commits),
                 "ref": payload.get("ref", "")
             }
         elif event_type == "IssuesEvent":
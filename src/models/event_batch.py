@@ -0,0 +1,187 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from datetime import datetime
+import calendar
+
+import numpy as np
+
+
+def to_epoch(value: datetime) -> int:
+    """Convert a naive UTC datetime to epoch seconds."""
+    return calendar.timegm(value.timetuple())
+
+
+def _factorize(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Encode a sequence of strings as integer codes and their vocabulary."""
+    if not values:
+        return np.empty(0, dtype=np.int32), []
+    names, codes = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+    return codes.astype(np.int32), names.tolist()
+
+
+class EventBatch:
+    """Columnar representation of a list of GitHub events.
+
+    Each event is stored as one row across typed NumPy columns:
+
+    - ``ids``: event id (int64)
+    - ``type_codes``: index into ``type_names`` (int32)
+    - ``timestamps``: ``created_at`` as epoch seconds, UTC (int64)
+    - ``repo_ids``: index into ``repo_names`` (int32)
+    - ``commits``: number of commits for push events, 0 otherwise (int32)
+    - ``action_codes``: index into ``action_names``, "" when absent (int32)
+    - ``numbers``: issue or pull request number, -1 when absent (int64)
+    """
+
+    COLUMNS = ("ids", "type_codes", "timestamps", "repo_ids", "commits", "action_codes", "numbers")
+
+    def __init__(self, ids: np.ndarray, type_codes: np.ndarray, type_names: List[str],
+                 timestamps: np.ndarray, repo_ids: np.ndarray, repo_names: List[str],
+                 commits: np.ndarray, action_codes: np.ndarray, action_names: List[str],
+                 numbers: np.ndarray):
+        self.ids = ids
+        self.type_codes = type_codes
+        self.type_names = type_names
+        self.timestamps = timestamps
+        self.repo_ids = repo_ids
+        self.repo_names = repo_names
+        self.commits = commits
+        self.action_codes = action_codes
+        self.action_names = action_names
+        self.numbers = numbers
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_raw(cls, raw_events: Iterable[Dict]) -> "EventBatch":
+        """Build a batch directly from raw API JSON events in a single pass."""
+        ids, types, created, repos, commits, actions, numbers = [], [], [], [], [], [], []
+        for event in raw_events:
+            payload = event.get("payload") or {}
+            event_type = event["type"]
+            ids.append(int(event["id"]))
+            types.append(event_type)
+            created.append(event["created_at"])
+            repos.append(event["repo"]["name"])
+            actions.append(payload.get("action") or "")
+            if event_type == "PushEvent":
+                commits.append(payload.get("size", len(payload.get("commits", []))))
+            else:
+                commits.append(0)
+            if event_type == "IssuesEvent":
+                numbers.append((payload.get("issue") or {}).get("number"))
+            elif event_type == "PullRequestEvent":
+                numbers.append((payload.get("pull_request") or {}).get("number"))
+            else:
+                numbers.append(None)
+
+        # Analyse vectorisée des dates ISO 8601 (le suffixe "Z" est retiré)
+        timestamps = np.char.rstrip(np.asarray(created, dtype="U20"), "Z").astype("datetime64[s]")
+        return cls._build(ids, types, timestamps.astype(np.int64), repos, commits, actions, numbers)
+
+    @classmethod
+    def from_events(cls, events: Iterable[Dict]) -> "EventBatch":
+        """Build a batch from events processed by :class:`EventProcessor`."""
+        ids, types, timestamps, repos, commits, actions, numbers = [], [], [], [], [], [], []
+        for event in events:
+            details = event["details"]
+            ids.append(int(event["id"]))
+            types.append(event["type"])
+            timestamps.append(to_epoch(event["created_at"]))
+            repos.append(event["repo_name"])
+            commits.append(details.get("commits", 0))
+            actions.append(details.get("action") or "")
+            numbers.append(details.get("issue_number", details.get("pr_number")))
+        return cls._build(ids, types, np.asarray(timestamps, dtype=np.int64), repos, commits, actions, numbers)
+
+    @classmethod
+    def _build(cls, ids: List[int], types: List[str], timestamps: np.ndarray, repos: List[str],
+               commits: List[int], actions: List[str], numbers: List[Optional[int]]) -> "EventBatch":
+        type_codes, type_names = _factorize(types)
+        repo_ids, repo_names = _factorize(repos)
+        action_codes, action_names = _factorize(actions)
+        return cls(
+            ids=np.asarray(ids, dtype=np.int64),
+            type_codes=type_codes,
+            type_names=type_names,
+            timestamps=timestamps,
+            repo_ids=repo_ids,
+            repo_names=repo_names,
+            commits=np.asarray(commits, dtype=np.int32),
+            action_codes=action_codes,
+            action_names=action_names,
+            numbers=np.asarray([-1 if n is None else n for n in numbers], dtype=np.int64)
+        )
+
+    def take(self, selector: Union[np.ndarray, slice]) -> "EventBatch":
+        """Return the rows selected by a boolean mask, an index array or a slice.
+
+        Slices return views on the underlying columns; masks and index arrays
+        return copies. Vocabularies are shared with the original batch.
+        """
+        return EventBatch(
+            ids=self.ids[selector],
+            type_codes=self.type_codes[selector],
+            type_names=self.type_names,
+            timestamps=self.timestamps[selector],
+            repo_ids=self.repo_ids[selector],
+            repo_names=self.repo_names,
+            commits=self.commits[selector],
+            action_codes=self.action_codes[selector],
+            action_names=self.action_names,
+            numbers=self.numbers[selector]
+        )
+
+    def type_mask(self, event_type: str) -> np.ndarray:
+        """Boolean mask of the rows of the given event type."""
+        if event_type not in self.type_names:
+            return np.zeros(len(self), dtype=bool)
+        return self.type_codes == self.type_names.index(event_type)
+
+    def action_mask(self, action: str) -> np.ndarray:
+        """Boolean mask of the rows with the given payload action."""
+        if action not in self.action_names:
+            return np.zeros(len(self), dtype=bool)
+        return self.action_codes == self.action_names.index(action)
+
+    def time_mask(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> np.ndarray:
+        """Boolean mask of the rows created between ``start`` and ``end`` (inclusive)."""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            # Les dates des événements sont à la seconde : une borne fractionnaire est arrondie au-dessus
+            mask &= self.timestamps >= to_epoch(start) + (1 if start.microsecond else 0)
+        if end is not None:
+            mask &= self.timestamps <= to_epoch(end)
+        return mask
+
+    def datetimes(self) -> np.ndarray:
+        """``created_at`` column as ``datetime64[s]`` values."""
+        return self.timestamps.astype("datetime64[s]")
+
+    def to_events(self) -> List[Dict]:
+        """Convert the batch back to the dicts produced by :class:`EventProcessor`.
+
+        The push ``ref`` and ``distinct_commits`` are not part of the columnar
+        form and are not restored.
+        """
+        events = []
+        for row in range(len(self)):
+            event_type = self.type_names[self.type_codes[row]]
+            action = self.action_names[self.action_codes[row]] if self.action_names else ""
+            number = int(self.numbers[row])
+            if event_type == "PushEvent":
+                details = {"commits": int(self.commits[row])}
+            elif event_type == "IssuesEvent":
+                details = {"action": action, "issue_number": None if number < 0 else number}
+            elif event_type == "PullRequestEvent":
+                details = {"action": action, "pr_number": None if number < 0 else number}
+            else:
+                details = {}
+            events.append({
+                "id": str(self.ids[row]),
+                "type": event_type,
+                "created_at": datetime.utcfromtimestamp(int(self.timestamps[row])),
+                "repo_name": self.repo_names[self.repo_ids[row]],
+                "details": details
+            })
+        return events
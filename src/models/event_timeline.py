@@ -0,0 +1,188 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from heapq import merge
+from itertools import islice
+
+HOUR = timedelta(hours=1)
+METRICS = ("events", "commits", "issues", "prs")
+
+
+def _truncate_to_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+class EventView(Sequence):
+    """Read-only view over a contiguous range of an :class:`EventTimeline`.
+
+    No event is copied: the view only keeps the bounds in the underlying list.
+    """
+
+    def __init__(self, events: List[Dict], start: int, stop: int):
+        self._events = events
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, "EventView"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return EventView(self._events, self._start + start, self._start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("EventView index out of range")
+        return self._events[self._start + index]
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(self._start, self._stop):
+            yield self._events[index]
+
+    def __repr__(self) -> str:
+        return f"EventView({len(self)} events)"
+
+
+class EventTimeline(Sequence):
+    """Collection of processed events kept sorted by ``created_at``.
+
+    Window and range queries use bisection and return :class:`EventView`
+    objects instead of copies. Cumulative per-event sums (events, commits,
+    opened issues, opened pull requests) and an hourly index into them give
+    the totals of any window without re-aggregating: the hourly index finds
+    the first event of the window's hour, and only that hour is bisected.
+    """
+
+    def __init__(self, events: Iterable[Dict] = ()):
+        self._events: List[Dict] = sorted(events, key=lambda event: event["created_at"])
+        self._keys: List[datetime] = [event["created_at"] for event in self._events]
+        self._prefix: Dict[str, List[int]] = {metric: [0] for metric in METRICS}
+        self._hour_index: List[int] = [0]
+        self._update_index()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, EventView]:
+        return EventView(self._events, 0, len(self._events))[index]
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._events)
+
+    def add(self, events: Iterable[Dict]) -> None:
+        """Merge new events into the collection, keeping it sorted.
+
+        The batch is sorted once and merged with the events that follow its
+        oldest one in a single pass. Cumulative sums and the hourly index
+        are only recomputed from that point: appending recent events leaves
+        the existing part untouched.
+        """
+        new_events = sorted(events, key=lambda event: event["created_at"])
+        if not new_events:
+            return
+        start = bisect_right(self._keys, new_events[0]["created_at"])
+        # À date égale, les événements déjà présents restent en premier
+        merged = list(merge(self._events[start:], new_events, key=lambda event: event["created_at"]))
+        self._events[start:] = merged
+        self._keys[start:] = [event["created_at"] for event in merged]
+        self._update_index(start)
+
+    def range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> EventView:
+        """Events created between ``start`` and ``end`` (inclusive), oldest first."""
+        low = self._lower_index(start)
+        return EventView(self._events, low, max(low, self._upper_index(end)))
+
+    def window(self, timeframe: str, now: Optional[datetime] = None) -> EventView:
+        """Events of one of the supported timeframes (24h, 48h, 1w, 2w, 30d)."""
+        return self.range(start=self._cutoff(timeframe, now))
+
+    def totals(self, timeframe: str, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Totals of events, commits, opened issues and opened PRs for a timeframe."""
+        return self.range_totals(start=self._cutoff(timeframe, now))
+
+    def range_totals(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, int]:
+        """Totals of events, commits, opened issues and opened PRs between two dates."""
+        low, high = self._lower_index(start), self._upper_index(end)
+        high = max(low, high)
+        return {metric: self._prefix[metric][high] - self._prefix[metric][low] for metric in METRICS}
+
+    def hourly_counts(self, metric: str = "events") -> Dict[datetime, int]:
+        """Value of ``metric`` for every hour between the first and the last event."""
+        prefix = self._prefix[metric]
+        return {
+            self._first_hour + hour * HOUR: prefix[self._hour_index[hour + 1]] - prefix[self._hour_index[hour]]
+            for hour in range(len(self._hour_index) - 1)
+        }
+
+    def _cutoff(self, timeframe: str, now: Optional[datetime]) -> datetime:
+        # Import local : le service de filtrage dépend lui-même de cette collection
+        from src.services.event_service import TIMEFRAMES
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Invalid timeframe. Choose from: {', '.join(TIMEFRAMES.keys())}")
+        return (now or datetime.now()) - TIMEFRAMES[timeframe]
+
+    def _lower_index(self, start: Optional[datetime]) -> int:
+        """Index of the first event created at or after ``start``."""
+        if start is None or not self._events:
+            return 0
+        hour = self._hour_offset(start)
+        if hour < 0:
+            return 0
+        if hour >= len(self._hour_index) - 1:
+            return len(self._events)
+        # Seule l'heure contenant la borne est parcourue par dichotomie
+        return bisect_left(self._keys, start, self._hour_index[hour], self._hour_index[hour + 1])
+
+    def _upper_index(self, end: Optional[datetime]) -> int:
+        """Index just past the last event created at or before ``end``."""
+        if end is None or not self._events:
+            return len(self._events)
+        hour = self._hour_offset(end)
+        if hour < 0:
+            return 0
+        if hour >= len(self._hour_index) - 1:
+            return len(self._events)
+        return bisect_right(self._keys, end, self._hour_index[hour], self._hour_index[hour + 1])
+
+    def _hour_offset(self, value: datetime) -> int:
+        return int((_truncate_to_hour(value) - self._first_hour) / HOUR)
+
+    def _update_index(self, start: int = 0) -> None:
+        """Recompute the cumulative sums and the hourly index from event ``start`` on."""
+        for metric in METRICS:
+            del self._prefix[metric][start + 1:]
+        for event in islice(self._events, start, None):
+            commits = issues = prs = 0
+            if event["type"] == "PushEvent":
+                commits = event["details"]["commits"]
+            elif event["type"] == "IssuesEvent" and event["details"]["action"] == "opened":
+                issues = 1
+            elif event["type"] == "PullRequestEvent" and event["details"]["action"] == "opened":
+                prs = 1
+            self._prefix["events"].append(self._prefix["events"][-1] + 1)
+            self._prefix["commits"].append(self._prefix["commits"][-1] + commits)
+            self._prefix["issues"].append(self._prefix["issues"][-1] + issues)
+            self._prefix["prs"].append(self._prefix["prs"][-1] + prs)
+
+        # _hour_index[h] : indice du premier événement de l'heure h (ou suivante)
+        if not self._events:
+            self._hour_index = [0]
+            self._first_hour = datetime.min
+            return
+        if start == 0:
+            self._first_hour = _truncate_to_hour(self._keys[0])
+            kept = 1
+        else:
+            # Les heures antérieures à celle de l'événement start ne changent pas
+            kept = min(len(self._hour_index), self._hour_offset(self._keys[start]) + 1)
+        del self._hour_index[kept:]
+        hours = self._hour_offset(self._keys[-1]) + 1
+        position = self._hour_index[-1]
+        for hour in range(kept, hours + 1):
+            boundary = self._first_hour + hour * HOUR
+            while position < len(self._keys) and self._keys[position] < boundary:
+                position += 1
+            self._hour_index.append(position)
@@ -0,0 +1,245 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+OUTPUTS = ("global", "types", "trends", "repos")
+
+# Poids du score d'activité des dépôts
+COMMIT_WEIGHT = 1
+ISSUE_WEIGHT = 2
+PR_WEIGHT = 3
+
+
+def ordered_type_counts(counts: Dict[str, int]) -> Dict[str, int]:
+    """Comptes par type dans l'ordre commun à tous les calculs : du plus fréquent au moins fréquent, puis par nom."""
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+class ActivityAggregator:
+    """Agrège en une seule passe les statistiques globales, les tendances
+    journalières, les comptes par type et le classement des dépôts.
+
+    Seules les sorties demandées (``outputs``) sont calculées. Deux
+    agrégateurs construits sur des lots d'événements différents peuvent être
+    fusionnés avec :meth:`merge`, ce qui permet d'agréger en parallèle. Un
+    événement déjà ajouté peut être retiré avec :meth:`remove` (fenêtre
+    glissante), sauf pour le classement des dépôts.
+    """
+
+    def __init__(self, outputs: Sequence[str] = OUTPUTS, trend_start: Optional[datetime] = None):
+        unknown = set(outputs) - set(OUTPUTS)
+        if unknown:
+            raise ValueError(f"Invalid outputs: {', '.join(sorted(unknown))}. Choose from: {', '.join(OUTPUTS)}")
+
+        self.outputs = frozenset(outputs)
+        self.trend_start = trend_start
+
+        self.total_commits = 0
+        self.total_issues = 0
+        self.total_prs = 0
+        # Nombre d'événements par dépôt : un dépôt disparaît quand son dernier événement est retiré
+        self.repos: Dict[str, int] = {}
+        self.events_by_type: Dict[str, int] = {}
+        self.activity_by_day: Dict[str, int] = {}
+        self.daily_activity: Dict[str, Dict[str, int]] = {}
+        self.repo_stats: Dict[str, Dict] = {}
+
+    def add(self, event: Dict) -> None:
+        """Ajoute un événement traité aux agrégats."""
+        event_type = event["type"]
+        created_at = event["created_at"]
+
+        # Classification de l'événement, faite une seule fois pour toutes les sorties
+        commits = issues = prs = 0
+        if event_type == "PushEvent":
+            commits = event["details"]["commits"]
+        elif event_type == "IssuesEvent" and event["details"]["action"] == "opened":
+            issues = 1
+        elif event_type == "PullRequestEvent" and event["details"]["action"] == "opened":
+            prs = 1
+
+        day = None
+        if "global" in self.outputs or "trends" in self.outputs:
+            day = created_at.date().isoformat()
+
+        if "global" in self.outputs:
+            self.total_commits += commits
+            self.total_issues += issues
+            self.total_prs += prs
+            self.repos[event["repo_name"]] = self.repos.get(event["repo_name"], 0) + 1
+            self.activity_by_day[day] = self.activity_by_day.get(day, 0) + 1
+
+        if "global" in self.outputs or "types" in self.outputs:
+            self.events_by_type[event_type] = self.events_by_type.get(event_type, 0) + 1
+
+        if "trends" in self.outputs and (self.trend_start is None or created_at >= self.trend_start):
+            trend = self.daily_activity.get(day)
+            if trend is None:
+                trend = self.daily_activity[day] = {"commits": 0, "issues": 0, "prs": 0, "total": 0}
+            trend["commits"] += commits
+            trend["issues"] += issues
+            trend["prs"] += prs
+            trend["total"] += 1
+
+        if "repos" in self.outputs:
+            repo = self.repo_stats.get(event["repo_name"])
+            if repo is None:
+                repo = self.repo_stats[event["repo_name"]] = {
+                    "commits": 0, "issues": 0, "prs": 0, "last_activity": None
+                }
+            repo["commits"] += commits
+            repo["issues"] += issues
+            repo["prs"] += prs
+            if not repo["last_activity"] or created_at > repo["last_activity"]:
+                repo["last_activity"] = created_at
+
+    def remove(self, event: Dict) -> None:
+        """Retire des agrégats un événement ajouté auparavant."""
+        if "repos" in self.outputs:
+            raise ValueError("Cannot remove events from the repository ranking")
+
+        event_type = event["type"]
+        created_at = event["created_at"]
+        commits = issues = prs = 0
+        if event_type == "PushEvent":
+            commits = event["details"]["commits"]
+        elif event_type == "IssuesEvent" and event["details"]["action"] == "opened":
+            issues = 1
+        elif event_type == "PullRequestEvent" and event["details"]["action"] == "opened":
+            prs = 1
+        day = created_at.date().isoformat()
+
+        if "global" in self.outputs:
+            self.total_commits -= commits
+            self.total_issues -= issues
+            self.total_prs -= prs
+            _decrement(self.repos, event["repo_name"])
+            _decrement(self.activity_by_day, day)
+
+        if "global" in self.outputs or "types" in self.outputs:
+            _decrement(self.events_by_type, event_type)
+
+        if "trends" in self.outputs and (self.trend_start is None or created_at >= self.trend_start):
+            trend = self.daily_activity[day]
+            trend["commits"] -= commits
+            trend["issues"] -= issues
+            trend["prs"] -= prs
+            trend["total"] -= 1
+            if not trend["total"]:
+                del self.daily_activity[day]
+
+    def update(self, events: Iterable[Dict]) -> "ActivityAggregator":
+        """Ajoute une série d'événements et retourne l'agrégateur."""
+        for event in events:
+            self.add(event)
+        return self
+
+    def merge(self, other: "ActivityAggregator") -> "ActivityAggregator":
+        """Fusionne les agrégats partiels d'un autre agrégateur dans celui-ci."""
+        if other.outputs != self.outputs or other.trend_start != self.trend_start:
+            raise ValueError("Cannot merge aggregators with different outputs or trend start")
+
+        self.total_commits += other.total_commits
+        self.total_issues += other.total_issues
+        self.total_prs += other.total_prs
+        for name, count in other.repos.items():
+            self.repos[name] = self.repos.get(name, 0) + count
+        for event_type, count in other.events_by_type.items():
+            self.events_by_type[event_type] = self.events_by_type.get(event_type, 0) + count
+        for day, count in other.activity_by_day.items():
+            self.activity_by_day[day] = self.activity_by_day.get(day, 0) + count
+
+        for day, trend in other.daily_activity.items():
+            current = self.daily_activity.setdefault(day, {"commits": 0, "issues": 0, "prs": 0, "total": 0})
+            for key, value in trend.items():
+                current[key] += value
+
+        for name, repo in other.repo_stats.items():
+            current = self.repo_stats.get(name)
+            if current is None:
+                self.repo_stats[name] = dict(repo)
+                continue
+            current["commits"] += repo["commits"]
+            current["issues"] += repo["issues"]
+            current["prs"] += repo["prs"]
+            if repo["last_activity"] and (not current["last_activity"] or repo["last_activity"] > current["last_activity"]):
+                current["last_activity"] = repo["last_activity"]
+        return self
+
+    def global_stats(self) -> Dict:
+        """Statistiques globales, au format de StatsService.calculate_global_stats."""
+        return {
+            "total_commits": self.total_commits,
+            "total_issues": self.total_issues,
+            "total_prs": self.total_prs,
+            "total_repos": len(self.repos),
+            "events_by_type": ordered_type_counts(self.events_by_type),
+            "activity_by_day": dict(self.activity_by_day)
+        }
+
+    def activity_trends(self) -> Dict:
+        """Tendances journalières, au format de StatsService.calculate_activity_trends."""
+        return {day: dict(trend) for day, trend in self.daily_activity.items()}
+
+    def ranked_repositories(self) -> List[Dict]:
+        """Classement des dépôts, au format de RepoRankingService.rank_repositories."""
+        # Le score pondéré est calculé une seule fois par dépôt
+        ranked_repos = [
+            {
+                "repo": name,
+                "commits": stats["commits"],
+                "issues": stats["issues"],
+                "prs": stats["prs"],
+                "total_activity": (
+                    stats["commits"] * COMMIT_WEIGHT +
+                    stats["issues"] * ISSUE_WEIGHT +
+                    stats["prs"] * PR_WEIGHT
+                ),
+                "last_activity": stats["last_activity"]
+            }
+            for name, stats in self.repo_stats.items()
+        ]
+        return sorted(
+            ranked_repos,
+            key=lambda x: (x["total_activity"], x["last_activity"]),
+            reverse=True
+        )
+
+    def results(self) -> Dict:
+        """Retourne les sorties demandées, indexées par nom de sortie."""
+        results = {}
+        if "global" in self.outputs:
+            results["global"] = self.global_stats()
+        if "types" in self.outputs:
+            results["types"] = ordered_type_counts(self.events_by_type)
+        if "trends" in self.outputs:
+            results["trends"] = self.activity_trends()
+        if "repos" in self.outputs:
+            results["repos"] = self.ranked_repositories()
+        return results
+
+
+def _decrement(counts: Dict[str, int], key: str) -> None:
+    counts[key] -= 1
+    if not counts[key]:
+        del counts[key]
+
+
+def _aggregate_partition(events: List[Dict], outputs: Sequence[str],
+                         trend_start: Optional[datetime]) -> ActivityAggregator:
+    return ActivityAggregator(outputs, trend_start).update(events)
+
+
+def aggregate_in_parallel(partitions: Iterable[List[Dict]], outputs: Sequence[str] = OUTPUTS,
+                          trend_start: Optional[datetime] = None,
+                          max_workers: Optional[int] = None) -> ActivityAggregator:
+    """Agrège plusieurs lots d'événements dans un pool de processus puis fusionne les résultats."""
+    result = ActivityAggregator(outputs, trend_start)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_aggregate_partition, partition, outputs, trend_start)
+            for partition in partitions
+        ]
+        for future in futures:
+            result.merge(future.result())
+    return result
@@ -0,0 +1,205 @@
+"""
+Ingestion hors ligne des archives horaires GH Archive (``YYYY-MM-DD-H.json.gz``).
+
+Chaque fichier est décompressé en flux et lu ligne par ligne : la mémoire
+utilisée ne dépend pas de la taille des archives. Les fichiers sont répartis
+sur un pool de processus ; chaque processus filtre les événements des
+utilisateurs et dépôts demandés, les normalise avec ``EventProcessor`` puis
+les agrège (``ActivityAggregator``, fusionnés ensuite) ou les enregistre
+dans un ``EventStore``.
+"""
+import gzip
+import multiprocessing
+import re
+import sqlite3
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from src.api.decoding import loads
+from src.models.event import EventProcessor
+from src.services.aggregation_service import OUTPUTS, ActivityAggregator
+from src.services.event_store import EventStore
+
+# Événements enregistrés par transaction en mode stockage
+STORE_BATCH_SIZE = 5000
+
+# Délai d'attente d'un processus quand un autre écrit dans la base, en secondes
+STORE_BUSY_TIMEOUT = 120.0
+
+# Archive tronquée (téléchargement interrompu) ou corrompue
+READ_ERRORS = (EOFError, OSError, zlib.error)
+
+
+def _prefilter(users: Sequence[str], repos: Sequence[str]) -> Optional[re.Pattern]:
+    """Expression recherchée sur la ligne brute avant tout décodage JSON.
+
+    Une ligne qui ne contient aucun des noms entre guillemets ne peut pas
+    correspondre : on évite ainsi le décodage JSON pour la quasi-totalité des
+    événements d'une archive.
+    """
+    names = [name.lower() for name in (*users, *repos)]
+    if not names:
+        return None
+    alternatives = b"|".join(re.escape(name.encode("utf-8")) for name in sorted(set(names)))
+    return re.compile(b'"(?:' + alternatives + b')"', re.IGNORECASE)
+
+
+def iter_archive_events(path: str, users: Sequence[str] = (), repos: Sequence[str] = (),
+                        stats: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    """Événements bruts d'une archive ``.json.gz`` (ou ``.json``) dont l'auteur ou le dépôt est demandé.
+
+    Sans utilisateur ni dépôt, tous les événements sont renvoyés. Les lignes
+    invalides sont ignorées ; ``stats`` reçoit les nombres de lignes lues,
+    d'événements retenus et de lignes invalides.
+    """
+    user_set = {user.lower() for user in users}
+    repo_set = {repo.lower() for repo in repos}
+    pattern = _prefilter(users, repos)
+    stats = stats if stats is not None else {}
+    for key in ("lines", "matched", "invalid"):
+        stats.setdefault(key, 0)
+
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for line in f:
+            stats["lines"] += 1
+            if pattern is not None and pattern.search(line) is None:
+                continue
+            try:
+                event = loads(line)
+                login = event["actor"]["login"].lower()
+                repo_name = event["repo"]["name"].lower()
+            except (ValueError, KeyError, TypeError, AttributeError):
+                # Ligne tronquée ou ancien format (avant 2015, acteur sous forme de chaîne)
+                stats["invalid"] += 1
+                continue
+            if pattern is not None and login not in user_set and repo_name not in repo_set:
+                continue
+            stats["matched"] += 1
+            yield event
+
+
+def _process_events(path: str, users: Sequence[str], repos: Sequence[str],
+                    stats: Dict[str, int]) -> Iterator[tuple]:
+    """Couples (auteur, événement traité) d'une archive, au format de ``EventProcessor``."""
+    for event in iter_archive_events(path, users, repos, stats):
+        try:
+            processed = EventProcessor.process_event(event)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            stats["invalid"] += 1
+            continue
+        yield event["actor"]["login"], processed
+
+
+def aggregate_file(path: str, users: Sequence[str] = (), repos: Sequence[str] = (),
+                   outputs: Sequence[str] = OUTPUTS, trend_start: Optional[datetime] = None) -> Dict:
+    """Agrège une archive par utilisateur ; renvoie les agrégateurs et les compteurs du fichier."""
+    stats = {"path": path}
+    aggregators: Dict[str, ActivityAggregator] = {}
+    try:
+        for login, event in _process_events(path, users, repos, stats):
+            aggregator = aggregators.get(login.lower())
+            if aggregator is None:
+                aggregator = aggregators[login.lower()] = ActivityAggregator(outputs, trend_start)
+            aggregator.add(event)
+    except READ_ERRORS as e:
+        stats["error"] = str(e) or type(e).__name__
+    return {"stats": stats, "aggregators": aggregators}
+
+
+def store_file(path: str, store_path: str, users: Sequence[str] = (), repos: Sequence[str] = ()) -> Dict:
+    """Enregistre les événements d'une archive dans l'``EventStore`` situé à ``store_path``, par lots.
+
+    Les processus du pool écrivent à tour de rôle dans la même base. Si elle
+    reste verrouillée au-delà de ``STORE_BUSY_TIMEOUT``, l'échec est signalé
+    dans ``stats["store_error"]`` pour ce seul fichier.
+    """
+    stats = {"path": path, "stored": 0}
+    batches: Dict[str, List[Dict]] = {}
+    pending = 0
+
+    try:
+        store = EventStore(store_path, timeout=STORE_BUSY_TIMEOUT)
+
+        def flush() -> None:
+            for login, events in batches.items():
+                stats["stored"] += store.save_events(login, events)
+            batches.clear()
+
+        try:
+            for login, event in _process_events(path, users, repos, stats):
+                batches.setdefault(login.lower(), []).append(event)
+                pending += 1
+                if pending >= STORE_BATCH_SIZE:
+                    flush()
+                    pending = 0
+        except READ_ERRORS as e:
+            stats["error"] = str(e) or type(e).__name__
+        flush()
+    except sqlite3.OperationalError as e:
+        stats["store_error"] = str(e) or type(e).__name__
+    return {"stats": stats}
+
+
+class ArchiveIngestService:
+    """Répartit les archives sur un pool de processus et combine leurs résultats."""
+
+    @staticmethod
+    def _run(task: Callable[..., Dict], paths: Iterable[str], args: tuple,
+             max_workers: Optional[int], on_file: Optional[Callable[[Dict], None]]) -> Iterator[Dict]:
+        # Contexte spawn : sans risque même si l'appelant a des threads actifs
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            futures = [executor.submit(task, path, *args) for path in paths]
+            # Les résultats sont consommés dès qu'ils arrivent pour ne pas les accumuler
+            for future in as_completed(futures):
+                result = future.result()
+                if on_file is not None:
+                    on_file(result["stats"])
+                yield result
+
+    @staticmethod
+    def aggregate(paths: Iterable[str], users: Sequence[str] = (), repos: Sequence[str] = (),
+                  outputs: Sequence[str] = OUTPUTS, trend_start: Optional[datetime] = None,
+                  max_workers: Optional[int] = None,
+                  on_file: Optional[Callable[[Dict], None]] = None) -> Dict[str, ActivityAggregator]:
+        """Agrège les archives en parallèle ; renvoie un agrégateur par utilisateur (login en minuscules).
+
+        Les sorties de chaque agrégateur sont au format de ``StatsService`` et
+        ``RepoRankingService`` ; ``merge_all`` donne l'agrégat de l'ensemble.
+        """
+        result: Dict[str, ActivityAggregator] = {}
+        args = (tuple(users), tuple(repos), tuple(outputs), trend_start)
+        for file_result in ArchiveIngestService._run(aggregate_file, paths, args, max_workers, on_file):
+            for login, aggregator in file_result["aggregators"].items():
+                if login in result:
+                    result[login].merge(aggregator)
+                else:
+                    result[login] = aggregator
+        return result
+
+    @staticmethod
+    def store(paths: Iterable[str], store_path: str, users: Sequence[str] = (), repos: Sequence[str] = (),
+              max_workers: Optional[int] = None, on_file: Optional[Callable[[Dict], None]] = None) -> int:
+        """Enregistre les archives dans un ``EventStore`` SQLite ; renvoie le nombre de nouveaux événements."""
+        if store_path == ":memory:":
+            raise ValueError("Ingestion into an in-memory store is not possible from worker processes")
+        # Créer le schéma avant que les processus n'ouvrent la base en parallèle
+        EventStore(store_path)
+        args = (store_path, tuple(users), tuple(repos))
+        return sum(
+            file_result["stats"]["stored"]
+            for file_result in ArchiveIngestService._run(store_file, paths, args, max_workers, on_file)
+        )
+
+    @staticmethod
+    def merge_all(aggregators: Dict[str, ActivityAggregator],
+                  outputs: Sequence[str] = OUTPUTS,
+                  trend_start: Optional[datetime] = None) -> ActivityAggregator:
+        """Fusionne les agrégateurs de tous les utilisateurs (rapport d'organisation)."""
+        total = ActivityAggregator(outputs, trend_start)
+        for aggregator in aggregators.values():
+            total.merge(aggregator)
+        return total
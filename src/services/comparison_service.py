@@ -0,0 +1,162 @@
+"""
+Comparaison de plusieurs utilisateurs : une seule table combinée
+(utilisateur, dépôt, jour, type) agrégée par des opérations groupées de
+pandas, sans boucle Python par utilisateur.
+"""
+from typing import Dict, List, Mapping, Sequence, Union
+
+import numpy as np
+
+from src.models.event_batch import EventBatch
+from src.services.aggregation_service import COMMIT_WEIGHT, ISSUE_WEIGHT, PR_WEIGHT
+from src.utils.lazy import LazyModule
+
+pd = LazyModule("pandas")
+
+# Mesures comparées entre utilisateurs (colonnes du classement)
+METRICS = ("events", "commits", "issues", "prs", "repos", "active_days", "score")
+PERCENTILES = (25, 50, 75, 90)
+TABLE_KEYS = ["user", "repo", "day", "type"]
+
+
+class ComparisonService:
+    @staticmethod
+    def build_table(events_by_user: Mapping[str, Union[List[Dict], EventBatch]]) -> "pd.DataFrame":
+        """Table combinée indexée par (utilisateur, dépôt, jour, type).
+
+        Chaque ligne compte les événements, commits, issues et pull requests
+        ouvertes d'un utilisateur sur un dépôt, un jour donné et pour un type
+        d'événement. Les colonnes de chaque utilisateur sont concaténées puis
+        regroupées en une seule opération.
+        """
+        users, repos, timestamps, types, commits, actions = [], [], [], [], [], []
+        for username, events in events_by_user.items():
+            batch = events if isinstance(events, EventBatch) else EventBatch.from_events(events)
+            if not len(batch):
+                continue
+            users.append(np.full(len(batch), username, dtype=object))
+            repos.append(np.asarray(batch.repo_names, dtype=object)[batch.repo_ids])
+            types.append(np.asarray(batch.type_names, dtype=object)[batch.type_codes])
+            actions.append(np.asarray(batch.action_names, dtype=object)[batch.action_codes])
+            timestamps.append(batch.timestamps)
+            commits.append(batch.commits)
+
+        if not users:
+            return pd.DataFrame(
+                columns=TABLE_KEYS + ["events", "commits", "issues", "prs"]
+            ).set_index(TABLE_KEYS)
+
+        event_types = np.concatenate(types)
+        opened = np.concatenate(actions) == "opened"
+        df = pd.DataFrame({
+            "user": pd.Categorical(np.concatenate(users)),
+            "repo": pd.Categorical(np.concatenate(repos)),
+            "day": np.concatenate(timestamps).astype("datetime64[s]").astype("datetime64[D]"),
+            "type": pd.Categorical(event_types),
+            "events": 1,
+            "commits": np.concatenate(commits).astype(np.int64),
+            "issues": ((event_types == "IssuesEvent") & opened).astype(np.int64),
+            "prs": ((event_types == "PullRequestEvent") & opened).astype(np.int64)
+        })
+        return df.groupby(TABLE_KEYS, observed=True, sort=False).sum()
+
+    @staticmethod
+    def user_totals(table: "pd.DataFrame") -> "pd.DataFrame":
+        """Totaux par utilisateur, rangs (1 = le plus actif) et rangs centiles (0-100)."""
+        if table.empty:
+            return pd.DataFrame(columns=list(METRICS))
+        flat = table.reset_index()
+        grouped = flat.groupby("user", observed=True)
+        totals = grouped[["events", "commits", "issues", "prs"]].sum()
+        totals["repos"] = grouped["repo"].nunique()
+        totals["active_days"] = grouped["day"].nunique()
+        totals["score"] = (
+            totals["commits"] * COMMIT_WEIGHT + totals["issues"] * ISSUE_WEIGHT + totals["prs"] * PR_WEIGHT
+        )
+        for metric in METRICS:
+            totals[f"{metric}_rank"] = totals[metric].rank(method="min", ascending=False).astype(np.int64)
+            totals[f"{metric}_percentile"] = (totals[metric].rank(method="max", pct=True) * 100).round(1)
+        return totals.sort_values(["score", "events"], ascending=False)
+
+    @staticmethod
+    def percentiles(totals: "pd.DataFrame", percentiles: Sequence[int] = PERCENTILES) -> Dict[str, Dict[str, float]]:
+        """Distribution de chaque mesure dans l'équipe : ``{mesure: {"p50": valeur, ...}}``."""
+        if totals.empty:
+            return {}
+        quantiles = totals[list(METRICS)].quantile([p / 100 for p in percentiles])
+        return {
+            metric: {f"p{p}": float(quantiles[metric].iloc[i]) for i, p in enumerate(percentiles)}
+            for metric in METRICS
+        }
+
+    @staticmethod
+    def shared_repositories(table: "pd.DataFrame", limit: int = 20) -> List[Dict]:
+        """Dépôts sur lesquels plusieurs utilisateurs sont actifs, du plus partagé au moins partagé."""
+        if table.empty:
+            return []
+        per_repo = table.groupby(["repo", "user"], observed=True)["events"].sum().reset_index()
+        contributors = per_repo.groupby("repo", observed=True).agg(
+            users=("user", "nunique"), events=("events", "sum")
+        )
+        shared = contributors[contributors["users"] > 1].sort_values(["users", "events"], ascending=False).head(limit)
+        members = per_repo[per_repo["repo"].isin(shared.index)].groupby("repo", observed=True)["user"].agg(
+            lambda names: sorted(map(str, names))
+        )
+        return [
+            {"repo": str(repo), "users": int(row.users), "events": int(row.events), "members": members[repo]}
+            for repo, row in shared.iterrows()
+        ]
+
+    @staticmethod
+    def overlaps(table: "pd.DataFrame", limit: int = 20) -> List[Dict]:
+        """Paires d'utilisateurs ayant le plus de dépôts en commun.
+
+        Les couples (utilisateur, dépôt) des dépôts partagés sont joints sur
+        le dépôt (codes entiers) puis comptés par paire : le coût dépend du
+        nombre de paires réellement actives sur un même dépôt, pas du carré
+        du nombre d'utilisateurs.
+        """
+        if table.empty:
+            return []
+        pairs = table.index.droplevel(["day", "type"]).unique().to_frame(index=False)
+        user_codes, user_names = pd.factorize(pairs["user"].astype(str))
+        repo_codes, _ = pd.factorize(pairs["repo"].astype(str))
+        codes = pd.DataFrame({"user": user_codes.astype(np.int32), "repo": repo_codes.astype(np.int32)})
+        repo_count = np.bincount(user_codes, minlength=len(user_names))
+
+        # Seuls les dépôts où plusieurs utilisateurs sont actifs peuvent former des paires
+        codes = codes[codes.groupby("repo")["user"].transform("size") > 1]
+        if codes.empty:
+            return []
+        joined = codes.merge(codes, on="repo", suffixes=("_a", "_b"))
+        joined = joined[joined["user_a"] < joined["user_b"]]
+        shared = joined.groupby(["user_a", "user_b"]).size().nlargest(limit)
+        return [
+            {
+                "users": [user_names[a], user_names[b]],
+                "shared_repos": int(count),
+                # Indice de Jaccard des ensembles de dépôts des deux utilisateurs
+                "jaccard": round(count / (repo_count[a] + repo_count[b] - count), 3)
+            }
+            for (a, b), count in shared.items()
+        ]
+
+    @staticmethod
+    def compare(events_by_user: Mapping[str, Union[List[Dict], EventBatch]], limit: int = 20) -> Dict:
+        """Comparaison complète : classement, distribution, dépôts partagés et paires proches."""
+        table = ComparisonService.build_table(events_by_user)
+        return ComparisonService.compare_table(table, len(events_by_user), limit)
+
+    @staticmethod
+    def compare_table(table: "pd.DataFrame", users: int, limit: int = 20) -> Dict:
+        """Comparaison calculée à partir d'une table déjà construite par :meth:`build_table`."""
+        totals = ComparisonService.user_totals(table)
+        leaderboard = totals.reset_index().astype({"user": str}).to_dict(orient="records") if len(totals) else []
+        return {
+            "users": users,
+            "active_users": len(totals),
+            "leaderboard": leaderboard,
+            "percentiles": ComparisonService.percentiles(totals),
+            "shared_repos": ComparisonService.shared_repositories(table, limit),
+            "overlaps": ComparisonService.overlaps(table, limit)
+        }
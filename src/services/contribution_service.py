@@ -0,0 +1,68 @@
+"""
+Conversion des résumés de contributions de l'API GraphQL
+(``GitHubGraphQLClient.get_contributions``) vers les structures produites
+par ``StatsService`` et ``RepoRankingService`` à partir des événements REST.
+"""
+from datetime import datetime
+from typing import Dict, List
+
+from src.services.aggregation_service import COMMIT_WEIGHT, ISSUE_WEIGHT, PR_WEIGHT
+
+# Types de contributions GraphQL, utilisés comme clés de ``events_by_type``
+CONTRIBUTION_TYPES = (
+    ("CommitContribution", "total_commits"),
+    ("IssueContribution", "total_issues"),
+    ("PullRequestContribution", "total_prs"),
+    ("PullRequestReviewContribution", "total_reviews"),
+    ("RestrictedContribution", "restricted"),
+)
+
+
+class ContributionService:
+    @staticmethod
+    def global_stats(summary: Dict) -> Dict:
+        """Statistiques globales au format de ``StatsService.calculate_global_stats``.
+
+        ``events_by_type`` compte les contributions par type et
+        ``activity_by_day`` reprend les jours non vides du calendrier.
+        """
+        return {
+            "total_commits": summary["total_commits"],
+            "total_issues": summary["total_issues"],
+            "total_prs": summary["total_prs"],
+            "total_repos": len(summary["repositories"]),
+            "events_by_type": {
+                name: summary[key] for name, key in CONTRIBUTION_TYPES if summary[key]
+            },
+            "activity_by_day": {
+                day: count for day, count in sorted(summary["calendar"].items()) if count
+            }
+        }
+
+    @staticmethod
+    def rank_repositories(summary: Dict) -> List[Dict]:
+        """Classement des dépôts au format de ``RepoRankingService.rank_repositories``."""
+        ranked_repos = [
+            {
+                "repo": name,
+                "commits": repo["commits"],
+                "issues": repo["issues"],
+                "prs": repo["prs"],
+                "total_activity": (
+                    repo["commits"] * COMMIT_WEIGHT + repo["issues"] * ISSUE_WEIGHT + repo["prs"] * PR_WEIGHT
+                ),
+                "last_activity": repo["last_activity"]
+            }
+            for name, repo in summary["repositories"].items()
+        ]
+        # Un dépôt sans date d'activité connue passe après les autres à activité égale
+        return sorted(
+            ranked_repos,
+            key=lambda x: (x["total_activity"], x["last_activity"] or datetime.min),
+            reverse=True
+        )
+
+    @staticmethod
+    def total_contributions(summary: Dict) -> int:
+        """Nombre total de contributions du calendrier (équivalent du nombre d'événements)."""
+        return sum(summary["calendar"].values())
@@ -1,29 +1,45 @@
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Union
+from src.models.event_batch import EventBatch
+from src.models.event_timeline import EventTimeline, EventView
+
+TIMEFRAMES = {
+    "24h": timedelta(hours=24),
+    "48h": timedelta(hours=48),
+    "1w": timedelta(weeks=1),
+    "2w": timedelta(weeks=2),
+    "30d": timedelta(days=30)
+}
 
 class EventFilterService:
     @staticmethod
-    def filter_by_timeframe(events: List[Dict], timeframe: str) -> List[Dict]:
-        """Filter events based on specified timeframe."""
-        now = datetime.now()
-        timeframes = {
-            "24h": timedelta(hours=24),
-            "48h": timedelta(hours=48),
-            "1w": timedelta(weeks=1),
-            "2w": timedelta(weeks=2),
-            "30d": timedelta(days=30)
-        }
-        
-        if timeframe not in timeframes:
-            raise ValueError(f"Invalid timeframe. Choose from: {', '.join(timeframes.keys())}")
+    def get_cutoff(timeframe: str) -> datetime:
+        """Return the oldest date included in the specified timeframe."""
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Invalid timeframe. Choose from: {', '.join(TIMEFRAMES.keys())}")
         
-        cutoff = now - timeframes[timeframe]
+        return datetime.now() - TIMEFRAMES[timeframe]
+
+    @staticmethod
+    def filter_by_timeframe(events: Union[List[Dict], EventBatch, EventTimeline],
+                            timeframe: str) -> Union[List[Dict], EventBatch, EventView]:
+        """Filter events based on specified timeframe."""
+        cutoff = EventFilterService.get_cutoff(timeframe)
+        if isinstance(events, EventTimeline):
+            return events.range(start=cutoff)
+        if isinstance(events, EventBatch):
+            return events.take(events.time_mask(start=cutoff))
         return [event for event in events if event["created_at"] >= cutoff]
     
     @staticmethod
-    def filter_by_date_range(events: List[Dict], start_date: datetime, end_date: datetime) -> List[Dict]:
+    def filter_by_date_range(events: Union[List[Dict], EventBatch, EventTimeline], start_date: datetime,
+                             end_date: datetime) -> Union[List[Dict], EventBatch, EventView]:
         """Filter events based on a specific date range."""
+        if isinstance(events, EventTimeline):
+            return events.range(start=start_date, end=end_date)
+        if isinstance(events, EventBatch):
+            return events.take(events.time_mask(start=start_date, end=end_date))
         return [
             event for event in events 
             if start_date <= event["created_at"] <= end_date
-        ] 
\ No newline at end of file
+        ]
@@ -0,0 +1,136 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+class EventStore:
+    """Stockage local (SQLite) des événements traités, indexé par identifiant d'événement.
+
+    La base est en mode WAL : les lectures ne bloquent pas l'écriture, et
+    plusieurs processus peuvent y écrire à tour de rôle. ``timeout`` est le
+    délai d'attente (en secondes) d'une écriture quand la base est verrouillée.
+
+    Chaque nouvel événement reçoit un numéro d'ordre (``seq``) croissant dans
+    l'ordre d'insertion : contrairement aux identifiants, il permet de
+    retrouver les événements anciens importés après coup (GH Archive).
+    """
+
+    def __init__(self, path: str = "data/events.sqlite", timeout: float = 5.0):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY,
+                username TEXT NOT NULL,
+                type TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                repo_name TEXT NOT NULL,
+                details TEXT NOT NULL,
+                seq INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_user_created ON events (username, created_at);
+            CREATE INDEX IF NOT EXISTS idx_events_repo_created ON events (repo_name, created_at);
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(events)")}
+        if "seq" not in columns:
+            # Base créée avant les numéros d'ordre : les événements existants suivent leur identifiant
+            self._conn.execute("ALTER TABLE events ADD COLUMN seq INTEGER")
+            self._conn.execute("UPDATE events SET seq = id")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_seq ON events (seq)")
+        self._conn.commit()
+
+    def save_events(self, username: str, events: List[Dict]) -> int:
+        """Enregistre des événements traités et retourne le nombre de nouveaux événements."""
+        rows = [
+            (
+                int(event["id"]),
+                username.lower(),
+                event["type"],
+                event["created_at"].strftime(DATE_FORMAT),
+                event["repo_name"],
+                json.dumps(event["details"])
+            )
+            for event in events
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            # L'écriture verrouille la base : deux processus n'attribuent jamais le même numéro
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO events (id, username, type, created_at, repo_name, details, seq) "
+                "VALUES (?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM events))",
+                rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def latest_event_id(self, username: str) -> Optional[int]:
+        """Retourne l'identifiant du plus récent événement connu pour un utilisateur."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(id) FROM events WHERE username = ?", (username.lower(),)
+            ).fetchone()
+        return row[0]
+
+    def get_user_events(self, username: str, since: Optional[datetime] = None,
+                        until: Optional[datetime] = None) -> List[Dict]:
+        """Retourne les événements d'un utilisateur, du plus récent au plus ancien."""
+        return self._query("username", username.lower(), since, until)
+
+    def get_new_user_events(self, username: str, after_seq: int = 0) -> Tuple[List[Dict], int]:
+        """Retourne les événements d'un utilisateur enregistrés après le numéro d'ordre ``after_seq``.
+
+        Le second élément est le dernier numéro d'ordre retourné (``after_seq``
+        s'il n'y a aucun nouvel événement), à passer à l'appel suivant.
+        """
+        rows = self._rows(
+            "SELECT id, type, created_at, repo_name, details, seq FROM events "
+            "WHERE username = ? AND seq > ? ORDER BY created_at DESC, id DESC",
+            [username.lower(), after_seq]
+        )
+        last_seq = max((row[-1] for row in rows), default=after_seq)
+        return [self._event(*row[:-1]) for row in rows], last_seq
+
+    def get_repo_events(self, repo_name: str, since: Optional[datetime] = None,
+                        until: Optional[datetime] = None) -> List[Dict]:
+        """Retourne les événements stockés pour un dépôt, du plus récent au plus ancien."""
+        return self._query("repo_name", repo_name, since, until)
+
+    def _query(self, column: str, value: str, since: Optional[datetime],
+               until: Optional[datetime]) -> List[Dict]:
+        # Les bornes portent sur created_at pour profiter des index (colonne, created_at)
+        query = f"SELECT id, type, created_at, repo_name, details FROM events WHERE {column} = ?"
+        params = [value]
+        if since:
+            query += " AND created_at >= ?"
+            params.append(since.strftime(DATE_FORMAT))
+        if until:
+            query += " AND created_at <= ?"
+            params.append(until.strftime(DATE_FORMAT))
+        query += " ORDER BY created_at DESC, id DESC"
+        return [self._event(*row) for row in self._rows(query, params)]
+
+    def _rows(self, query: str, params: List) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    @staticmethod
+    def _event(event_id: int, event_type: str, created_at: str, repo_name: str, details: str) -> Dict:
+        return {
+            "id": str(event_id),
+            "type": event_type,
+            "created_at": datetime.strptime(created_at, DATE_FORMAT),
+            "repo_name": repo_name,
+            "details": json.loads(details)
+        }
@@ -1,10 +1,55 @@
+import csv
+import io
 import json
-import pandas as pd
-from typing import List, Dict, Union
+from typing import Dict, Iterable, Iterator, List, Union
 from datetime import datetime, date
 from pathlib import Path
-from PyPDF2 import PdfWriter, PdfReader
 import os
+from src.utils.lazy import LazyModule
+
+# Bibliothèques chargées à la première utilisation (export PDF uniquement)
+pd = LazyModule("pandas")
+PyPDF2 = LazyModule("PyPDF2")
+
+# Modules à précharger en arrière-plan après le démarrage
+HEAVY_MODULES = ("pandas", "PyPDF2")
+
+# Colonnes des exports tabulaires : champs de l'événement, puis les détails,
+# en une colonne dans le CSV et aplatis en colonnes ``details_*`` dans le Parquet
+EVENT_COLUMNS = ("id", "type", "created_at", "repo_name")
+DETAIL_COLUMNS = ("commits", "distinct_commits", "ref", "action", "issue_number", "pr_number")
+
+
+def _json_default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Fichier en écriture seule dont le contenu est récupéré par morceaux."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
 
 class ExportService:
     @staticmethod
@@ -22,36 +67,139 @@ class ExportService:
         return f"{base_name}_{timestamp}.{extension}"
 
     @staticmethod
-    def to_csv(data: List[Dict], filename: str = "github_activity") -> str:
+    def to_csv(data: Iterable[Dict], filename: str = "github_activity") -> str:
         """Exporte les données au format CSV."""
         export_dir = ExportService.ensure_export_dir("csv")
         output_path = os.path.join(export_dir, ExportService.generate_filename(filename, "csv"))
-        
-        # Conversion des dates en format lisible
-        formatted_data = []
-        for item in data:
-            formatted_item = item.copy()
-            if "created_at" in formatted_item:
-                formatted_item["created_at"] = formatted_item["created_at"].strftime("%Y-%m-%d %H:%M:%S")
-            formatted_data.append(formatted_item)
-        
-        df = pd.DataFrame(formatted_data)
-        df.to_csv(output_path, index=False, encoding='utf-8')
-        return output_path
+        return ExportService._write_chunks(output_path, ExportService.iter_csv(data))
 
     @staticmethod
-    def to_json(data: List[Dict], filename: str = "github_activity") -> str:
+    def to_json(data: Iterable[Dict], filename: str = "github_activity") -> str:
         """Exporte les données au format JSON."""
         export_dir = ExportService.ensure_export_dir("json")
         output_path = os.path.join(export_dir, ExportService.generate_filename(filename, "json"))
+        return ExportService._write_chunks(output_path, ExportService.iter_json(data))
+
+    @staticmethod
+    def to_ndjson(data: Iterable[Dict], filename: str = "github_activity") -> str:
+        """Exporte les données au format NDJSON (un événement JSON par ligne)."""
+        export_dir = ExportService.ensure_export_dir("ndjson")
+        output_path = os.path.join(export_dir, ExportService.generate_filename(filename, "ndjson"))
+        return ExportService._write_chunks(output_path, ExportService.iter_ndjson(data))
+
+    @staticmethod
+    def to_parquet(data: Iterable[Dict], filename: str = "github_activity") -> str:
+        """Exporte les données au format Parquet (nécessite pyarrow)."""
+        export_dir = ExportService.ensure_export_dir("parquet")
+        output_path = os.path.join(export_dir, ExportService.generate_filename(filename, "parquet"))
+        return ExportService._write_chunks(output_path, ExportService.iter_parquet(data))
+
+    @staticmethod
+    def flatten_event(event: Dict) -> Dict:
+        """Aplatit un événement traité : les détails deviennent des colonnes ``details_*``."""
+        row = {column: event.get(column) for column in EVENT_COLUMNS}
+        details = event.get("details") or {}
+        for column in DETAIL_COLUMNS:
+            row[f"details_{column}"] = details.get(column)
+        return row
+
+    @staticmethod
+    def iter_csv(data: Iterable[Dict], chunk_size: int = 500) -> Iterator[str]:
+        """Génère l'export CSV par blocs de ``chunk_size`` lignes, sans tout charger en mémoire.
+
+        Les détails restent dans une seule colonne ``details``, écrite comme
+        le faisait l'export pandas : le format du CSV ne change pas.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(list(EVENT_COLUMNS) + ["details"])
+        
+        for count, event in enumerate(data, start=1):
+            row = {column: event.get(column) for column in EVENT_COLUMNS}
+            if isinstance(row["created_at"], datetime):
+                row["created_at"] = row["created_at"].strftime("%Y-%m-%d %H:%M:%S")
+            row["details"] = event.get("details", {})
+            writer.writerow(["" if value is None else value for value in row.values()])
+            if count % chunk_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def iter_ndjson(data: Iterable[Dict], chunk_size: int = 500) -> Iterator[str]:
+        """Génère l'export NDJSON par blocs de ``chunk_size`` lignes."""
+        lines = []
+        for event in data:
+            lines.append(json.dumps(event, default=_json_default, ensure_ascii=False))
+            if len(lines) == chunk_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    @staticmethod
+    def iter_json(data: Iterable[Dict], chunk_size: int = 500) -> Iterator[str]:
+        """Génère un tableau JSON, un événement par ligne, par blocs de ``chunk_size`` lignes."""
+        yield "["
+        separator = "\n"
+        for chunk in ExportService.iter_ndjson(data, chunk_size):
+            yield separator + chunk.rstrip("\n").replace("\n", ",\n")
+            separator = ",\n"
+        yield "\n]\n"
+
+    @staticmethod
+    def iter_parquet(data: Iterable[Dict], row_group_size: int = 10000) -> Iterator[bytes]:
+        """Génère l'export Parquet, un row group de ``row_group_size`` événements à la fois.
         
-        def datetime_handler(obj):
-            if isinstance(obj, (datetime, date)):
-                return obj.isoformat()
-            return str(obj)
+        pyarrow est importé ici pour rester une dépendance optionnelle ;
+        ImportError est levée immédiatement s'il n'est pas installé.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, default=datetime_handler, indent=2, ensure_ascii=False)
+        schema = pa.schema([
+            ("id", pa.string()),
+            ("type", pa.string()),
+            ("created_at", pa.timestamp("s")),
+            ("repo_name", pa.string()),
+            ("details_commits", pa.int64()),
+            ("details_distinct_commits", pa.int64()),
+            ("details_ref", pa.string()),
+            ("details_action", pa.string()),
+            ("details_issue_number", pa.int64()),
+            ("details_pr_number", pa.int64())
+        ])
+        
+        def generate() -> Iterator[bytes]:
+            sink = _ChunkSink()
+            with pq.ParquetWriter(sink, schema) as writer:
+                rows = []
+                for event in data:
+                    rows.append(ExportService.flatten_event(event))
+                    if len(rows) == row_group_size:
+                        writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                        rows = []
+                        yield sink.drain()
+                if rows:
+                    writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            # Le pied de fichier (métadonnées) est écrit à la fermeture
+            yield sink.drain()
+        
+        return generate()
+
+    @staticmethod
+    def _write_chunks(output_path: str, chunks: Iterable[Union[str, bytes]]) -> str:
+        """Écrit les morceaux générés par un export dans ``output_path``."""
+        chunks = iter(chunks)
+        first = next(chunks, "")
+        mode, encoding = ("wb", None) if isinstance(first, bytes) else ("w", "utf-8")
+        with open(output_path, mode, encoding=encoding, newline="" if encoding else None) as f:
+            f.write(first)
+            for chunk in chunks:
+                f.write(chunk)
         return output_path
 
     @staticmethod
@@ -71,7 +219,7 @@ class ExportService:
         )
         
         # Création du PDF
-        writer = PdfWriter()
+        writer = PyPDF2.PdfWriter()
         writer.add_page()
         page = writer.pages[0]
         page.extract_text = lambda: pdf_content
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from src.utils.compression import ENCODING_SUFFIXES, precompress_file, remove_precompressed
+
+class RenderCache:
+    """Cache des graphiques générés, adressé par le contenu.
+
+    Le nom de chaque fichier contient une empreinte des données agrégées et
+    des paramètres du graphique : des entrées identiques réutilisent le
+    fichier existant au lieu de le régénérer. La rétention limite le nombre
+    de fichiers (``max_files``) et leur âge depuis le dernier accès
+    (``max_age``), sans jamais supprimer un fichier accédé depuis moins de
+    ``min_age`` secondes, qu'une page affichée peut encore référencer.
+    """
+
+    def __init__(self, base_dir: str = "static/images", max_files: int = 200,
+                 max_age: float = 7 * 24 * 3600, min_age: float = 3600):
+        self.base_dir = Path(base_dir)
+        self.max_files = max_files
+        self.max_age = max_age
+        self.min_age = min_age
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(chart_name: str, inputs: Any, params: Dict[str, Any]) -> str:
+        """Calcule l'empreinte des entrées agrégées et des paramètres d'un graphique."""
+        payload = json.dumps(
+            {"chart": chart_name, "inputs": inputs, "params": params},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+    def get_or_render(self, output_type: str, chart_name: str, extension: str, inputs: Any,
+                      params: Dict[str, Any], render: Callable[[str], None]) -> str:
+        """Retourne le fichier correspondant aux entrées, en le générant avec ``render`` si besoin."""
+        output_dir = self.base_dir / output_type
+        output_dir.mkdir(parents=True, exist_ok=True)
+        key = self.make_key(chart_name, inputs, params)
+        output_path = output_dir / f"{chart_name}_{key}.{extension}"
+
+        if output_path.exists():
+            # La date de modification sert de date de dernier accès pour la rétention
+            output_path.touch()
+            return str(output_path)
+
+        # Génération dans un fichier temporaire puis renommage atomique :
+        # deux rendus simultanés ne produisent jamais de fichier partiel
+        tmp_path = output_dir / f".{chart_name}_{key}.{uuid.uuid4().hex}.tmp.{extension}"
+        try:
+            render(str(tmp_path))
+            os.replace(tmp_path, output_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        # Les graphiques HTML sont compressés une fois ici plutôt qu'à chaque téléchargement
+        precompress_file(output_path)
+
+        self.enforce_retention()
+        return str(output_path)
+
+    def enforce_retention(self) -> int:
+        """Supprime les fichiers expirés ou excédentaires et retourne leur nombre."""
+        with self._lock:
+            if not self.base_dir.exists():
+                return 0
+            now = time.time()
+            files = []
+            for path in self.base_dir.glob("*/*"):
+                # Les versions compressées suivent le fichier d'origine
+                if path.is_file() and not path.name.startswith(".") and path.suffix not in ENCODING_SUFFIXES:
+                    try:
+                        files.append((path.stat().st_mtime, path))
+                    except FileNotFoundError:
+                        continue
+            files.sort(reverse=True)
+
+            removed = 0
+            for index, (mtime, path) in enumerate(files):
+                age = now - mtime
+                if age < self.min_age:
+                    continue
+                if index >= self.max_files or age > self.max_age:
+                    try:
+                        path.unlink()
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+                    remove_precompressed(path)
+            return removed
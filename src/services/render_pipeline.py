@@ -0,0 +1,84 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+from src.models.event_batch import EventBatch
+from src.services.visualization_service import VisualizationService
+
+
+def _init_worker() -> None:
+    """Prépare un processus de rendu : backend non interactif et bibliothèques déjà importées."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.figure  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+    import plotly.io  # noqa: F401
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class RenderPipeline:
+    """Génère les graphiques d'une analyse en parallèle.
+
+    Les données de chaque graphique sont préparées dans le processus courant,
+    qui consulte aussi le cache des rendus : seuls les graphiques absents du
+    cache sont dessinés, chacun dans un processus du pool. Les processus sont
+    réutilisés d'une analyse à l'autre, les imports de matplotlib et plotly
+    ne sont donc payés qu'une fois par processus.
+    """
+
+    CHARTS = 4
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(self.CHARTS, os.cpu_count() or 1)
+        # Démarrage par "spawn" : un fork pendant qu'un autre thread importe un
+        # module (imports différés, préchargement) bloquerait le processus enfant
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+        # Threads de coordination : préparation des données et attente des rendus
+        self._threads = ThreadPoolExecutor(max_workers=self.CHARTS, thread_name_prefix="render")
+
+    def warm_up(self, wait: bool = False) -> None:
+        """Démarre les processus du pool ; avec ``wait``, attend qu'ils soient prêts."""
+        futures = [self._executor.submit(_ping) for _ in range(self.max_workers)]
+        if wait:
+            for future in futures:
+                future.result()
+
+    def render_all(self, events: Union[List[Dict], EventBatch], stats: Dict, timeframe: str) -> Dict[str, str]:
+        """Génère les quatre graphiques d'une analyse et retourne leurs chemins."""
+        # Agrégation unique, partagée par les graphiques temporels
+        bins = VisualizationService.bin_events(events)
+        hist = self._threads.submit(
+            VisualizationService.create_commit_histogram, bins, timeframe, self._executor
+        )
+        pie = self._threads.submit(
+            VisualizationService.create_activity_pie_chart, stats, self._executor
+        )
+        timeline = self._threads.submit(
+            VisualizationService.create_activity_timeline, bins, 30, self._executor
+        )
+        heatmap = self._threads.submit(
+            VisualizationService.create_activity_heatmap, bins, self._executor
+        )
+        return {
+            "hist_path": hist.result(),
+            "pie_path": pie.result(),
+            "timeline_path": timeline.result(),
+            "heatmap_path": heatmap.result()
+        }
+
+    def shutdown(self) -> None:
+        self._threads.shutdown(wait=True)
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "RenderPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
@@ -0,0 +1,158 @@
+"""
+Enrichissement des dépôts les mieux classés d'un utilisateur avec l'activité
+récente de chaque dépôt (``/repos/{owner}/{repo}/events``) : part de
+l'utilisateur dans les événements et les commits de tous les contributeurs.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.api.github_client import GitHubClient
+
+# Activité compacte d'un dépôt : (created_at ISO, auteur en minuscules, commits)
+RepoActivity = List[Tuple[str, str, int]]
+
+
+class RepoActivityCache:
+    """Activité récente des dépôts, conservée ``ttl`` secondes en mémoire.
+
+    Un dépôt partagé par plusieurs utilisateurs analysés n'est récupéré
+    qu'une fois par période de validité : les demandes simultanées d'un même
+    dépôt attendent la récupération déjà en cours (single-flight) au lieu
+    d'en lancer une autre. Les échecs ne sont pas mis en cache.
+    """
+
+    def __init__(self, ttl: float = 600, max_entries: int = 500):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.fetch_count = 0
+        self._entries: "OrderedDict[str, Tuple[float, RepoActivity]]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, repo_name: str, fetch: Callable[[], RepoActivity]) -> RepoActivity:
+        """Retourne l'activité en cache du dépôt, ou la récupère avec ``fetch``."""
+        key = repo_name.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                self.fetch_count += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            activity = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, activity)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            del self._in_flight[key]
+        future.set_result(activity)
+        return activity
+
+
+class RepoEnrichmentService:
+    """Récupère en parallèle l'activité des dépôts les mieux classés.
+
+    Le pool de threads est borné et partagé par toutes les analyses, tout
+    comme le cache : une équipe travaillant sur les mêmes dépôts ne
+    multiplie pas les appels à l'API.
+    """
+
+    def __init__(self, client: GitHubClient, cache: Optional[RepoActivityCache] = None,
+                 max_workers: int = 4, top_k: int = 5):
+        self.client = client
+        self.cache = cache or RepoActivityCache()
+        self.top_k = top_k
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="repo-enrichment")
+
+    def fetch_activity(self, repo_name: str) -> RepoActivity:
+        """Activité récente d'un dépôt (300 derniers événements au plus), via le cache."""
+        return self.cache.get_or_fetch(repo_name, lambda: self._load(repo_name))
+
+    def enrich(self, ranked_repos: List[Dict], username: str, since: Optional[datetime] = None,
+               top_k: Optional[int] = None) -> List[Dict]:
+        """Ajoute aux ``top_k`` premiers dépôts du classement la part de l'utilisateur dans leur activité.
+
+        Chaque dépôt reçoit les champs de :meth:`repo_share` ; un dépôt dont
+        l'activité n'a pas pu être récupérée reçoit un champ ``error``.
+        """
+        top_repos = ranked_repos[:self.top_k if top_k is None else top_k]
+        futures = [self._executor.submit(self.fetch_activity, repo["repo"]) for repo in top_repos]
+        enriched = []
+        for repo, future in zip(top_repos, futures):
+            try:
+                share = self.repo_share(future.result(), username, since)
+            except Exception as e:
+                share = {"error": str(e) or type(e).__name__}
+            enriched.append(dict(repo, **share))
+        return enriched
+
+    @staticmethod
+    def repo_share(activity: RepoActivity, username: str, since: Optional[datetime] = None) -> Dict:
+        """Part de l'utilisateur dans les événements et commits du dépôt depuis ``since``.
+
+        L'API ne conserve que les 300 derniers événements d'un dépôt :
+        ``window_start`` indique la date du plus ancien événement pris en
+        compte. Les parts sont en pourcentage (None sans activité).
+        """
+        cutoff = since.strftime("%Y-%m-%dT%H:%M:%SZ") if since else ""
+        login = username.lower()
+        events = user_events = commits = user_commits = 0
+        contributors = set()
+        window_start = None
+        for created_at, actor, event_commits in activity:
+            if created_at < cutoff:
+                continue
+            events += 1
+            commits += event_commits
+            contributors.add(actor)
+            if actor == login:
+                user_events += 1
+                user_commits += event_commits
+            if window_start is None or created_at < window_start:
+                window_start = created_at
+
+        return {
+            "repo_events": events,
+            "repo_commits": commits,
+            "contributors": len(contributors),
+            "user_events": user_events,
+            "user_commits": user_commits,
+            "event_share": round(100 * user_events / events, 1) if events else None,
+            "commit_share": round(100 * user_commits / commits, 1) if commits else None,
+            "window_start": datetime.strptime(window_start, "%Y-%m-%dT%H:%M:%SZ") if window_start else None
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _load(self, repo_name: str) -> RepoActivity:
+        # Seules les colonnes nécessaires au calcul des parts sont conservées
+        return [
+            (
+                event["created_at"],
+                (event.get("actor") or {}).get("login", "").lower(),
+                event["payload"].get("size", len(event["payload"].get("commits", [])))
+                if event["type"] == "PushEvent" else 0
+            )
+            for event in self.client.get_repo_events(repo_name)
+        ]
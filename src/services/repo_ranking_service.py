@@ -1,49 +1,45 @@
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Dict, Union
+from datetime import datetime
+import numpy as np
+from src.models.event_batch import EventBatch
+from src.services.aggregation_service import ActivityAggregator, COMMIT_WEIGHT, ISSUE_WEIGHT, PR_WEIGHT
 
 class RepoRankingService:
     @staticmethod
-    def rank_repositories(events: List[Dict]) -> List[Dict]:
+    def rank_repositories(events: Union[List[Dict], EventBatch]) -> List[Dict]:
         """Classe les dépôts par niveau d'activité."""
-        repo_stats = defaultdict(lambda: {
-            "commits": 0,
-            "issues": 0,
-            "prs": 0,
-            "total_activity": 0,
-            "last_activity": None
-        })
-        
-        for event in events:
-            repo = event["repo_name"]
-            event_date = event["created_at"]
-            
-            # Mise à jour de la dernière activité
-            if not repo_stats[repo]["last_activity"] or event_date > repo_stats[repo]["last_activity"]:
-                repo_stats[repo]["last_activity"] = event_date
-            
-            # Calcul des statistiques par type d'événement
-            if event["type"] == "PushEvent":
-                repo_stats[repo]["commits"] += event["details"]["commits"]
-            elif event["type"] == "IssuesEvent" and event["details"]["action"] == "opened":
-                repo_stats[repo]["issues"] += 1
-            elif event["type"] == "PullRequestEvent" and event["details"]["action"] == "opened":
-                repo_stats[repo]["prs"] += 1
-            
-            # Calcul du score d'activité pondéré
-            repo_stats[repo]["total_activity"] = (
-                repo_stats[repo]["commits"] * 1 +  # Poids standard pour les commits
-                repo_stats[repo]["issues"] * 2 +   # Poids plus élevé pour les issues
-                repo_stats[repo]["prs"] * 3        # Poids le plus élevé pour les PRs
-            )
-        
-        # Conversion et tri des résultats
+        if isinstance(events, EventBatch):
+            return RepoRankingService._rank_batch(events)
+
+        return ActivityAggregator(outputs=("repos",)).update(events).ranked_repositories()
+
+    @staticmethod
+    def _rank_batch(batch: EventBatch) -> List[Dict]:
+        """Version vectorisée du classement pour un EventBatch."""
+        size = len(batch.repo_names)
+        opened = batch.action_mask("opened")
+        push_mask = batch.type_mask("PushEvent")
+
+        commits = np.bincount(batch.repo_ids, weights=np.where(push_mask, batch.commits, 0), minlength=size)
+        issues = np.bincount(batch.repo_ids, weights=batch.type_mask("IssuesEvent") & opened, minlength=size)
+        prs = np.bincount(batch.repo_ids, weights=batch.type_mask("PullRequestEvent") & opened, minlength=size)
+        last_activity = np.full(size, -1, dtype=np.int64)
+        np.maximum.at(last_activity, batch.repo_ids, batch.timestamps)
+
         ranked_repos = [
-            {"repo": repo, **stats}
-            for repo, stats in repo_stats.items()
+            {
+                "repo": batch.repo_names[i],
+                "commits": int(commits[i]),
+                "issues": int(issues[i]),
+                "prs": int(prs[i]),
+                "total_activity": int(commits[i] * COMMIT_WEIGHT + issues[i] * ISSUE_WEIGHT + prs[i] * PR_WEIGHT),
+                "last_activity": datetime.utcfromtimestamp(int(last_activity[i]))
+            }
+            for i in np.flatnonzero(last_activity >= 0)
         ]
-        
+
         return sorted(
             ranked_repos,
             key=lambda x: (x["total_activity"], x["last_activity"]),
             reverse=True
-        ) 
\ No newline at end of file
+        )
@@ -1,64 +1,112 @@
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Dict, Union
 from datetime import datetime, timedelta
+import numpy as np
+from src.models.event_batch import EventBatch
+from src.models.event_timeline import EventView
+from src.services.aggregation_service import ActivityAggregator, ordered_type_counts
 
 class StatsService:
     @staticmethod
-    def calculate_global_stats(events: List[Dict]) -> Dict:
+    def calculate_global_stats(events: Union[List[Dict], EventBatch]) -> Dict:
         """Calculate global statistics from events."""
-        stats = {
-            "total_commits": 0,
-            "total_issues": 0,
-            "total_prs": 0,
-            "total_repos": set(),
-            "events_by_type": defaultdict(int),
-            "activity_by_day": defaultdict(int)
-        }
-        
-        for event in events:
-            event_date = event["created_at"].date()
-            stats["events_by_type"][event["type"]] += 1
-            stats["total_repos"].add(event["repo_name"])
-            stats["activity_by_day"][event_date.isoformat()] += 1
-            
-            if event["type"] == "PushEvent":
-                stats["total_commits"] += event["details"]["commits"]
-            elif event["type"] == "IssuesEvent" and event["details"]["action"] == "opened":
-                stats["total_issues"] += 1
-            elif event["type"] == "PullRequestEvent" and event["details"]["action"] == "opened":
-                stats["total_prs"] += 1
-        
-        stats["total_repos"] = len(stats["total_repos"])
-        stats["activity_by_day"] = dict(stats["activity_by_day"])
-        stats["events_by_type"] = dict(stats["events_by_type"])
-        return stats
+        if isinstance(events, EventBatch):
+            return StatsService._global_stats_from_batch(events)
+
+        return ActivityAggregator(outputs=("global",)).update(events).global_stats()
     
     @staticmethod
-    def calculate_activity_trends(events: List[Dict], days: int = 30) -> Dict:
+    def calculate_window_stats(window: EventView, totals: Dict[str, int]) -> Dict:
+        """Calculate global statistics of a timeline window.
+
+        ``totals`` comes from the timeline prefix sums (:meth:`EventTimeline.range_totals`):
+        only the per-type and per-day counts and the distinct repositories
+        need a pass over the window.
+        """
+        repos = set()
+        events_by_type: Dict[str, int] = {}
+        activity_by_day: Dict[str, int] = {}
+        # Du plus récent au plus ancien, comme le stockage : même ordre des jours
+        for event in reversed(window):
+            repos.add(event["repo_name"])
+            events_by_type[event["type"]] = events_by_type.get(event["type"], 0) + 1
+            day = event["created_at"].date().isoformat()
+            activity_by_day[day] = activity_by_day.get(day, 0) + 1
+
+        return {
+            "total_commits": totals["commits"],
+            "total_issues": totals["issues"],
+            "total_prs": totals["prs"],
+            "total_repos": len(repos),
+            "events_by_type": ordered_type_counts(events_by_type),
+            "activity_by_day": activity_by_day
+        }
+
+    @staticmethod
+    def calculate_activity_trends(events: Union[List[Dict], EventBatch], days: int = 30) -> Dict:
         """Calculate activity trends over time."""
         now = datetime.utcnow()
         start_date = now - timedelta(days=days)
+        if isinstance(events, EventBatch):
+            return StatsService._activity_trends_from_batch(events, start_date)
         
-        daily_activity = defaultdict(lambda: {
-            "commits": 0,
-            "issues": 0,
-            "prs": 0,
-            "total": 0
-        })
-        
-        for event in events:
-            if event["created_at"] < start_date:
-                continue
-                
-            date = event["created_at"].date()
-            date_str = date.isoformat()
-            daily_activity[date_str]["total"] += 1
-            
-            if event["type"] == "PushEvent":
-                daily_activity[date_str]["commits"] += event["details"]["commits"]
-            elif event["type"] == "IssuesEvent" and event["details"]["action"] == "opened":
-                daily_activity[date_str]["issues"] += 1
-            elif event["type"] == "PullRequestEvent" and event["details"]["action"] == "opened":
-                daily_activity[date_str]["prs"] += 1
-        
-        return dict(daily_activity) 
\ No newline at end of file
+        aggregator = ActivityAggregator(outputs=("trends",), trend_start=start_date)
+        return aggregator.update(events).activity_trends()
+
+    @staticmethod
+    def _global_stats_from_batch(batch: EventBatch) -> Dict:
+        """Vectorized version of calculate_global_stats for an EventBatch."""
+        push_mask, issue_mask, pr_mask = StatsService._batch_masks(batch)
+        type_counts = np.bincount(batch.type_codes, minlength=len(batch.type_names))
+        days, day_counts = np.unique(batch.timestamps // 86400, return_counts=True)
+
+        return {
+            "total_commits": int(batch.commits[push_mask].sum()),
+            "total_issues": int(issue_mask.sum()),
+            "total_prs": int(pr_mask.sum()),
+            "total_repos": len(np.unique(batch.repo_ids)),
+            "events_by_type": ordered_type_counts({
+                name: int(count)
+                for name, count in zip(batch.type_names, type_counts) if count
+            }),
+            "activity_by_day": {
+                StatsService._day_to_iso(day): int(count)
+                for day, count in zip(days, day_counts)
+            }
+        }
+
+    @staticmethod
+    def _activity_trends_from_batch(batch: EventBatch, start_date: datetime) -> Dict:
+        """Vectorized version of calculate_activity_trends for an EventBatch."""
+        batch = batch.take(batch.time_mask(start=start_date))
+        push_mask, issue_mask, pr_mask = StatsService._batch_masks(batch)
+        days, day_index = np.unique(batch.timestamps // 86400, return_inverse=True)
+
+        totals = np.bincount(day_index, minlength=len(days))
+        commits = np.bincount(day_index, weights=np.where(push_mask, batch.commits, 0), minlength=len(days))
+        issues = np.bincount(day_index, weights=issue_mask, minlength=len(days))
+        prs = np.bincount(day_index, weights=pr_mask, minlength=len(days))
+
+        return {
+            StatsService._day_to_iso(day): {
+                "commits": int(commits[i]),
+                "issues": int(issues[i]),
+                "prs": int(prs[i]),
+                "total": int(totals[i])
+            }
+            for i, day in enumerate(days)
+        }
+
+    @staticmethod
+    def _batch_masks(batch: EventBatch):
+        """Masks of push events, opened issues and opened pull requests."""
+        opened = batch.action_mask("opened")
+        return (
+            batch.type_mask("PushEvent"),
+            batch.type_mask("IssuesEvent") & opened,
+            batch.type_mask("PullRequestEvent") & opened
+        )
+
+    @staticmethod
+    def _day_to_iso(day: int) -> str:
+        """Convert a number of days since the epoch to an ISO date."""
+        return str(np.datetime64(int(day), "D"))
@@ -0,0 +1,21 @@
+from src.api.github_client import GitHubClient
+from src.models.event import EventProcessor
+from src.services.event_store import EventStore
+from src.utils.metrics import timed
+
+class SyncService:
+    @staticmethod
+    def sync_user(client: GitHubClient, store: EventStore, username: str) -> int:
+        """Synchronise incrémentalement les événements d'un utilisateur dans le stockage local.
+
+        Seules les pages plus récentes que le dernier événement connu sont
+        récupérées ; la pagination s'arrête au premier événement déjà stocké.
+        Retourne le nombre de nouveaux événements.
+        """
+        latest_id = store.latest_event_id(username)
+        with timed("github_fetch"):
+            raw_events = client.get_all_user_events(username, after_id=latest_id)
+        with timed("parse"):
+            events = [EventProcessor.process_event(event) for event in raw_events]
+        with timed("store_write"):
+            return store.save_events(username, events)
@@ -0,0 +1,46 @@
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import Tuple
+
+from src.models.event_timeline import EventTimeline
+from src.services.event_store import EventStore
+
+class TimelineCache:
+    """Chronologies (:class:`EventTimeline`) des utilisateurs analysés, tenues en mémoire.
+
+    La chronologie d'un utilisateur est construite une fois depuis le
+    stockage local, puis complétée avec les seuls événements enregistrés
+    depuis (numéro d'ordre du stockage, y compris les événements anciens
+    importés après coup) : changer de période d'analyse ne relit ni
+    ne réanalyse les événements déjà en mémoire. Une chronologie publiée
+    n'est jamais modifiée (les vues déjà distribuées restent valides) ; les
+    nouveaux événements donnent une nouvelle chronologie. Au-delà de
+    ``max_users`` utilisateurs, les moins récemment consultés sont oubliés.
+    """
+
+    def __init__(self, store: EventStore, max_users: int = 100):
+        self.store = store
+        self.max_users = max_users
+        self._timelines: "OrderedDict[str, Tuple[EventTimeline, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> EventTimeline:
+        """Retourne la chronologie à jour d'un utilisateur."""
+        key = username.lower()
+        with self._lock:
+            entry = self._timelines.get(key)
+            if entry is None:
+                events, last_seq = self.store.get_new_user_events(key)
+                timeline = EventTimeline(events)
+            else:
+                timeline, last_seq = entry
+                events, last_seq = self.store.get_new_user_events(key, after_seq=last_seq)
+                if events:
+                    timeline = EventTimeline(chain(timeline, events))
+
+            self._timelines[key] = (timeline, last_seq)
+            self._timelines.move_to_end(key)
+            while len(self._timelines) > self.max_users:
+                self._timelines.popitem(last=False)
+            return timeline
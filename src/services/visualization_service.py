@@ -1,11 +1,108 @@
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta, date
-import pandas as pd
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Dict, Optional, Sequence, Union
+from datetime import datetime
 from pathlib import Path
+from src.models.activity_bins import ActivityBins
+from src.models.event_batch import EventBatch
+from src.services.render_cache import RenderCache
+from src.utils.lazy import LazyModule
+
+# Bibliothèques de rendu chargées à la première utilisation
+mpl_figure = LazyModule("matplotlib.figure")
+go = LazyModule("plotly.graph_objects")
+
+# Modules à précharger en arrière-plan après le démarrage
+HEAVY_MODULES = ("matplotlib.figure", "plotly.graph_objects")
+
+# Lignes de la carte de chaleur (jours de la semaine, lundi en premier)
+WEEKDAY_LABELS = ["Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim"]
+
+Events = Union[List[Dict], EventBatch, ActivityBins]
+
+
+# Fonctions de rendu : définies au niveau du module pour pouvoir être exécutées
+# dans un pool de processus. Elles n'utilisent pas l'état global de pyplot et
+# reçoivent des séries déjà agrégées (quelques dizaines de valeurs).
+
+def render_commit_histogram(output_path: str, edges: Sequence[float], counts: Sequence[int], timeframe: str) -> None:
+    """Dessine l'histogramme des commits (intervalles pré-calculés) et l'enregistre en PNG."""
+    starts = [datetime.utcfromtimestamp(edge) for edge in edges[:-1]]
+    widths = [(right - left) / 86400 for left, right in zip(edges[:-1], edges[1:])]
+    fig = mpl_figure.Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    ax.bar(starts, counts, width=widths, align="edge")
+    ax.set_title(f"Activité des commits ({timeframe})")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Nombre de commits")
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.savefig(output_path, bbox_inches='tight', format='png')
+
+
+def render_activity_pie_chart(output_path: str, labels: List[str], values: List[int]) -> None:
+    """Dessine le diagramme circulaire des types d'activités et l'enregistre en HTML."""
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=0.3
+    )])
+    
+    fig.update_layout(
+        title="Distribution des types d'activités",
+        showlegend=True,
+        width=800,
+        height=600
+    )
+    fig.write_html(output_path)
+
+
+def render_activity_timeline(output_path: str, dates: List[str], series: Dict[str, List[int]]) -> None:
+    """Dessine la timeline d'activité par type et l'enregistre en HTML."""
+    fig = go.Figure()
+    
+    for event_type, values in series.items():
+        fig.add_trace(go.Scatter(
+            x=dates,
+            y=values,
+            name=event_type,
+            mode='lines+markers'
+        ))
+    
+    fig.update_layout(
+        title="Timeline d'activité",
+        xaxis_title="Date",
+        yaxis_title="Nombre d'événements",
+        hovermode='x unified',
+        showlegend=True,
+        width=1000,
+        height=600
+    )
+    fig.write_html(output_path)
+
+
+def render_activity_heatmap(output_path: str, counts: List[List[int]]) -> None:
+    """Dessine la carte de chaleur jour de la semaine × heure et l'enregistre en HTML."""
+    fig = go.Figure(data=[go.Heatmap(
+        z=counts,
+        x=list(range(24)),
+        y=WEEKDAY_LABELS,
+        colorscale="Greens",
+        hovertemplate="%{y} %{x}h : %{z} événements<extra></extra>"
+    )])
+    
+    fig.update_layout(
+        title="Activité par jour et par heure (UTC)",
+        xaxis_title="Heure",
+        yaxis=dict(autorange="reversed"),
+        width=1000,
+        height=400
+    )
+    fig.write_html(output_path)
+
 
 class VisualizationService:
+    # Cache des graphiques déjà générés, remplaçable pour configurer la rétention
+    render_cache = RenderCache()
+
     @staticmethod
     def ensure_output_dir(output_type: str) -> str:
         """Crée et retourne le chemin du répertoire de sortie."""
@@ -15,101 +112,110 @@ class VisualizationService:
         return str(output_dir)
 
     @staticmethod
-    def create_commit_histogram(events: List[Dict], timeframe: str) -> str:
+    def bin_events(events: Events) -> ActivityBins:
+        """Agrège les événements par jour, heure et heure de la semaine (une seule fois par analyse)."""
+        return ActivityBins.from_events(events)
+
+    @staticmethod
+    def create_commit_histogram(events: Events, timeframe: str,
+                                executor: Optional[Executor] = None) -> str:
         """Crée un histogramme des commits dans le temps."""
-        # Filtrer les événements de type Push
-        commit_events = [
-            event for event in events
-            if event["type"] == "PushEvent"
-        ]
+        counts, edges = VisualizationService.bin_events(events).commit_histogram(bins=30)
         
-        if not commit_events:
+        if len(counts) == 0:
             return ""
         
-        # Extraire les dates et le nombre de commits
-        dates = [event["created_at"] for event in commit_events]
-        commit_counts = [event["details"]["commits"] for event in commit_events]
-        
-        # Créer le graphique
-        plt.figure(figsize=(12, 6))
-        plt.hist(dates, bins=30, weights=commit_counts)
-        plt.title(f"Activité des commits ({timeframe})")
-        plt.xlabel("Date")
-        plt.ylabel("Nombre de commits")
-        plt.xticks(rotation=45)
-        
-        # Sauvegarder le graphique
-        output_dir = VisualizationService.ensure_output_dir("matplotlib")
-        output_path = f"{output_dir}/commit_histogram_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        plt.savefig(output_path, bbox_inches='tight')
-        plt.close()
-        
-        return output_path
+        edges, counts = edges.tolist(), counts.tolist()
+        return VisualizationService._render(
+            "matplotlib", "commit_histogram", "png",
+            {"edges": edges, "counts": counts}, {"timeframe": timeframe},
+            render_commit_histogram, (edges, counts, timeframe), executor
+        )
 
     @staticmethod
-    def create_activity_pie_chart(stats: Dict) -> str:
+    def create_activity_pie_chart(stats: Dict, executor: Optional[Executor] = None) -> str:
         """Crée un diagramme circulaire des types d'activités."""
         if not stats.get("events_by_type"):
             return ""
         
-        # Créer le graphique Plotly
-        fig = go.Figure(data=[go.Pie(
-            labels=list(stats["events_by_type"].keys()),
-            values=list(stats["events_by_type"].values()),
-            hole=0.3
-        )])
-        
-        fig.update_layout(
-            title="Distribution des types d'activités",
-            showlegend=True,
-            width=800,
-            height=600
+        labels = list(stats["events_by_type"].keys())
+        values = list(stats["events_by_type"].values())
+        return VisualizationService._render(
+            "plotly", "activity_distribution", "html",
+            list(zip(labels, values)), {"hole": 0.3},
+            render_activity_pie_chart, (labels, values), executor
         )
-        
-        # Sauvegarder le graphique
-        output_dir = VisualizationService.ensure_output_dir("plotly")
-        output_path = f"{output_dir}/activity_distribution_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-        fig.write_html(output_path)
-        
-        return output_path
 
     @staticmethod
-    def create_activity_timeline(events: List[Dict], days: int = 30) -> str:
+    def create_activity_timeline(events: Events, days: int = 30,
+                                 executor: Optional[Executor] = None) -> str:
         """Crée une timeline d'activité interactive."""
-        # Préparer les données
-        df = pd.DataFrame([{
-            'date': event['created_at'].date().isoformat() if isinstance(event['created_at'], datetime) else event['created_at'],
-            'type': event['type'],
-            'repo': event['repo_name']
-        } for event in events])
+        bins = VisualizationService.bin_events(events)
+        dates, series = bins.days(), bins.daily_series()
         
-        # Grouper par date et type
-        daily_activity = df.groupby(['date', 'type']).size().unstack(fill_value=0)
+        return VisualizationService._render(
+            "plotly", "activity_timeline", "html",
+            {"dates": dates, "series": series}, {},
+            render_activity_timeline, (dates, series), executor
+        )
+
+    @staticmethod
+    def create_activity_heatmap(events: Events, executor: Optional[Executor] = None) -> str:
+        """Crée une carte de chaleur de l'activité par jour de la semaine et par heure."""
+        bins = VisualizationService.bin_events(events)
+        if len(bins) == 0:
+            return ""
         
-        # Créer le graphique
-        fig = go.Figure()
+        counts = bins.week_hour_counts.tolist()
+        return VisualizationService._render(
+            "plotly", "activity_heatmap", "html",
+            counts, {},
+            render_activity_heatmap, (counts,), executor
+        )
+
+    @staticmethod
+    def build_chart_data(events: Events, stats: Dict, bins: int = 30) -> Dict:
+        """Retourne les séries agrégées des graphiques, à dessiner côté navigateur.
         
-        for event_type in daily_activity.columns:
-            fig.add_trace(go.Scatter(
-                x=daily_activity.index,
-                y=daily_activity[event_type],
-                name=event_type,
-                mode='lines+markers'
-            ))
+        Seules les valeurs sont transmises (quelques kilo-octets) : la
+        bibliothèque plotly.js est chargée une seule fois par le navigateur.
+        """
+        activity_bins = VisualizationService.bin_events(events)
         
-        fig.update_layout(
-            title="Timeline d'activité",
-            xaxis_title="Date",
-            yaxis_title="Nombre d'événements",
-            hovermode='x unified',
-            showlegend=True,
-            width=1000,
-            height=600
-        )
+        # Histogramme des commits : mêmes intervalles que le rendu matplotlib
+        counts, edges = activity_bins.commit_histogram(bins=bins)
+        commit_histogram = {
+            "edges": [datetime.utcfromtimestamp(edge).isoformat(timespec='seconds') for edge in edges],
+            "counts": counts.tolist()
+        }
         
-        # Sauvegarder le graphique
-        output_dir = VisualizationService.ensure_output_dir("plotly")
-        output_path = f"{output_dir}/activity_timeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-        fig.write_html(output_path)
+        return {
+            "commit_histogram": commit_histogram,
+            "distribution": {
+                "labels": list(stats.get("events_by_type", {}).keys()),
+                "values": list(stats.get("events_by_type", {}).values())
+            },
+            "timeline": {
+                "dates": activity_bins.days(),
+                "series": activity_bins.daily_series()
+            },
+            "heatmap": {
+                "weekdays": WEEKDAY_LABELS,
+                "hours": list(range(24)),
+                "counts": activity_bins.week_hour_counts.tolist()
+            }
+        }
+
+    @staticmethod
+    def _render(output_type: str, chart_name: str, extension: str, inputs: Any, params: Dict,
+                render_fn: Callable[..., None], args: tuple, executor: Optional[Executor]) -> str:
+        """Retourne le graphique depuis le cache ou le génère, éventuellement dans ``executor``."""
+        def render(output_path: str) -> None:
+            if executor is None:
+                render_fn(output_path, *args)
+            else:
+                executor.submit(render_fn, output_path, *args).result()
         
-        return output_path 
\ No newline at end of file
+        return VisualizationService.render_cache.get_or_render(
+            output_type, chart_name, extension, inputs, params, render
+        )
@@ -0,0 +1,121 @@
+"""
+Compression gzip/brotli des fichiers servis par l'application.
+
+Les fichiers volumineux sont compressés une seule fois, à leur génération,
+dans des fichiers voisins (``chart.html.gz``, ``chart.html.br``) servis tels
+quels ensuite. brotli est optionnel : sans lui, seul gzip est produit.
+"""
+import gzip
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : gzip seul
+    brotli = None
+
+# Encodages par ordre de préférence, avec l'extension de leurs fichiers précompressés
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+ENCODING_SUFFIXES = tuple(suffix for _, suffix in ENCODINGS)
+
+# Formats textuels qui gagnent à être compressés (les images PNG le sont déjà)
+COMPRESSIBLE_SUFFIXES = frozenset({".html", ".js", ".css", ".json", ".csv", ".ndjson", ".svg", ".txt"})
+
+# En dessous de cette taille, la compression ne vaut pas l'en-tête supplémentaire
+MIN_COMPRESS_SIZE = 1024
+
+# Fichiers dont la version compressée n'était pas plus petite, par (chemin, encodage) :
+# (mtime en ns, taille) de la version testée, pour ne pas la recompresser à chaque requête
+MAX_INCOMPRESSIBLE_ENTRIES = 1000
+_incompressible: Dict[Tuple[str, str], Tuple[int, int]] = {}
+_incompressible_lock = threading.Lock()
+
+
+def available_encodings() -> List[str]:
+    return [encoding for encoding, _ in ENCODINGS if encoding != "br" or brotli is not None]
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compresse ``data`` avec ``encoding`` (``gzip`` ou ``br``)."""
+    if encoding == "gzip":
+        # mtime fixe : un même contenu donne toujours les mêmes octets
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=5)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def precompressed_path(path: Union[str, Path], encoding: str) -> Path:
+    """Chemin du fichier voisin contenant ``path`` compressé avec ``encoding``."""
+    suffix = dict(ENCODINGS)[encoding]
+    return Path(f"{path}{suffix}")
+
+
+def is_compressible(path: Union[str, Path]) -> bool:
+    return Path(path).suffix.lower() in COMPRESSIBLE_SUFFIXES
+
+
+def precompress_file(path: Union[str, Path], min_size: int = MIN_COMPRESS_SIZE) -> List[str]:
+    """Écrit les versions compressées de ``path`` si elles manquent ou sont plus anciennes.
+
+    Une version compressée qui n'est pas plus petite que l'original n'est
+    pas conservée ; ce résultat est retenu tant que le fichier ne change pas,
+    pour ne pas le recompresser à chaque appel. Retourne les encodages
+    disponibles pour ce fichier.
+    """
+    path = Path(path)
+    stat = path.stat()
+    if not is_compressible(path) or stat.st_size < min_size:
+        return []
+
+    version = (stat.st_mtime_ns, stat.st_size)
+    data = None
+    encodings = []
+    for encoding in available_encodings():
+        target = precompressed_path(path, encoding)
+        if target.exists() and target.stat().st_mtime >= stat.st_mtime:
+            encodings.append(encoding)
+            continue
+        key = (str(path), encoding)
+        with _incompressible_lock:
+            if _incompressible.get(key) == version:
+                continue
+        if data is None:
+            data = path.read_bytes()
+        compressed = compress(data, encoding)
+        if len(compressed) >= len(data):
+            # Une ancienne version compressée ne correspond plus au fichier
+            target.unlink(missing_ok=True)
+            with _incompressible_lock:
+                _incompressible.pop(key, None)
+                _incompressible[key] = version
+                while len(_incompressible) > MAX_INCOMPRESSIBLE_ENTRIES:
+                    del _incompressible[next(iter(_incompressible))]
+            continue
+        # Écriture atomique : une requête concurrente ne lit jamais un fichier partiel
+        tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(compressed)
+        os.replace(tmp_path, target)
+        encodings.append(encoding)
+    return encodings
+
+
+def precompress_directory(directory: Union[str, Path], min_size: int = MIN_COMPRESS_SIZE) -> int:
+    """Précompresse les fichiers compressibles d'un répertoire ; retourne le nombre de fichiers traités."""
+    count = 0
+    for path in Path(directory).rglob("*"):
+        if path.is_file() and not path.name.startswith(".") and precompress_file(path, min_size):
+            count += 1
+    return count
+
+
+def remove_precompressed(path: Union[str, Path]) -> None:
+    """Supprime les versions compressées d'un fichier."""
+    for encoding, _ in ENCODINGS:
+        try:
+            precompressed_path(path, encoding).unlink()
+        except FileNotFoundError:
+            pass
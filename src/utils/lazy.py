@@ -0,0 +1,59 @@
+"""
+Imports différés des bibliothèques lourdes (pandas, matplotlib, plotly, PyPDF2).
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Iterable, Optional
+
+
+class LazyModule:
+    """Module importé au premier accès à l'un de ses attributs.
+
+    ``pd = LazyModule("pandas")`` se comporte comme ``import pandas as pd``,
+    mais l'import n'a lieu qu'à la première utilisation de ``pd.DataFrame``
+    (ou de tout autre attribut). Les imports concurrents sont sérialisés par
+    le verrou d'import de Python.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def load(self) -> ModuleType:
+        """Importe le module s'il ne l'est pas encore et le retourne."""
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.load(), attribute)
+
+    def __repr__(self) -> str:
+        state = "chargé" if self.loaded else "non chargé"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def preload(modules: Iterable[str]) -> threading.Thread:
+    """Importe ``modules`` dans un thread d'arrière-plan et retourne ce thread.
+
+    Appelé après le démarrage, il évite que la première requête qui dessine
+    un graphique ou produit un export paie le coût des imports.
+    """
+    modules = list(modules)
+
+    def run() -> None:
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                # Dépendance optionnelle absente : l'erreur sera signalée à l'usage
+                pass
+
+    thread = threading.Thread(target=run, name="preload", daemon=True)
+    thread.start()
+    return thread
@@ -1,6 +1,9 @@
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, Response, g, redirect, render_template, request, jsonify, session, url_for
 import os
+import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
 from datetime import datetime, date
@@ -8,12 +11,17 @@ from datetime import datetime, date
 # Ajouter le répertoire parent au PYTHONPATH
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from src.api.github_client import GitHubClient
-from src.models.event import EventProcessor
 from src.services.event_service import EventFilterService
+from src.services.comparison_service import ComparisonService
+from src.services.repo_ranking_service import RepoRankingService
+from src.services.sync_service import SyncService
 from src.services.stats_service import StatsService
 from src.services.visualization_service import VisualizationService
 from src.services.export_service import ExportService
+from src.web.http_cache import send_artifact, send_bytes, serve_static
+from src.web.jobs import DONE, ERROR, NotFoundError
+from src.web.services import get_services
+from src.utils.metrics import REGISTRY, current_trace, start_trace, timed, timed_chunks, trace
 from dotenv import load_dotenv
 
 # Charger les variables d'environnement
@@ -31,8 +39,53 @@ class CustomJSONEncoder(json.JSONEncoder):
 
 app.json_encoder = CustomJSONEncoder
 
-# Initialiser le client GitHub
-github_client = GitHubClient(token=os.getenv('GITHUB_TOKEN'))
+# Fichiers statiques servis avec un ETag sur leur contenu et leur version précompressée
+app.view_functions['static'] = lambda filename: serve_static(app.static_folder, filename)
+
+# Les graphiques sont dessinés par le navigateur à partir des séries agrégées ;
+# la génération des fichiers côté serveur reste disponible en repli
+server_side_charts = os.getenv('SERVER_SIDE_CHARTS', '').lower() in ('1', 'true', 'yes')
+
+# Nombre maximal d'utilisateurs d'une comparaison et synchronisations simultanées
+compare_max_users = int(os.getenv('COMPARE_MAX_USERS', 100))
+compare_sync_workers = int(os.getenv('COMPARE_SYNC_WORKERS', 4))
+
+# En-tête Server-Timing optionnel détaillant la durée des étapes de chaque requête
+server_timing = os.getenv('SERVER_TIMING', '').lower() in ('1', 'true', 'yes')
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "github_analyzer_http_request_duration_seconds",
+    "Durée de traitement des requêtes HTTP, par route et code de statut.",
+    labels=("endpoint", "status")
+)
+
+
+def app_services():
+    """Services de l'application, créés à la première requête (voir src.web.services)."""
+    return get_services(app.static_folder, server_side_charts)
+
+
+@app.before_request
+def start_request_trace():
+    """Démarrer la mesure de la requête et de ses étapes."""
+    g.request_start = time.perf_counter()
+    start_trace()
+
+@app.after_request
+def record_request_timing(response):
+    """Enregistrer la durée de la requête et ajouter l'en-tête Server-Timing si activé."""
+    seconds = time.perf_counter() - g.request_start
+    HTTP_REQUEST_SECONDS.observe(seconds, endpoint=request.endpoint or "unknown", status=str(response.status_code))
+    active = current_trace()
+    if server_timing and active is not None:
+        active.add("total", seconds)
+        response.headers['Server-Timing'] = active.server_timing()
+    return response
+
+
+def get_current_result():
+    """Retourne le résultat de la dernière analyse de la session, ou None s'il a expiré."""
+    return app_services().result_store.get(session.get('analysis_id'))
 
 @app.route('/')
 def index():
@@ -41,9 +94,119 @@ def index():
     session.clear()
     return render_template('index.html')
 
+def run_analysis(username, timeframe, report_progress):
+    """Exécuter une analyse complète : récupération, statistiques et visualisations."""
+    services = app_services()
+    # Synchroniser les nouveaux événements ; seuls ceux-ci sont lus depuis le stockage local
+    report_progress("Récupération des événements")
+    # Le stockage compare les dates à la seconde près
+    cutoff = EventFilterService.get_cutoff(timeframe).replace(microsecond=0)
+    SyncService.sync_user(services.github_client, services.event_store, username)
+    with timed("store_read"):
+        timeline = services.timelines.get(username)
+    
+    # Totaux de la période par les sommes cumulées, événements par une vue sans copie
+    totals = timeline.range_totals(start=cutoff)
+    if not totals['events']:
+        raise NotFoundError(f"Aucune activité trouvée pour {username} dans la période {timeframe}")
+    filtered_events = timeline.range(start=cutoff)
+    
+    # Calculer les statistiques
+    report_progress("Calcul des statistiques")
+    with timed("stats"):
+        stats = StatsService.calculate_window_stats(filtered_events, totals)
+    with timed("chart_data"):
+        chart_data = VisualizationService.build_chart_data(filtered_events, stats)
+    
+    # Part de l'utilisateur dans l'activité de ses dépôts principaux
+    report_progress("Activité des dépôts")
+    with timed("repo_enrichment"):
+        top_repos = services.repo_enrichment.enrich(
+            RepoRankingService.rank_repositories(filtered_events), username, since=cutoff
+        ) if services.repo_enrichment.top_k else []
+    
+    # Stocker les résultats côté serveur pour les exports et les graphiques
+    with timed("result_store"):
+        analysis_id = services.result_store.put({
+            'username': username,
+            'timeframe': timeframe,
+            # Copie du plus récent au plus ancien, comme le stockage : la vue référence toute la chronologie
+            'events': list(reversed(filtered_events)),
+            'stats': stats,
+            'chart_data': chart_data
+        })
+    
+    result = {
+        'analysis_id': analysis_id,
+        'username': username,
+        'timeframe': timeframe,
+        'stats': stats,
+        'top_repos': top_repos,
+        'hist_path': '',
+        'pie_path': '',
+        'timeline_path': '',
+        'heatmap_path': ''
+    }
+    if server_side_charts:
+        # Générer les visualisations
+        report_progress("Génération des visualisations")
+        with timed("render"):
+            result.update(services.render_pipeline.render_all(filtered_events, stats, timeframe))
+    return result
+
+def run_traced_analysis(username, timeframe, report_progress):
+    """Exécuter une analyse en mesurant la durée de chacune de ses étapes."""
+    with trace() as analysis_trace:
+        result = run_analysis(username, timeframe, report_progress)
+    return dict(result, timings=analysis_trace.stages)
+
+def submit_analysis(username, timeframe):
+    """Soumettre une analyse ; une analyse identique déjà en cours est réutilisée."""
+    # Valider la période avant de soumettre le job
+    EventFilterService.get_cutoff(timeframe)
+    return app_services().job_manager.submit(
+        (username.lower(), timeframe),
+        lambda report_progress: run_traced_analysis(username, timeframe, report_progress)
+    )
+
+def render_job_result(job):
+    """Afficher les résultats d'un job terminé."""
+    if job.status == ERROR:
+        return jsonify({"error": job.error}), job.error_status
+    
+    result = job.result
+    if 'leaderboard' in result:
+        # Job de comparaison (voir compare_users)
+        return render_template('compare.html', comparison=result, max_users=compare_max_users)
+    session['analysis_id'] = result['analysis_id']
+    # Les étapes de l'analyse, exécutées dans un worker, rejoignent la trace de la requête
+    active = current_trace()
+    if active is not None:
+        active.extend(result['timings'])
+    return render_template(
+        'results.html',
+        username=result['username'],
+        timeframe=result['timeframe'],
+        stats=result['stats'],
+        top_repos=result['top_repos'],
+        charts_url=url_for('analysis_charts', analysis_id=result['analysis_id']),
+        hist_path=result['hist_path'],
+        pie_path=result['pie_path'],
+        timeline_path=result['timeline_path'],
+        heatmap_path=result['heatmap_path']
+    )
+
+def job_to_json(job):
+    """Représentation JSON de l'état d'un job, avec les URLs utiles au client."""
+    data = job.to_dict()
+    data['status_url'] = url_for('job_status', job_id=job.id)
+    if job.status == DONE:
+        data['result_url'] = url_for('job_result', job_id=job.id)
+    return data
+
 @app.route('/analyze', methods=['POST'])
 def analyze_profile():
-    """Analyser le profil GitHub et afficher les résultats."""
+    """Soumettre l'analyse et rediriger vers la page de progression du job (sans JavaScript)."""
     username = request.form.get('username')
     timeframe = request.form.get('timeframe', '30d')
     
@@ -51,92 +214,228 @@ def analyze_profile():
         return jsonify({"error": "Le nom d'utilisateur est requis"}), 400
     
     try:
-        # Récupérer et traiter les événements
-        raw_events = github_client.get_user_events(username)
-        events = [EventProcessor.process_event(event) for event in raw_events]
-        filtered_events = EventFilterService.filter_by_timeframe(events, timeframe)
-        
-        if not filtered_events:
-            return jsonify({
-                "error": f"Aucune activité trouvée pour {username} dans la période {timeframe}"
-            }), 404
-        
-        # Calculer les statistiques
-        stats = StatsService.calculate_global_stats(filtered_events)
-        
-        # Convertir les événements pour la session (rendre les objets datetime sérialisables)
-        session_events = []
-        for event in filtered_events:
-            event_copy = event.copy()
-            if isinstance(event_copy.get('created_at'), (datetime, date)):
-                event_copy['created_at'] = event_copy['created_at'].isoformat()
-            session_events.append(event_copy)
-        
-        # Stocker les données en session pour les exports
-        session['filtered_events'] = session_events
-        session['stats'] = stats
-        
-        # Générer les visualisations
-        hist_path = VisualizationService.create_commit_histogram(filtered_events, timeframe)
-        pie_path = VisualizationService.create_activity_pie_chart(stats)
-        timeline_path = VisualizationService.create_activity_timeline(filtered_events)
-        
-        return render_template(
-            'results.html',
-            username=username,
-            timeframe=timeframe,
-            stats=stats,
-            hist_path=hist_path,
-            pie_path=pie_path,
-            timeline_path=timeline_path
-        )
-        
+        job = submit_analysis(username, timeframe)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        return jsonify({"error": f"Une erreur est survenue : {str(e)}"}), 500
+    
+    # La requête n'attend pas le job : la page de résultats se recharge jusqu'à sa fin
+    return redirect(url_for('job_result', job_id=job.id), code=303)
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """Soumettre une analyse en arrière-plan et retourner immédiatement l'identifiant du job."""
+    username = request.form.get('username')
+    timeframe = request.form.get('timeframe', '30d')
+    
+    if not username:
+        return jsonify({"error": "Le nom d'utilisateur est requis"}), 400
+    
+    try:
+        job = submit_analysis(username, timeframe)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify(job_to_json(job)), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """État et progression d'un job d'analyse."""
+    job = app_services().job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job introuvable"}), 404
+    return jsonify(job_to_json(job))
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Résultats d'un job terminé (analyse ou comparaison), ou page de progression tant qu'il s'exécute."""
+    job = app_services().job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job introuvable"}), 404
+    if not job.finished:
+        if request.accept_mimetypes.best_match(['application/json', 'text/html']) == 'text/html':
+            return render_template('job.html', job=job, refresh=1), 202
+        return jsonify(job_to_json(job)), 202
+    return render_job_result(job)
+
+@app.route('/api/analyses/<analysis_id>/charts')
+def analysis_charts(analysis_id):
+    """Séries agrégées des graphiques d'une analyse, au format JSON."""
+    services = app_services()
+    result = services.result_store.get(analysis_id)
+    if result is None:
+        return jsonify({"error": "Aucune analyse disponible, veuillez relancer l'analyse"}), 404
+    
+    # Le résultat d'une analyse ne change pas : le navigateur peut le réutiliser,
+    # puis le revalider par son ETag une fois max-age écoulé
+    return send_bytes(
+        app.json.dumps(result['chart_data']).encode('utf-8'),
+        'application/json',
+        cache_control=f'private, max-age={int(services.result_store.ttl)}'
+    )
+
+@app.route('/live/<username>')
+def live_events(username):
+    """Flux Server-Sent Events des nouveaux événements d'un utilisateur (totaux et deltas des graphiques)."""
+    timeframe = request.args.get('timeframe', '30d')
+    try:
+        EventFilterService.get_cutoff(timeframe)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    response = Response(app_services().live_hub.stream(username, timeframe), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Désactiver la mise en tampon des proxys (nginx) pour que chaque message parte immédiatement
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def send_export(make_chunks, mimetype, filename):
+    """Export d'une analyse, généré une seule fois par format puis servi depuis le disque.
+    
+    Les téléchargements suivants, y compris les requêtes conditionnelles
+    (``If-None-Match``), ne régénèrent ni ne recompressent le fichier.
+    """
+    extension = filename.rsplit('.', 1)[-1]
+    artifact = app_services().artifact_store.get_or_create(
+        (session['analysis_id'], extension),
+        lambda: timed_chunks(f"export_{extension}", make_chunks()),
+        extension
+    )
+    response = send_artifact(artifact, mimetype, filename)
+    # Le contenu dépend de l'analyse de la session
+    response.vary.add('Cookie')
+    return response
+
+def parse_usernames(text):
+    """Noms d'utilisateur séparés par des virgules, espaces ou retours à la ligne, sans doublons."""
+    return list(dict.fromkeys(name for name in re.split(r'[\s,;]+', text or '') if name))
+
+def run_comparison(usernames, timeframe, report_progress):
+    """Synchroniser les utilisateurs puis comparer leur activité sur la période."""
+    services = app_services()
+    cutoff = EventFilterService.get_cutoff(timeframe)
+    report_progress(f"Récupération des événements de {len(usernames)} utilisateurs")
+    errors = {}
+    
+    def sync(username):
+        try:
+            SyncService.sync_user(services.github_client, services.event_store, username)
+        except Exception as e:
+            errors[username] = str(e) or type(e).__name__
+    
+    with ThreadPoolExecutor(max_workers=compare_sync_workers) as pool:
+        list(pool.map(sync, usernames))
+    
+    with timed("store_read"):
+        events_by_user = {
+            username: services.event_store.get_user_events(username, since=cutoff)
+            for username in usernames if username not in errors
+        }
+    
+    report_progress("Comparaison des utilisateurs")
+    with timed("compare"):
+        comparison = ComparisonService.compare(events_by_user)
+    if not comparison['active_users']:
+        raise NotFoundError(f"Aucune activité trouvée pour ces utilisateurs dans la période {timeframe}")
+    return dict(comparison, usernames=usernames, timeframe=timeframe, errors=errors)
+
+@app.route('/compare', methods=['GET', 'POST'])
+def compare_users():
+    """Comparer plusieurs utilisateurs : classement, centiles et dépôts partagés.
+    
+    En POST, la comparaison est soumise en arrière-plan et l'identifiant du
+    job est retourné immédiatement, comme pour ``POST /jobs``.
+    """
+    if request.method == 'GET':
+        return render_template('compare.html', comparison=None, max_users=compare_max_users)
+    
+    usernames = parse_usernames(request.form.get('usernames'))
+    timeframe = request.form.get('timeframe', '30d')
+    if len(usernames) < 2:
+        return jsonify({"error": "Au moins deux noms d'utilisateur sont requis"}), 400
+    if len(usernames) > compare_max_users:
+        return jsonify({"error": f"Au plus {compare_max_users} utilisateurs peuvent être comparés"}), 400
+    
+    try:
+        EventFilterService.get_cutoff(timeframe)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    # Jusqu'à compare_max_users synchronisations : le job est suivi via /jobs/<id>, sans bloquer la requête
+    job = app_services().job_manager.submit(
+        ('compare', tuple(sorted(username.lower() for username in usernames)), timeframe),
+        lambda report_progress: run_comparison(usernames, timeframe, report_progress)
+    )
+    return jsonify(job_to_json(job)), 202
+
+@app.route('/metrics')
+def metrics():
+    """Métriques du processus au format texte Prometheus."""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 @app.route('/export/csv')
 def export_csv():
     """Exporter les données au format CSV."""
-    try:
-        csv_path = ExportService.to_csv(session.get('filtered_events', []))
-        return send_file(
-            csv_path,
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name='github_activity.csv'
-        )
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    result = get_current_result()
+    if result is None:
+        return jsonify({"error": "Aucune analyse disponible, veuillez relancer l'analyse"}), 404
+    
+    return send_export(lambda: ExportService.iter_csv(result['events']), 'text/csv', 'github_activity.csv')
 
 @app.route('/export/json')
 def export_json():
     """Exporter les données au format JSON."""
+    result = get_current_result()
+    if result is None:
+        return jsonify({"error": "Aucune analyse disponible, veuillez relancer l'analyse"}), 404
+    
+    return send_export(lambda: ExportService.iter_json(result['events']), 'application/json', 'github_activity.json')
+
+@app.route('/export/ndjson')
+def export_ndjson():
+    """Exporter les données au format NDJSON (un événement par ligne)."""
+    result = get_current_result()
+    if result is None:
+        return jsonify({"error": "Aucune analyse disponible, veuillez relancer l'analyse"}), 404
+    
+    return send_export(lambda: ExportService.iter_ndjson(result['events']), 'application/x-ndjson', 'github_activity.ndjson')
+
+@app.route('/export/parquet')
+def export_parquet():
+    """Exporter les données au format Parquet, avec les détails aplatis en colonnes."""
+    result = get_current_result()
+    if result is None:
+        return jsonify({"error": "Aucune analyse disponible, veuillez relancer l'analyse"}), 404
+    
     try:
-        json_path = ExportService.to_json(session.get('filtered_events', []))
-        return send_file(
-            json_path,
-            mimetype='application/json',
-            as_attachment=True,
-            download_name='github_activity.json'
+        return send_export(
+            lambda: ExportService.iter_parquet(result['events']),
+            'application/vnd.apache.parquet',
+            'github_activity.parquet'
         )
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    except ImportError:
+        return jsonify({"error": "L'export Parquet nécessite le paquet pyarrow"}), 501
 
 @app.route('/export/pdf')
 def export_pdf():
     """Exporter les données au format PDF."""
+    services = app_services()
+    result = get_current_result()
+    if result is None:
+        return jsonify({"error": "Aucune analyse disponible, veuillez relancer l'analyse"}), 404
+    
     try:
-        pdf_path = ExportService.to_pdf(session.get('stats', {}))
-        return send_file(
-            pdf_path,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name='github_activity.pdf'
-        )
+        artifact = services.artifact_store.get((session['analysis_id'], 'pdf'))
+        if artifact is None:
+            with timed("export_pdf"):
+                pdf_path = ExportService.to_pdf(result['stats'])
+            artifact = services.artifact_store.add_file((session['analysis_id'], 'pdf'), pdf_path)
+        response = send_artifact(artifact, 'application/pdf', 'github_activity.pdf')
+        response.vary.add('Cookie')
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
+    # Démarrer les services (pools, préchargement) avant la première requête
+    app_services()
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""
+Réponses HTTP réutilisables par le navigateur : ETag calculé sur le contenu,
+réponses ``304`` aux requêtes conditionnelles et compression gzip/brotli
+négociée à partir de ``Accept-Encoding``.
+
+Les exports sont générés une seule fois par analyse et par format, puis
+conservés sur disque avec leurs versions précompressées : les
+téléchargements suivants ne coûtent ni génération ni compression.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Union
+
+from flask import Request, Response, abort, request, send_file
+from werkzeug.security import safe_join
+
+from src.utils.compression import (
+    MIN_COMPRESS_SIZE, available_encodings, compress, is_compressible, precompress_file, precompressed_path,
+    remove_precompressed
+)
+
+
+def content_etag(data: bytes) -> str:
+    """Empreinte du contenu utilisée comme ETag (sans les guillemets)."""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def negotiate_encoding(req: Request, encodings: Iterable[str]) -> Optional[str]:
+    """Encodage préféré parmi ``encodings`` accepté par le client, ou None pour le contenu brut."""
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = req.accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_not_modified(req: Request, etag: str) -> bool:
+    """Le client possède-t-il déjà cette version (``If-None-Match``) ?"""
+    if req.if_none_match.star_tag:
+        return True
+    # Toutes les variantes encodées d'un même contenu partagent son empreinte
+    return any(tag.split("-", 1)[0] == etag for tag in req.if_none_match.as_set())
+
+
+def _finish(response: Response, etag: str, encoding: Optional[str], cache_control: str) -> Response:
+    response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+    response.headers["Cache-Control"] = cache_control
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def send_bytes(data: bytes, mimetype: str, cache_control: str = "no-cache") -> Response:
+    """Réponse pour un petit contenu généré à la demande (JSON des graphiques).
+
+    Le contenu est compressé à la volée : à réserver aux contenus de
+    quelques kilo-octets, les fichiers volumineux passent par
+    :func:`send_precompressed`.
+    """
+    etag = content_etag(data)
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control)
+
+    encoding = None
+    if len(data) >= MIN_COMPRESS_SIZE:
+        encoding = negotiate_encoding(request, available_encodings())
+    body = compress(data, encoding) if encoding else data
+    return _finish(Response(body, mimetype=mimetype), etag, encoding, cache_control)
+
+
+class _FileTag(NamedTuple):
+    mtime_ns: int
+    size: int
+    etag: str
+
+
+class FileEtags:
+    """Empreintes des fichiers servis, recalculées seulement quand un fichier change."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._tags: "OrderedDict[str, _FileTag]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Union[str, Path]) -> str:
+        key = str(path)
+        stat = os.stat(key)
+        with self._lock:
+            tag = self._tags.get(key)
+            if tag is not None and tag.mtime_ns == stat.st_mtime_ns and tag.size == stat.st_size:
+                self._tags.move_to_end(key)
+                return tag.etag
+
+        digest = hashlib.sha256()
+        with open(key, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+        etag = digest.hexdigest()[:32]
+
+        with self._lock:
+            self._tags[key] = _FileTag(stat.st_mtime_ns, stat.st_size, etag)
+            self._tags.move_to_end(key)
+            while len(self._tags) > self.max_entries:
+                self._tags.popitem(last=False)
+        return etag
+
+
+file_etags = FileEtags()
+
+
+def send_precompressed(path: Union[str, Path], mimetype: Optional[str] = None, cache_control: str = "no-cache",
+                       download_name: Optional[str] = None, etag: Optional[str] = None) -> Response:
+    """Envoie un fichier, ou sa version précompressée (``.br``, ``.gz``) acceptée par le client.
+
+    Les versions compressées plus anciennes que le fichier sont régénérées
+    avant d'être proposées : un fichier modifié pendant que l'application
+    tourne n'est jamais servi avec l'ancien contenu compressé.
+    """
+    # send_file résout les chemins relatifs par rapport au dossier de l'application
+    path = Path(path).resolve()
+    etag = etag or file_etags.get(path)
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control)
+
+    encoding = negotiate_encoding(request, precompress_file(path))
+    response = send_file(
+        precompressed_path(path, encoding) if encoding else path,
+        mimetype=mimetype,
+        as_attachment=download_name is not None,
+        download_name=download_name or path.name,
+        etag=False,
+        conditional=not encoding,
+        max_age=None
+    )
+    return _finish(response, etag, encoding, cache_control)
+
+
+def serve_static(directory: str, filename: str) -> Response:
+    """Remplace la vue ``static`` de Flask : fichiers précompressés et ETag sur le contenu."""
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    return send_precompressed(path, cache_control="public, no-cache")
+
+
+# Fichiers écrits par ArtifactStore : empreinte, extension et versions compressées, ou fichier temporaire
+ARTIFACT_NAME = re.compile(r"^([0-9a-f]{32}\.\w+(\.gz|\.br)?|\.[0-9a-f]{32}\.tmp)$")
+
+
+class Artifact(NamedTuple):
+    path: Path
+    etag: str
+
+
+class ArtifactStore:
+    """Exports générés une fois puis servis depuis le disque, avec leurs versions précompressées.
+
+    Chaque artefact est identifié par une clé (analyse, format) et nommé
+    d'après l'empreinte de son contenu, calculée pendant l'écriture. Les
+    générations simultanées d'une même clé sont sérialisées : la seconde
+    réutilise le fichier produit par la première. Au-delà de
+    ``max_entries`` artefacts, les moins récemment utilisés sont supprimés.
+    """
+
+    def __init__(self, base_dir: str = ".cache/artifacts", max_entries: int = 100,
+                 max_age: float = 24 * 3600):
+        # Chemin absolu : le répertoire de travail n'est pas celui de l'application
+        self.base_dir = Path(base_dir).resolve()
+        self.max_entries = max_entries
+        self._artifacts: "OrderedDict[Hashable, Artifact]" = OrderedDict()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        # L'index est en mémoire : les fichiers anciens d'une exécution précédente sont orphelins
+        now = time.time()
+        for path in self.base_dir.iterdir():
+            if path.is_file() and ARTIFACT_NAME.match(path.name) and now - path.stat().st_mtime > max_age:
+                path.unlink(missing_ok=True)
+
+    def get(self, key: Hashable) -> Optional[Artifact]:
+        with self._lock:
+            artifact = self._artifacts.get(key)
+            if artifact is None:
+                return None
+            # Un autre processus partageant le répertoire a pu supprimer le fichier
+            if not artifact.path.exists():
+                del self._artifacts[key]
+                return None
+            self._artifacts.move_to_end(key)
+            return artifact
+
+    def get_or_create(self, key: Hashable, generate: Callable[[], Iterable[Union[str, bytes]]],
+                      extension: str) -> Artifact:
+        """Retourne l'artefact de ``key``, en l'écrivant à partir des morceaux de ``generate()`` si besoin."""
+        artifact = self.get(key)
+        if artifact is not None:
+            return artifact
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                artifact = self.get(key)
+                if artifact is None:
+                    artifact = self._write(generate(), extension)
+                    self._add(key, artifact)
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+        return artifact
+
+    def add_file(self, key: Hashable, source: Union[str, Path]) -> Artifact:
+        """Enregistre un fichier déjà généré (export PDF) comme artefact de ``key``."""
+        source = Path(source)
+        with open(source, "rb") as f:
+            artifact = self._write(iter(lambda: f.read(1 << 16), b""), source.suffix.lstrip("."))
+        self._add(key, artifact)
+        return artifact
+
+    def _write(self, chunks: Iterable[Union[str, bytes]], extension: str) -> Artifact:
+        digest = hashlib.sha256()
+        tmp_path = self.base_dir / f".{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+                    digest.update(data)
+                    f.write(data)
+            etag = digest.hexdigest()[:32]
+            path = self.base_dir / f"{etag}.{extension}"
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        if is_compressible(path):
+            precompress_file(path)
+        return Artifact(path, etag)
+
+    def _add(self, key: Hashable, artifact: Artifact) -> None:
+        evicted = []
+        with self._lock:
+            self._artifacts[key] = artifact
+            self._artifacts.move_to_end(key)
+            while len(self._artifacts) > self.max_entries:
+                evicted.append(self._artifacts.popitem(last=False)[1])
+            in_use = {artifact.path for artifact in self._artifacts.values()}
+        # Deux clés au contenu identique partagent le même fichier
+        for old in evicted:
+            if old.path not in in_use:
+                old.path.unlink(missing_ok=True)
+                remove_precompressed(old.path)
+
+
+def send_artifact(artifact: Artifact, mimetype: str, download_name: str,
+                  cache_control: str = "private, no-cache") -> Response:
+    """Envoie un export en pièce jointe, avec ETag et version précompressée si acceptée."""
+    return send_precompressed(artifact.path, mimetype, cache_control, download_name, artifact.etag)
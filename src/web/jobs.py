@@ -0,0 +1,115 @@
+"""
+Exécution des analyses en arrière-plan, avec déduplication des analyses identiques en cours.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+
+
+class NotFoundError(Exception):
+    """Aucune donnée pour la demande : le job se termine en erreur 404."""
+
+
+class Job:
+    """Analyse soumise au pool de workers."""
+
+    def __init__(self, key: Hashable):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = PENDING
+        self.progress = "En attente"
+        self.result: Optional[Any] = None
+        self.error: Optional[str] = None
+        self.error_status = 500
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, ERROR)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin du job ; retourne False si le délai est dépassé."""
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error
+        }
+
+
+class JobManager:
+    """Pool borné de workers exécutant les analyses.
+
+    Les soumissions ayant la même clé qu'un job encore en cours sont
+    rattachées à ce job (single-flight) au lieu d'en créer un nouveau.
+    Les jobs terminés sont conservés ``ttl`` secondes pour être consultés.
+    """
+
+    def __init__(self, max_workers: int = 4, ttl: float = 600):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._jobs: Dict[str, Job] = {}
+        self._in_flight: Dict[Hashable, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, fn: Callable[[Callable[[str], None]], Any]) -> Job:
+        """Soumet ``fn(report_progress)`` sous la clé ``key`` et retourne le job correspondant."""
+        with self._lock:
+            self._purge()
+            job = self._in_flight.get(key)
+            if job is not None:
+                return job
+
+            job = Job(key)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job, fn: Callable[[Callable[[str], None]], Any]) -> None:
+        job.status = RUNNING
+
+        def report_progress(message: str) -> None:
+            job.progress = message
+
+        try:
+            job.result = fn(report_progress)
+            job.status = DONE
+            job.progress = "Terminé"
+        except ValueError as e:
+            job.error, job.error_status, job.status = str(e), 400, ERROR
+        except NotFoundError as e:
+            job.error, job.error_status, job.status = str(e), 404, ERROR
+        except Exception as e:
+            job.error, job.error_status, job.status = f"Une erreur est survenue : {str(e)}", 500, ERROR
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+            job._done.set()
+
+    def _purge(self) -> None:
+        now = time.time()
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.ttl
+        ]:
+            del self._jobs[job_id]
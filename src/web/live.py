@@ -0,0 +1,256 @@
+"""
+Mode direct de la page de résultats : un seul poller par utilisateur
+interroge GitHub au rythme demandé par l'API (``X-Poll-Interval``), ne
+traite que les événements plus récents que ceux déjà agrégés et diffuse
+les deltas à tous les navigateurs abonnés par Server-Sent Events.
+"""
+import json
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.api.github_client import GitHubClient
+from src.models.activity_bins import ActivityBins
+from src.models.event import EventProcessor
+from src.models.event_timeline import EventTimeline
+from src.services.aggregation_service import ActivityAggregator
+from src.services.event_service import EventFilterService
+from src.services.event_store import EventStore
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """Message Server-Sent Events nommé ``event`` portant ``data`` en JSON."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class Subscription:
+    """File des messages destinés à un navigateur abonné."""
+
+    def __init__(self, timeframe: str, max_queue: int = 100):
+        self.timeframe = timeframe
+        self.messages: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_queue)
+        self.closed = False
+
+    def send(self, message: Optional[str]) -> None:
+        try:
+            self.messages.put_nowait(message)
+        except queue.Full:
+            # Un abonné trop lent est déconnecté plutôt que de ralentir le poller
+            self.closed = True
+
+
+class UserPoller:
+    """Suit les nouveaux événements d'un utilisateur pour tous ses abonnés.
+
+    Les événements lus depuis le stockage local sont gardés dans une
+    :class:`EventTimeline` ; l'agrégat de chaque période affichée en est
+    tiré une fois, puis tenu à jour de manière incrémentale : les événements
+    dont l'identifiant dépasse le dernier identifiant agrégé y sont ajoutés,
+    ceux que la date limite de la période a dépassés en sont retirés.
+    """
+
+    def __init__(self, hub: "LiveHub", username: str):
+        self.hub = hub
+        self.username = username.lower()
+        self.last_id: Optional[int] = None
+        self.subscribers: List[Subscription] = []
+        self.timeline: Optional[EventTimeline] = None
+        # Date limite à partir de laquelle la chronologie contient tous les événements
+        self.timeline_start: Optional[datetime] = None
+        self.aggregators: Dict[str, ActivityAggregator] = {}
+        # Date limite appliquée à chaque agrégat lors de sa dernière mise à jour
+        self.window_starts: Dict[str, datetime] = {}
+        self.poll_count = 0
+        self._lock = threading.Lock()
+        # Sérialise les lectures et écritures du stockage, faites hors de _lock
+        self._update_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"live-{self.username}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            for subscription in self.subscribers:
+                subscription.send(None)
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def subscribe(self, timeframe: str) -> Subscription:
+        """Abonne un navigateur ; le premier message donne les totaux actuels de la période."""
+        subscription = Subscription(timeframe, self.hub.max_queue)
+        cutoff = EventFilterService.get_cutoff(timeframe)
+        with self._update_lock:
+            last_id, timeline = self.last_id, None
+            if last_id is None:
+                last_id = self.hub.store.latest_event_id(self.username) or 0
+            if self.timeline_start is None or cutoff < self.timeline_start:
+                # Seuls les événements déjà couverts par last_id : les suivants arriveront en delta
+                events = self.hub.store.get_user_events(self.username, since=cutoff)
+                timeline = EventTimeline(event for event in events if int(event["id"]) <= last_id)
+
+            with self._lock:
+                self.last_id = last_id
+                if timeline is not None:
+                    self.timeline, self.timeline_start = timeline, cutoff
+                aggregator = self.aggregators.get(timeframe)
+                if aggregator is None:
+                    aggregator = self.aggregators[timeframe] = ActivityAggregator(outputs=("global",)).update(
+                        self.timeline.range(start=cutoff)
+                    )
+                    self.window_starts[timeframe] = cutoff
+                self.subscribers.append(subscription)
+                subscription.send(format_sse("snapshot", self._totals(aggregator)))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> int:
+        """Retire un abonné et retourne le nombre d'abonnés restants."""
+        with self._lock:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+            timeframes = {subscriber.timeframe for subscriber in self.subscribers}
+            for timeframe in set(self.aggregators) - timeframes:
+                del self.aggregators[timeframe]
+                del self.window_starts[timeframe]
+            return len(self.subscribers)
+
+    def poll(self) -> int:
+        """Récupère et diffuse les événements plus récents que le dernier agrégé ; retourne leur nombre."""
+        with self._lock:
+            last_id = self.last_id
+        raw_events = self.hub.client.get_all_user_events(self.username, after_id=last_id)
+        self.poll_count += 1
+
+        events = [EventProcessor.process_event(event) for event in raw_events]
+        if events:
+            bins = ActivityBins.from_events(events)
+            delta = {
+                "new_events": len(events),
+                "timeline": {"dates": bins.days(), "series": bins.daily_series()},
+                "heatmap": bins.week_hour_counts.tolist()
+            }
+
+        with self._update_lock:
+            if events:
+                self.hub.store.save_events(self.username, events)
+            with self._lock:
+                messages = {}
+                for timeframe, aggregator in self.aggregators.items():
+                    # Les événements sortis de la période sont retirés avant l'ajout des nouveaux
+                    expired = self._expire(timeframe, aggregator)
+                    if expired or events:
+                        messages[timeframe] = self._totals(aggregator)
+                if events:
+                    self.last_id = max(last_id or 0, max(int(event["id"]) for event in events))
+                    self.timeline.add(events)
+                    for timeframe, aggregator in self.aggregators.items():
+                        cutoff = self.window_starts[timeframe]
+                        aggregator.update(event for event in events if event["created_at"] >= cutoff)
+                        messages[timeframe] = format_sse("delta", dict(delta, **self._totals(aggregator)))
+                else:
+                    messages = {timeframe: format_sse("snapshot", totals) for timeframe, totals in messages.items()}
+                for subscription in self.subscribers:
+                    if subscription.timeframe in messages:
+                        subscription.send(messages[subscription.timeframe])
+        return len(events)
+
+    def _expire(self, timeframe: str, aggregator: ActivityAggregator) -> int:
+        """Retire de l'agrégat les événements passés sous la date limite ; retourne leur nombre."""
+        start = self.window_starts[timeframe]
+        cutoff = EventFilterService.get_cutoff(timeframe)
+        self.window_starts[timeframe] = cutoff
+        expired = 0
+        for event in self.timeline.range(start=start, end=cutoff):
+            if event["created_at"] < cutoff:
+                aggregator.remove(event)
+                expired += 1
+        return expired
+
+    def poll_interval(self) -> float:
+        """Délai avant le prochain sondage : X-Poll-Interval, borné par l'intervalle minimal."""
+        interval = self.hub.client.poll_intervals.get(f"/users/{self.username}/events")
+        return max(self.hub.default_interval if interval is None else interval, self.hub.min_interval)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                with self._lock:
+                    for subscription in self.subscribers:
+                        subscription.send(format_sse("error", {"error": str(e) or type(e).__name__}))
+            self._stop.wait(self.poll_interval())
+
+    @staticmethod
+    def _totals(aggregator: ActivityAggregator) -> Dict:
+        stats = aggregator.global_stats()
+        return {
+            "stats": {key: stats[key] for key in ("total_commits", "total_issues", "total_prs", "total_repos")},
+            "distribution": {
+                "labels": list(stats["events_by_type"].keys()),
+                "values": list(stats["events_by_type"].values())
+            }
+        }
+
+
+class LiveHub:
+    """Registre des pollers : un poller par utilisateur, partagé par tous ses abonnés.
+
+    Le poller démarre avec le premier abonné et s'arrête avec le dernier.
+    """
+
+    def __init__(self, client: GitHubClient, store: EventStore, min_interval: float = 10.0,
+                 default_interval: float = 60.0, keepalive: float = 15.0, max_queue: int = 100):
+        self.client = client
+        self.store = store
+        self.min_interval = min_interval
+        self.default_interval = default_interval
+        self.keepalive = keepalive
+        self.max_queue = max_queue
+        self._pollers: Dict[str, UserPoller] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, username: str, timeframe: str) -> Tuple[UserPoller, Subscription]:
+        """Abonne un navigateur aux deltas d'un utilisateur, en démarrant son poller si besoin."""
+        EventFilterService.get_cutoff(timeframe)
+        with self._lock:
+            poller = self._pollers.get(username.lower())
+            started = poller is None
+            if started:
+                poller = self._pollers[username.lower()] = UserPoller(self, username)
+            subscription = poller.subscribe(timeframe)
+        if started:
+            poller.start()
+        return poller, subscription
+
+    def unsubscribe(self, poller: UserPoller, subscription: Subscription) -> None:
+        with self._lock:
+            if poller.unsubscribe(subscription) == 0 and self._pollers.get(poller.username) is poller:
+                del self._pollers[poller.username]
+                poller.stop()
+
+    def active_pollers(self) -> int:
+        with self._lock:
+            return len(self._pollers)
+
+    def stream(self, username: str, timeframe: str) -> Iterator[str]:
+        """Messages SSE d'un abonné, avec un commentaire périodique pour garder la connexion ouverte."""
+        poller, subscription = self.subscribe(username, timeframe)
+        try:
+            yield f"retry: {int(self.min_interval * 1000)}\n\n"
+            while not subscription.closed and not poller.stopped:
+                try:
+                    message = subscription.messages.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            self.unsubscribe(poller, subscription)
@@ -0,0 +1,148 @@
+"""
+Stockage côté serveur des résultats d'analyse, indexés par identifiant d'analyse.
+"""
+import os
+import pickle
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class ResultStore(ABC):
+    """Interface commune des stockages de résultats (TTL et éviction LRU).
+
+    Le TTL court à partir de l'enregistrement ; l'ordre LRU suit les lectures.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 100):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def put(self, result: Dict[str, Any]) -> str:
+        """Enregistre un résultat et retourne son identifiant d'analyse."""
+        analysis_id = uuid.uuid4().hex
+        with self._lock:
+            self._write(analysis_id, result)
+            self._evict()
+        return analysis_id
+
+    def get(self, analysis_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Retourne le résultat s'il existe et n'a pas expiré, sinon None."""
+        if not analysis_id:
+            return None
+        with self._lock:
+            return self._read(analysis_id)
+
+    @abstractmethod
+    def _write(self, analysis_id: str, result: Dict[str, Any]) -> None:
+        """Enregistre un résultat sous son identifiant."""
+
+    @abstractmethod
+    def _read(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne un résultat non expiré et le marque comme récemment utilisé."""
+
+    @abstractmethod
+    def _evict(self) -> None:
+        """Supprime les résultats expirés puis les moins récemment utilisés au-delà de ``max_entries``."""
+
+
+class MemoryResultStore(ResultStore):
+    """Stockage en mémoire du processus."""
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 100):
+        super().__init__(ttl, max_entries)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _write(self, analysis_id: str, result: Dict[str, Any]) -> None:
+        self._entries[analysis_id] = (time.time(), result)
+
+    def _read(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(analysis_id)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.time() - stored_at > self.ttl:
+            del self._entries[analysis_id]
+            return None
+        self._entries.move_to_end(analysis_id)
+        return result
+
+    def _evict(self) -> None:
+        now = time.time()
+        for analysis_id in [k for k, (stored_at, _) in self._entries.items() if now - stored_at > self.ttl]:
+            del self._entries[analysis_id]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class DiskResultStore(ResultStore):
+    """Stockage sur disque (un fichier pickle par analyse), partagé entre processus.
+
+    La date de modification d'un fichier est celle de son enregistrement et
+    sert de base au TTL ; sa date d'accès, mise à jour à chaque lecture,
+    donne l'ordre LRU. Un autre processus peut supprimer un fichier à tout
+    moment : chaque opération le tolère.
+    """
+
+    def __init__(self, path: str = ".cache/results", ttl: float = 3600, max_entries: int = 100):
+        super().__init__(ttl, max_entries)
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _file(self, analysis_id: str) -> Path:
+        return self.path / f"{analysis_id}.pickle"
+
+    def _write(self, analysis_id: str, result: Dict[str, Any]) -> None:
+        # Écriture atomique : un lecteur ne voit jamais un fichier partiel
+        tmp_file = self._file(analysis_id).with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump({"result": result}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(self._file(analysis_id))
+
+    def _read(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        # L'identifiant vient de la session : on refuse tout ce qui n'est pas un uuid hexadécimal
+        if len(analysis_id) != 32 or not all(c in "0123456789abcdef" for c in analysis_id):
+            return None
+        now = time.time()
+        try:
+            with open(self._file(analysis_id), "rb") as f:
+                stored_at = os.fstat(f.fileno()).st_mtime
+                if now - stored_at > self.ttl:
+                    self._file(analysis_id).unlink(missing_ok=True)
+                    return None
+                entry = pickle.load(f)
+                # Via le descripteur : un fichier supprimé entre-temps n'est pas recréé
+                os.utime(f.fileno(), (now, stored_at))
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        return entry["result"]
+
+    def _evict(self) -> None:
+        files = []
+        for file in self.path.glob("*.pickle"):
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                # Supprimé par un autre processus
+                continue
+            files.append((stat.st_atime, stat.st_mtime, file))
+        files.sort(reverse=True)
+        now = time.time()
+        for index, (_, stored_at, file) in enumerate(files):
+            if index >= self.max_entries or now - stored_at > self.ttl:
+                file.unlink(missing_ok=True)
+
+
+def create_result_store(backend: str = "memory", path: str = ".cache/results",
+                        ttl: float = 3600, max_entries: int = 100) -> ResultStore:
+    """Crée le stockage de résultats correspondant au backend demandé ("memory" ou "disk")."""
+    if backend == "memory":
+        return MemoryResultStore(ttl=ttl, max_entries=max_entries)
+    if backend == "disk":
+        return DiskResultStore(path=path, ttl=ttl, max_entries=max_entries)
+    raise ValueError("Invalid result store backend. Choose from: memory, disk")
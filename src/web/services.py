@@ -0,0 +1,123 @@
+"""
+Services partagés par les routes de l'application web : client GitHub,
+stockages, pools de workers et threads. Ils sont créés au premier appel de
+:func:`get_services`, jamais à l'import : un processus qui importe
+l'application sans servir de requête (workers de rendu démarrés par
+« spawn », outils, tests) n'ouvre aucune connexion et ne démarre aucun pool.
+"""
+import os
+import threading
+from typing import Optional
+
+from src.api.github_client import GitHubClient
+from src.api.response_cache import ResponseCache
+from src.services import export_service, visualization_service
+from src.services.event_store import EventStore
+from src.services.render_cache import RenderCache
+from src.services.render_pipeline import RenderPipeline
+from src.services.repo_enrichment_service import RepoActivityCache, RepoEnrichmentService
+from src.services.timeline_cache import TimelineCache
+from src.services.visualization_service import VisualizationService
+from src.utils.compression import precompress_directory
+from src.utils.lazy import preload
+from src.web.http_cache import ArtifactStore
+from src.web.jobs import JobManager
+from src.web.live import LiveHub
+from src.web.result_store import create_result_store
+
+
+class AppServices:
+    """Connexions, stockages et pools de l'application, configurés par les variables d'environnement."""
+
+    def __init__(self, server_side_charts: bool = False):
+        # Initialiser le client GitHub avec le cache des réponses (requêtes conditionnelles)
+        self.response_cache = ResponseCache(os.getenv('GITHUB_CACHE_PATH', '.cache/github_responses.sqlite'))
+        # Pool de tokens optionnel (séparés par des virgules) pour multiplier le quota
+        github_tokens = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+        self.github_client = GitHubClient(
+            token=os.getenv('GITHUB_TOKEN'),
+            base_url=os.getenv('GITHUB_API_URL', 'https://api.github.com'),
+            tokens=github_tokens,
+            cache=self.response_cache
+        )
+
+        # Stockage local des événements, synchronisé de manière incrémentale
+        self.event_store = EventStore(os.getenv('GITHUB_EVENT_STORE', 'data/events.sqlite'))
+
+        # Chronologies des utilisateurs analysés : changer de période ne relit pas le stockage
+        self.timelines = TimelineCache(
+            self.event_store, max_users=int(os.getenv('TIMELINE_CACHE_MAX_USERS', 100))
+        )
+
+        # Activité des dépôts les mieux classés, récupérée par un pool borné et mise
+        # en cache : les dépôts communs à plusieurs analyses ne sont récupérés qu'une fois
+        self.repo_enrichment = RepoEnrichmentService(
+            self.github_client,
+            cache=RepoActivityCache(ttl=float(os.getenv('REPO_ACTIVITY_TTL', 600))),
+            max_workers=int(os.getenv('REPO_ENRICHMENT_WORKERS', 4)),
+            top_k=int(os.getenv('REPO_ENRICHMENT_TOP', 5))
+        )
+
+        # Résultats d'analyse conservés côté serveur : la session ne contient que leur identifiant
+        self.result_store = create_result_store(
+            backend=os.getenv('RESULT_STORE_BACKEND', 'memory'),
+            path=os.getenv('RESULT_STORE_PATH', '.cache/results'),
+            ttl=float(os.getenv('RESULT_STORE_TTL', 3600)),
+            max_entries=int(os.getenv('RESULT_STORE_MAX_ENTRIES', 100))
+        )
+
+        # Rétention des graphiques générés (nombre de fichiers et âge depuis le dernier accès)
+        VisualizationService.render_cache = RenderCache(
+            max_files=int(os.getenv('RENDER_CACHE_MAX_FILES', 200)),
+            max_age=float(os.getenv('RENDER_CACHE_MAX_AGE', 7 * 24 * 3600))
+        )
+
+        # Exports générés une fois par analyse et par format, conservés avec leurs versions compressées
+        self.artifact_store = ArtifactStore(
+            os.getenv('ARTIFACT_CACHE_PATH', '.cache/artifacts'),
+            max_entries=int(os.getenv('ARTIFACT_CACHE_MAX_ENTRIES', 100))
+        )
+
+        # Pool de processus générant les graphiques d'une analyse en parallèle, démarré
+        # dès maintenant pour que la première analyse ne paie pas les imports
+        render_workers = os.getenv('RENDER_WORKERS')
+        self.render_pipeline = RenderPipeline(max_workers=int(render_workers) if render_workers else None)
+        if server_side_charts:
+            self.render_pipeline.warm_up()
+
+        # Mode direct : un poller par utilisateur suivi, au rythme de X-Poll-Interval
+        self.live_hub = LiveHub(
+            self.github_client,
+            self.event_store,
+            min_interval=float(os.getenv('LIVE_MIN_POLL_INTERVAL', 10)),
+            keepalive=float(os.getenv('LIVE_KEEPALIVE', 15))
+        )
+
+        # Pool borné de workers exécutant les analyses en arrière-plan
+        self.job_manager = JobManager(max_workers=int(os.getenv('ANALYSIS_WORKERS', 4)))
+
+
+_services: Optional[AppServices] = None
+_services_lock = threading.Lock()
+
+
+def get_services(static_folder: Optional[str] = None, server_side_charts: bool = False) -> AppServices:
+    """Services de l'application, créés au premier appel puis partagés par tous les threads.
+
+    Le premier appel compresse aussi les fichiers statiques de ``static_folder``
+    et précharge en arrière-plan les bibliothèques de rendu et d'export.
+    """
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                services = AppServices(server_side_charts=server_side_charts)
+                # Les fichiers statiques sont compressés une fois au démarrage, pas à chaque requête
+                if static_folder:
+                    precompress_directory(static_folder)
+                # Les bibliothèques de rendu et d'export sont importées à la première
+                # utilisation ; on les précharge en arrière-plan après le démarrage
+                if os.getenv('PRELOAD_MODULES', '1').lower() not in ('0', 'false', 'no'):
+                    preload(visualization_service.HEAVY_MODULES + export_service.HEAVY_MODULES)
+                _services = services
+    return _services
@@ -8,22 +8,48 @@ document.addEventListener('DOMContentLoaded', function() {
             submitBtn.disabled = false;
             submitBtn.innerHTML = `<i class="fas fa-chart-line"></i> Analyser le profil`;
         }
-        
-        analyzeForm.addEventListener('submit', function(e) {
-            const submitBtn = this.querySelector('button[type="submit"]');
+    }
+    
+    // Formulaires exécutés en arrière-plan (analyse, comparaison) : la progression du job est suivie
+    document.querySelectorAll('form[data-jobs-url]').forEach(jobForm => {
+        jobForm.addEventListener('submit', function(e) {
+            const form = this;
+            const submitBtn = form.querySelector('button[type="submit"]');
             const originalText = submitBtn.innerHTML;
             
             // Désactiver le bouton et afficher le spinner
+            const showProgress = (message) => {
+                submitBtn.innerHTML = `<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> ${message}...`;
+            };
             submitBtn.disabled = true;
-            submitBtn.innerHTML = `<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Analyse en cours...`;
+            showProgress(form.dataset.progressLabel || 'Analyse en cours');
             
-            // Réactiver le bouton après 30 secondes (timeout de sécurité)
-            setTimeout(() => {
-                submitBtn.disabled = false;
-                submitBtn.innerHTML = originalText;
-            }, 30000);
+            const jobsUrl = form.dataset.jobsUrl;
+            if (!jobsUrl || !window.fetch) {
+                // Sans support des jobs : soumission classique du formulaire
+                return;
+            }
+            
+            // Soumettre l'analyse en arrière-plan et suivre sa progression
+            e.preventDefault();
+            fetch(jobsUrl, { method: 'POST', body: new FormData(form) })
+                .then(response => response.json().then(data => ({ ok: response.ok, data })))
+                .then(({ ok, data }) => {
+                    if (!ok) {
+                        throw new Error(data.error || 'Erreur lors de la soumission');
+                    }
+                    return pollJob(data.status_url, showProgress);
+                })
+                .then(job => {
+                    window.location.href = job.result_url;
+                })
+                .catch(error => {
+                    submitBtn.disabled = false;
+                    submitBtn.innerHTML = originalText;
+                    showAlert(error.message, 'danger');
+                });
         });
-    }
+    });
     
     // Gérer le retour à la page via le bouton retour du navigateur
     window.addEventListener('pageshow', function(event) {
@@ -64,6 +90,38 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
     
+    // Graphiques de la page de résultats
+    const charts = document.getElementById('charts');
+    if (charts && charts.dataset.chartsUrl && window.Plotly) {
+        fetch(charts.dataset.chartsUrl)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Données des graphiques indisponibles');
+                }
+                return response.json();
+            })
+            .then(data => renderCharts(charts, data))
+            .catch(handleAjaxError);
+    }
+    
+    // Mode direct : les nouveaux événements sont appliqués aux graphiques sans recharger la page
+    const liveToggle = document.getElementById('live-toggle');
+    if (liveToggle && window.EventSource) {
+        let source = null;
+        liveToggle.addEventListener('click', function() {
+            if (source) {
+                source.close();
+                source = null;
+                setLiveStatus(null);
+            } else {
+                source = startLive(this.dataset.liveUrl, charts);
+            }
+            this.classList.toggle('active', source !== null);
+        });
+    } else if (liveToggle) {
+        liveToggle.classList.add('d-none');
+    }
+    
     // Gestion des boutons d'export
     const exportButtons = document.querySelectorAll('[data-export]');
     exportButtons.forEach(button => {
@@ -84,6 +142,186 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 });
 
+// Dessin des graphiques à partir des séries agrégées renvoyées par le serveur
+function renderCharts(container, data) {
+    const config = { responsive: true, displaylogo: false };
+    // Séries conservées pour y appliquer les deltas du mode direct
+    container.chartData = data;
+    
+    const histogram = container.querySelector('[data-chart="commit_histogram"]');
+    if (histogram) {
+        // Une barre par intervalle, centrée sur son milieu (bornes en UTC)
+        const edges = data.commit_histogram.edges.map(edge => Date.parse(edge + 'Z'));
+        const counts = data.commit_histogram.counts;
+        Plotly.newPlot(histogram, [{
+            type: 'bar',
+            x: counts.map((_, i) => new Date((edges[i] + edges[i + 1]) / 2)),
+            y: counts,
+            width: counts.map((_, i) => edges[i + 1] - edges[i])
+        }], {
+            xaxis: { title: 'Date' },
+            yaxis: { title: 'Nombre de commits' },
+            margin: { t: 20 }
+        }, config);
+    }
+    
+    const distribution = container.querySelector('[data-chart="distribution"]');
+    if (distribution) {
+        Plotly.newPlot(distribution, [{
+            type: 'pie',
+            labels: data.distribution.labels,
+            values: data.distribution.values,
+            hole: 0.3
+        }], {
+            showlegend: true,
+            margin: { t: 20 }
+        }, config);
+    }
+    
+    const timeline = container.querySelector('[data-chart="timeline"]');
+    if (timeline) {
+        const traces = Object.entries(data.timeline.series).map(([eventType, values]) => ({
+            type: 'scatter',
+            mode: 'lines+markers',
+            name: eventType,
+            x: data.timeline.dates,
+            y: values
+        }));
+        Plotly.newPlot(timeline, traces, {
+            xaxis: { title: 'Date' },
+            yaxis: { title: "Nombre d'événements" },
+            hovermode: 'x unified',
+            showlegend: true,
+            margin: { t: 20 }
+        }, config);
+    }
+    
+    const heatmap = container.querySelector('[data-chart="heatmap"]');
+    if (heatmap && data.heatmap) {
+        Plotly.newPlot(heatmap, [{
+            type: 'heatmap',
+            z: data.heatmap.counts,
+            x: data.heatmap.hours,
+            y: data.heatmap.weekdays,
+            colorscale: 'Greens',
+            hovertemplate: '%{y} %{x}h : %{z} événements<extra></extra>'
+        }], {
+            xaxis: { title: 'Heure', dtick: 1 },
+            yaxis: { autorange: 'reversed' },
+            margin: { t: 20 }
+        }, config);
+    }
+}
+
+// Abonnement au flux des nouveaux événements (Server-Sent Events)
+function startLive(url, container) {
+    const source = new EventSource(url);
+    let received = 0;
+    setLiveStatus('Direct');
+    source.addEventListener('snapshot', event => applyLiveTotals(JSON.parse(event.data), container));
+    source.addEventListener('delta', event => {
+        const delta = JSON.parse(event.data);
+        received += delta.new_events;
+        applyLiveTotals(delta, container);
+        applyLiveSeries(delta, container);
+        setLiveStatus(`Direct : ${received} nouvel(s) événement(s)`);
+    });
+    source.addEventListener('error', event => {
+        if (event.data) {
+            setLiveStatus(`Direct : ${JSON.parse(event.data).error}`);
+        }
+    });
+    return source;
+}
+
+function setLiveStatus(message) {
+    const status = document.getElementById('live-status');
+    if (status) {
+        status.textContent = message || '';
+        status.classList.toggle('d-none', !message);
+    }
+}
+
+// Totaux recalculés côté serveur : cartes de statistiques et répartition par type
+function applyLiveTotals(message, container) {
+    Object.entries(message.stats).forEach(([name, value]) => {
+        const element = document.querySelector(`[data-stat="${name}"]`);
+        if (element) {
+            element.textContent = value;
+        }
+    });
+    const distribution = container && container.querySelector('[data-chart="distribution"]');
+    if (distribution && distribution.data && window.Plotly) {
+        Plotly.restyle(distribution, { labels: [message.distribution.labels], values: [message.distribution.values] });
+    }
+}
+
+// Deltas des séries : ajoutés aux valeurs déjà affichées, puis graphiques mis à jour sur place
+function applyLiveSeries(delta, container) {
+    const data = container && container.chartData;
+    if (!data || !window.Plotly) {
+        return;
+    }
+    
+    const timeline = data.timeline;
+    delta.timeline.dates.forEach((date, offset) => {
+        let index = timeline.dates.indexOf(date);
+        if (index === -1) {
+            timeline.dates.push(date);
+            Object.values(timeline.series).forEach(values => values.push(0));
+            index = timeline.dates.length - 1;
+        }
+        Object.entries(delta.timeline.series).forEach(([eventType, values]) => {
+            if (!timeline.series[eventType]) {
+                timeline.series[eventType] = timeline.dates.map(() => 0);
+            }
+            timeline.series[eventType][index] += values[offset];
+        });
+    });
+    const timelineChart = container.querySelector('[data-chart="timeline"]');
+    if (timelineChart && timelineChart.data) {
+        Plotly.react(timelineChart, Object.entries(timeline.series).map(([eventType, values]) => ({
+            type: 'scatter',
+            mode: 'lines+markers',
+            name: eventType,
+            x: timeline.dates,
+            y: values
+        })), timelineChart.layout);
+    }
+    
+    if (data.heatmap) {
+        data.heatmap.counts = data.heatmap.counts.map((row, day) => row.map((count, hour) => count + delta.heatmap[day][hour]));
+        const heatmapChart = container.querySelector('[data-chart="heatmap"]');
+        if (heatmapChart && heatmapChart.data) {
+            Plotly.restyle(heatmapChart, { z: [data.heatmap.counts] });
+        }
+    }
+}
+
+// Suivi d'un job d'analyse jusqu'à sa fin
+function pollJob(statusUrl, onProgress, interval = 1000) {
+    return new Promise((resolve, reject) => {
+        const check = () => {
+            fetch(statusUrl)
+                .then(response => response.json())
+                .then(job => {
+                    if (job.status === 'done') {
+                        resolve(job);
+                    } else if (job.status === 'error') {
+                        reject(new Error(job.error));
+                    } else {
+                        if (job.progress) {
+                            onProgress(job.progress);
+                        }
+                        setTimeout(check, interval);
+                    }
+                })
+                .catch(reject);
+        };
+        check();
+    });
+}
+
 // Gestion des messages flash
 function showAlert(message, type = 'info') {
     const alertContainer = document.createElement('div');